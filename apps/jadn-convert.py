@@ -1,50 +1,48 @@
 import argparse
+import hashlib
+import io
+import json
 import sys
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from jadn import __version__, convert, translate
+from jadn.core import JADNCore
 from jadn.style import style_args, style_fname
-from jadn.convert import JADN, JIDL, XASD, MD, ATREE, ERD
-from jadn.translate import JSCHEMA, XSD, CDDL, PROTO, XETO
 
 CONFIG = 'jadn_config.json'
+MANIFEST = '.jadn-convert.json'     # Record of converted files in output directory, for incremental rebuild
+FORMATS = {fmt: pkg for pkg in (convert, translate) for fmt in pkg.FORMATS}    # Data format: package
 
 
 def convert_schema(in_path: str, out_dir: str, out_fmt: str, style_cmd: str) -> None:
-    class_ = {
-        'jadn': JADN,
-        'jidl': JIDL,
-        'xasd': XASD,
-        'md': MD,
-        'erd': ERD,
-        'atree': ATREE,
-        'json': JSCHEMA,
-        'xsd': XSD,
-        'cddl': CDDL,
-        'proto': PROTO,
-        'xeto': XETO,
-    }
-
     in_file = os.path.split(in_path)[1]
     if out_dir:
         print(in_file)  # Don't print filename if destination is stdout
 
     fn, ext = os.path.splitext(in_file)
     ext = ext.lstrip('.')
-    if ext in class_ and (in_pkg := class_[ext]()) and 'schema_loads' in dir(in_pkg):     # Input format has a load method
+    if ext in FORMATS and (in_pkg := FORMATS[ext].format_class(ext)()) and 'schema_loads' in dir(in_pkg):     # Input format has a load method
         # Read schema literal into information value
         with open(in_path, 'r') as fp:
             in_pkg.schema_load(fp)
 
-        # Validate JADN information value against JADN metaschema
-        in_pkg.schema_validate()
+        # Validate JADN information value against JADN metaschema, report errors and convert anyway
+        try:
+            in_pkg.schema_validate()
+        except ValueError as e:
+            print(e, file=sys.stderr)
 
         # Serialize information value to schema literal in output format
-        if out_fmt in class_:
-            style = style_args(class_[out_fmt](), style_cmd, CONFIG)    # style from format, config, args
+        if out_fmt in FORMATS:
+            out_class = FORMATS[out_fmt].format_class(out_fmt)     # Import only the formats being used
+            style = style_args(out_class(), style_cmd, CONFIG)    # style from format, config, args
             if out_dir:
                 with open(os.path.join(out_dir, style_fname(fn, out_fmt, style)), 'w', encoding='utf8') as fp:
-                    class_[out_fmt](in_pkg).schema_dump(fp, style)
+                    out_class(in_pkg).schema_dump(fp, style)
             else:
-                class_[out_fmt](in_pkg).schema_dump(sys.stdout, style)
+                out_class(in_pkg).schema_dump(sys.stdout, style)
         else:
             print(f'Unknown output format "{out_fmt}"')
             sys.exit(2)
@@ -52,7 +50,179 @@ def convert_schema(in_path: str, out_dir: str, out_fmt: str, style_cmd: str) ->
         print(f'Unknown input format "{ext}" -- ignored')
 
 
-def jadn_convert(input: str, out_dir: str, out_fmt: str, style: str, recursive: bool) -> None:
+def convert_task(task: tuple[str, str, str, str]) -> tuple[str, str, str, float]:
+    """
+    Convert one schema file, capturing its output so results can be reported in input order
+
+    :param task: convert_schema arguments (in_path, out_dir, out_fmt, style_cmd)
+    :return: (in_path, output, error, seconds), error is '' if conversion succeeded
+    """
+    t0 = time.perf_counter()
+    out = io.StringIO()
+    err = ''
+    try:
+        with redirect_stdout(out):
+            convert_schema(*task)
+    except Exception as e:     # Report any failure and go on to the next file
+        err = f'{type(e).__name__}: {e}'
+    return task[0], out.getvalue(), err, time.perf_counter() - t0
+
+
+def init_worker() -> None:
+    JADNCore()      # Load metaschema tables once per worker process, not once per file
+
+
+def convert_group(tasks: list[tuple[str, str, str, str]]) -> list[tuple[str, str, str, float]]:
+    """
+    Convert files that write the same output file, in input order, so the last one wins as in a serial run
+    """
+    return [convert_task(task) for task in tasks]
+
+
+def load_manifest(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding='utf8') as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir: str, manifest: dict) -> None:
+    path = os.path.join(out_dir, MANIFEST)
+    with open(path + '.tmp', 'w', encoding='utf8') as fp:
+        json.dump(manifest, fp, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def manifest_entry(tasks: list[tuple[str, str, str, str]], out_fmt: str, style: dict) -> dict:
+    """
+    Return everything an output file depends on: its input files and their content, format, style and version
+    """
+    inputs = []
+    for task in tasks:
+        with open(task[0], 'rb') as fp:
+            inputs.append([task[0], hashlib.sha256(fp.read()).hexdigest()])
+    entry = {'inputs': inputs, 'format': out_fmt, 'style': style, 'version': __version__}
+    return json.loads(json.dumps(entry))    # Compare as read back from manifest file, e.g., tuples as lists
+
+
+def convert_dir(tasks: list[tuple[str, str, str, str]], jobs: int, force: bool = False) -> int:
+    """
+    Convert files serially or over a pool of "jobs" processes, print results in input order and a summary
+
+    Files whose output is recorded in the output directory's manifest with the same inputs, input content,
+    format, style and package version are skipped unless "force" is set.
+
+    :return: number of files that could not be converted
+    """
+    t0 = time.perf_counter()
+    groups = {}     # Output filename: tasks
+    entries = {}    # Output filename: manifest entry
+    manifest = {}
+    if tasks:
+        in_path, out_dir, out_fmt, style_cmd = tasks[0]
+        style = style_args(FORMATS[out_fmt].format_class(out_fmt)(), style_cmd, CONFIG)
+        for task in tasks:
+            fn = os.path.splitext(os.path.split(task[0])[1])[0]
+            groups.setdefault(style_fname(fn, out_fmt, style), []).append(task)
+        manifest = {} if force else load_manifest(out_dir)
+        entries = {fn: manifest_entry(g, out_fmt, style) for fn, g in groups.items()}
+        groups = {fn: g for fn, g in groups.items()     # Skip up-to-date output files
+                  if manifest.get(fn) != entries[fn] or not os.path.isfile(os.path.join(out_dir, fn))}
+    if jobs > 1 and len(groups) > 1:
+        with ProcessPoolExecutor(jobs, initializer=init_worker) as pool:
+            chunk = max(1, len(groups) // (4 * jobs))
+            results = [r for rg in pool.map(convert_group, groups.values(), chunksize=chunk) for r in rg]
+    else:
+        results = [r for g in groups.values() for r in convert_group(g)]
+    order = {task[0]: n for n, task in enumerate(tasks)}
+    results.sort(key=lambda r: order[r[0]])     # Report in input order regardless of worker scheduling
+
+    errors = 0
+    failed = set()
+    for in_path, output, err, t in results:
+        print(output, end='')
+        if err:
+            print(f'{in_path}: {err}', file=sys.stderr)
+            failed.add(in_path)
+            errors += 1
+    if groups:
+        for fn, g in groups.items():
+            if failed & {task[0] for task in g}:
+                manifest.pop(fn, None)      # Retry on next run
+            else:
+                manifest[fn] = entries[fn]
+        save_manifest(tasks[0][1], manifest)
+    wall = time.perf_counter() - t0
+    slow = max(results, key=lambda r: r[3], default=('', '', '', 0.0))
+    print(f'{len(tasks)} files, {len(results) - errors} converted, {len(tasks) - len(results)} unchanged, '
+          f'{errors} failed; {wall:.2f} s elapsed, {sum(r[3] for r in results):.2f} s converting'
+          f'{f", slowest {os.path.split(slow[0])[1]} {slow[3]:.2f} s" if results else ""}', file=sys.stderr)
+    return errors
+
+
+def dir_tasks(input: str, out_dir: str, out_fmt: str, style: str, recursive: bool) -> list[tuple[str, str, str, str]]:
+    """
+    List convert_schema arguments for each file in an input directory, in sorted order, excluding the output directory
+    """
+    tasks = []
+    for in_dir, dirs, files in os.walk(input):
+        dirs[:] = [] if not recursive else [   # Walk in a fixed order
+            d for d in sorted(dirs) if not os.path.samefile(os.path.join(in_dir, d), out_dir)]
+        tasks += [(os.path.join(in_dir, in_file), out_dir, out_fmt, style) for in_file in sorted(files)]
+    return tasks
+
+
+def file_stats(paths: list[str]) -> dict[str, tuple[int, int]]:
+    stats = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stats[path] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:   # Deleted since listed
+            pass
+    return stats
+
+
+def watch(input: str, out_dir: str, out_fmt: str, style: str, recursive: bool, interval: float, jobs: int = 1,
+          force: bool = False) -> None:
+    """
+    Poll input file or directory every "interval" seconds and convert files that have changed, until interrupted
+
+    With jobs = 1, conversions run in this process so the metaschema tables are loaded once. Directory input
+    uses the output directory manifest, so only files whose content has changed are converted, except that
+    the first pass converts all files if force is set.
+    """
+    assert interval > 0, f'Watch interval {interval} is not positive'
+    if out_fmt not in FORMATS:
+        print(f'Unknown output format "{out_fmt}"')
+        sys.exit(2)
+    if os.path.isdir(input):
+        assert out_dir, f'Input {input} is a directory but output directory is not specified'
+        os.makedirs(out_dir, exist_ok=True)
+    jobs = jobs if jobs > 0 else os.cpu_count()
+    print(f'Watching {input}, press Ctrl-C to stop', file=sys.stderr)
+    last = None
+    try:
+        while True:
+            tasks = dir_tasks(input, out_dir, out_fmt, style, recursive) if os.path.isdir(input) else [
+                (input, out_dir, out_fmt, style)]
+            if (stats := file_stats([task[0] for task in tasks])) != last:
+                if os.path.isdir(input):
+                    convert_dir([task for task in tasks if task[0] in stats], jobs, force)
+                    force = False   # Later passes convert changed files only
+                elif stats:
+                    in_path, output, err, t = convert_task(tasks[0])
+                    print(output, end='')
+                    print(f'{in_path}: {err}' if err else f'{in_path}: converted in {t:.2f} s', file=sys.stderr)
+                last = stats
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def jadn_convert(input: str, out_dir: str, out_fmt: str, style: str, recursive: bool, jobs: int = 1,
+                 force: bool = False) -> None:
     """
     Convert JADN schema among multiple formats
 
@@ -65,12 +235,13 @@ def jadn_convert(input: str, out_dir: str, out_fmt: str, style: str, recursive:
     if os.path.isdir(input):
         # If input is directory, process all files, including contained directories if recursive=True
         if out_dir:
+            if out_fmt not in FORMATS:
+                print(f'Unknown output format "{out_fmt}"')
+                sys.exit(2)
             os.makedirs(out_dir, exist_ok=True)
-            for in_dir, dirs, files in os.walk(input):
-                if not recursive:
-                    dirs.clear()
-                for in_file in files:
-                    convert_schema(os.path.join(in_dir, in_file), out_dir, out_fmt, style)
+            tasks = dir_tasks(input, out_dir, out_fmt, style, recursive)
+            if convert_dir(tasks, jobs if jobs > 0 else os.cpu_count(), force):
+                sys.exit(1)
         else:
             assert False, f'Input {input} is a directory but output directory is not specified'
     else:
@@ -89,10 +260,21 @@ if __name__ == '__main__':
     parser.add_argument('-f', metavar='format', default='jadn',
                         help='output format')
     parser.add_argument('-r', action='store_true', help='recursive directory search')
+    parser.add_argument('-j', metavar='jobs', type=int, default=1,
+                        help='number of worker processes for directory input, 0 = one per CPU')
+    parser.add_argument('--force', action='store_true',
+                        help='convert all files in input directory, including unchanged files')
+    parser.add_argument('--watch', metavar='seconds', type=float, nargs='?', const=1.0,
+                        help='convert again when input files change, polling at this interval')
     parser.add_argument('--style', default='', help='serialization style options')
     parser.add_argument('input', help='input filename or directory')
     parser.add_argument('out_dir', nargs='?', default=None)
     args = parser.parse_args()
     if args.out_dir:
         print(args)     # Don't print command line args if output to stdout
-    jadn_convert(args.input, args.out_dir, args.f, args.style, args.r)
+    if args.watch is not None and args.watch <= 0:
+        parser.error(f'--watch interval must be positive: {args.watch}')
+    if args.watch is not None:
+        watch(args.input, args.out_dir, args.f, args.style, args.r, args.watch, args.j, args.force)
+    else:
+        jadn_convert(args.input, args.out_dir, args.f, args.style, args.r, args.j, args.force)
@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+import time
+from jadn import convert, translate
+
+FORMATS = {fmt: pkg for pkg in (convert, translate) for fmt in pkg.FORMATS}    # Data format: package
+
+
+def load_schema(schema_path: str):
+    """
+    Load a schema in any format that has a load method, selected by file extension
+    """
+    fmt = os.path.splitext(schema_path)[1].lstrip('.')
+    if fmt not in FORMATS:
+        print(f'Unknown schema format "{fmt}"', file=sys.stderr)
+        sys.exit(2)
+    pkg = FORMATS[fmt].format_class(fmt)()
+    with open(schema_path, 'r', encoding='utf8') as fp:
+        pkg.schema_load(fp)
+    return pkg
+
+
+def jadn_validate(schema_path: str, type_name: str, data_paths: list[str], max_errors: int, quiet: bool) -> int:
+    """
+    Validate newline-delimited JSON data files against a type defined in a JADN schema
+
+    Print one line per error: file:line:JSON-Pointer: message, followed by a summary per file.
+    Return the number of invalid records.
+    """
+    pkg = load_schema(schema_path)
+    invalid = 0
+    for data_path in data_paths:
+        n_records = n_invalid = 0
+        t0 = time.perf_counter()
+        with open(data_path, 'rb') as fp:
+            for line, errors in pkg.validate_stream(fp, type_name):
+                n_records += 1
+                if errors:
+                    n_invalid += 1
+                    for ln, ptr, msg in errors if not quiet and (max_errors < 0 or n_invalid <= max_errors) else ():
+                        print(f'{data_path}:{ln}:{ptr}: {msg}')
+        t = time.perf_counter() - t0
+        print(f'{data_path}: {n_records} records, {n_invalid} invalid, {t:.2f} s'
+              f'{f" ({n_records / t:,.0f} records/s)" if t > 0 else ""}', file=sys.stderr)
+        invalid += n_invalid
+    return invalid
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description='Validate newline-delimited JSON data against a JADN schema type.')
+    parser.add_argument('-t', metavar='type', required=True, help='type name of each record')
+    parser.add_argument('-m', metavar='max_errors', type=int, default=-1,
+                        help='max invalid records to report per file, -1 = all')
+    parser.add_argument('-q', action='store_true', help='print summary only')
+    parser.add_argument('schema', help='schema filename')
+    parser.add_argument('data', nargs='+', help='NDJSON data filenames')
+    args = parser.parse_args()
+    try:
+        sys.exit(1 if jadn_validate(args.schema, args.t, args.data, args.m, args.q) else 0)
+    except (FileNotFoundError, ValueError) as e:
+        print(e, file=sys.stderr)
+        sys.exit(2)
@@ -0,0 +1,77 @@
+"""
+Benchmark bulk validation of ArrayOf Integer and Number items vs. per-element checks
+
+Validates arrays of N items (default 1,000,000): lists of ints and floats, array.array buffers, and NumPy
+arrays if NumPy is installed.  Per-element time is the compiled item check called for every item, as
+the validator does for other item types and to report errors.
+Run from the repository root: python -m benchmarks.arrayof_validate [N]
+"""
+import random
+import sys
+import time
+from array import array
+from typing import Any, Callable
+from jadn.convert import JIDL
+
+SCHEMA = '''
+       package: "http://example.com/bench/arrayof"
+        config: {"$MaxElements": 100000000}
+
+Counts = ArrayOf(Count){0..*}
+
+Count = Integer /i32
+
+Readings = ArrayOf(Reading){0..*}
+
+Reading = Number /f64
+
+Bytes = ArrayOf(Byte){0..*}
+
+Byte = Integer /u8
+'''
+
+
+def timed(func: Callable, *args) -> float:
+    """
+    Return seconds per call of the fastest of 3 calls
+    """
+    best = float('inf')
+    for _ in range(3):
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def per_element(check: Callable, items: Any) -> list:
+    return [e for x in items if (e := check(x))]
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    pkg = JIDL()
+    pkg.schema_loads(SCHEMA)
+    pkg.instance_validate([], 'Counts')     # Compile
+    rand = random.Random(1)
+    ints = [rand.randrange(-2 ** 31, 2 ** 31) for _ in range(n)]
+    floats = [rand.uniform(-1e6, 1e6) for _ in range(n)]
+    octets = [rand.randrange(256) for _ in range(n)]
+    cases = [
+        ('Counts', 'list of int', ints, 'Count'),
+        ('Counts', "array('l')", array('l', ints), 'Count'),
+        ('Readings', 'list of float', floats, 'Reading'),
+        ('Readings', "array('d')", array('d', floats), 'Reading'),
+        ('Bytes', "array('B')", array('B', octets), 'Byte'),
+    ]
+    try:
+        import numpy
+        cases += [('Counts', 'numpy int32', numpy.array(ints, dtype=numpy.int32), 'Count'),
+                  ('Readings', 'numpy float64', numpy.array(floats), 'Reading')]
+    except ImportError:
+        print('NumPy is not installed, NumPy arrays not benchmarked')
+    print(f'{n:,} items{"":14} {"bulk ms":>9} {"per-element ms":>15} {"speedup":>8}')
+    for tn, name, items, item_type in cases:
+        assert pkg.instance_validate(items, tn) == []
+        t_bulk = timed(pkg.run_schema[tn], items)
+        t_each = timed(per_element, pkg.run_schema[item_type], items if isinstance(items, list) else items.tolist())
+        print(f'{tn:>8} {name:>16} {t_bulk * 1e3:9.1f} {t_each * 1e3:15.1f} {t_each / t_bulk:7.1f}x')
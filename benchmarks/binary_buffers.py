@@ -0,0 +1,58 @@
+"""
+Benchmark Binary values in the instance codec: copied vs. zero-copy buffers
+
+Messages are Records holding a packet capture of SIZE bytes (default 65,536) and a SHA-256 hash.
+CBOR: decode and validate a message from bytes, which copies each byte string, and from a memoryview, which
+returns slices of the message buffer, and encode with dumps vs. write to a reused buffer.
+Run from the repository root: python -m benchmarks.binary_buffers [SIZE]
+"""
+import os
+import sys
+import time
+from typing import Callable
+from jadn.codec import cbor
+from jadn.convert import JIDL
+
+SCHEMA = '''
+       package: "http://example.com/bench/binary"
+        config: {"$MaxBinary": 100000000}
+
+Capture = Record
+   1 capture_id       Integer
+   2 packets          Binary
+   3 sha256           Binary{32..32} /x
+'''
+
+
+def timed(func: Callable, *args) -> float:
+    """
+    Return seconds per call, at least 0.2 seconds of calls
+    """
+    n, t0 = 0, time.perf_counter()
+    while (t := time.perf_counter() - t0) < 0.2 or n == 0:
+        func(*args)
+        n += 1
+    return t / n
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 65536
+    pkg = JIDL()
+    pkg.schema_loads(SCHEMA)
+    encode, decode = pkg.instance_codec('Capture', 'concise', 'cbor')
+    check = pkg.instance_validate
+    message = {'capture_id': 1, 'packets': os.urandom(size), 'sha256': os.urandom(32)}
+    data = cbor.dumps(encode(message))
+    assert check(decode(cbor.loads(memoryview(data))), 'Capture') == []
+    mb = size / 1e6
+
+    print(f'Capture message, {size:,} byte packets, {len(data):,} bytes CBOR')
+    t_copy = timed(lambda: check(decode(cbor.loads(data)), 'Capture'))
+    t_view = timed(lambda: check(decode(cbor.loads(memoryview(data))), 'Capture'))
+    print(f'  CBOR decode + validate, bytes:      {t_copy * 1e6:9.2f} us  {mb / t_copy:9,.0f} MB/s')
+    print(f'  CBOR decode + validate, memoryview: {t_view * 1e6:9.2f} us  {mb / t_view:9,.0f} MB/s')
+    out = bytearray()
+    t_write = timed(lambda: (out.clear(), cbor.write(out, encode(message))))
+    t_dumps = timed(lambda: cbor.dumps(encode(message)))
+    print(f'  CBOR encode, dumps:                 {t_dumps * 1e6:9.2f} us  {mb / t_dumps:9,.0f} MB/s')
+    print(f'  CBOR encode, write to buffer:       {t_write * 1e6:9.2f} us  {mb / t_write:9,.0f} MB/s')
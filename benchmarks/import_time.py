@@ -0,0 +1,44 @@
+"""
+Benchmark import cost of each schema format class using "python -X importtime"
+
+Each format is imported in a fresh interpreter; the reported total is the sum of self times of every
+module loaded beyond what a bare interpreter loads, i.e., the cost a caller pays to use that format.
+Run from the repository root: python -m benchmarks.import_time
+"""
+import re
+import subprocess
+import sys
+from jadn import convert, translate
+
+SAMPLES = 5
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+\d+ \| \s*(\S+)$', re.M)
+
+
+def loaded_modules(statement: str) -> list[tuple[int, str]]:
+    err = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                         capture_output=True, text=True, check=True).stderr
+    return [(int(m.group(1)), m.group(2)) for m in IMPORT_LINE.finditer(err)]
+
+
+def import_time(statement: str) -> tuple[float, int]:
+    """
+    Return (microseconds, number of modules) for an import statement, minimum over SAMPLES runs
+    """
+    base = {m[1] for m in loaded_modules('pass')}
+    best = None
+    for _ in range(SAMPLES):
+        mods = [m for m in loaded_modules(statement) if m[1] not in base]
+        t = (sum(m[0] for m in mods), len(mods))
+        best = t if best is None or t[0] < best[0] else best
+    return best
+
+
+if __name__ == '__main__':
+    print(f'{"format":>8} {"class":>8} {"ms":>8} {"modules":>8}')
+    for pkg in (convert, translate):
+        for fmt, (module, cls) in pkg.FORMATS.items():
+            us, n = import_time(f'from {pkg.__name__} import {cls}')
+            print(f'{fmt:>8} {cls:>8} {us / 1e3:8.2f} {n:8}')
+    for pkg in (convert, translate):
+        us, n = import_time(f'from {pkg.__name__} import *')
+        print(f'{"all":>8} {"*":>8} {us / 1e3:8.2f} {n:8}  ({pkg.__name__})')
@@ -0,0 +1,37 @@
+"""
+Benchmark schema-directed CBOR vs. JSON instance serialization
+
+Uses the event messages of benchmarks.instance_codec.  For each serialization style, encode time includes
+json.dumps or cbor.dumps of the encoded value, and decode time includes json.loads or cbor.loads.
+json is the C-accelerated standard library module; cbor is jadn.codec.cbor, written in Python.
+Run from the repository root: python -m benchmarks.instance_cbor [N]
+"""
+import json
+import sys
+from jadn.codec import cbor
+from jadn.convert import JIDL
+from benchmarks.instance_codec import SCHEMA, STYLES, messages, timed
+
+
+def json_dumps(v) -> bytes:
+    return json.dumps(v, separators=(',', ':')).encode()
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    pkg = JIDL()
+    pkg.schema_loads(SCHEMA)
+    msgs = messages(n)
+    print(f'{n:,} Event messages')
+    print(f'{"style":>8} {"format":>6} {"encode us":>10} {"decode us":>10} {"bytes/msg":>10} '
+          f'{"encode msg/s":>13} {"decode msg/s":>13}')
+    for style in STYLES:
+        for fmt, dumps, loads in (('json', json_dumps, json.loads), ('cbor', cbor.dumps, cbor.loads)):
+            encode, decode = pkg.instance_codec('Event', style, fmt)
+            data = [dumps(encode(m)) for m in msgs]
+            assert all(decode(loads(d)) == m for d, m in zip(data, msgs))
+            t_enc = timed(lambda m: dumps(encode(m)), msgs)
+            t_dec = timed(lambda d: decode(loads(d)), data)
+            size = sum(len(d) for d in data) / n
+            print(f'{style:>8} {fmt:>6} {t_enc * 1e6:10.2f} {t_dec * 1e6:10.2f} {size:10.1f} '
+                  f'{1 / t_enc:13,.0f} {1 / t_dec:13,.0f}')
@@ -0,0 +1,105 @@
+"""
+Benchmark compiled instance codecs: encode and decode throughput and payload size per serialization style
+
+Messages are generated instances of an event Record with nested Records, Enumerated, Choice, Binary and
+ArrayOf values.  Encode time includes json.dumps of the encoded value and decode time includes json.loads.
+Run from the repository root: python -m benchmarks.instance_codec [N]
+"""
+import json
+import random
+import sys
+import time
+from jadn.convert import JIDL
+from jadn.codec import codec     # Imported here so compile times do not include import time
+
+SCHEMA = '''
+       package: "http://example.com/bench/codec"
+
+Event = Record
+   1 event_id         Integer
+   2 timestamp        Integer
+   3 source           Device
+   4 severity         Severity
+   5 category         String optional
+   6 payload          Binary
+   7 target           Target
+   8 observations     Observation [1..*]
+
+Device = Record
+   1 hostname         String
+   2 address          Binary /ipv4-addr
+   3 port             Integer /u16
+
+Severity = Enumerated
+   1 low
+   2 medium
+   3 high
+   4 critical
+
+Target = Choice
+   1 device           Device
+   2 hash             Binary /x
+   3 name             String
+
+Observation = Record
+   1 metric_name      String
+   2 value            Number
+   3 unit             String optional
+'''
+STYLES = ('verbose', 'compact', 'concise')
+
+
+def messages(n: int) -> list[dict]:
+    rand = random.Random(1)
+    out = []
+    for k in range(n):
+        device = {'hostname': f'host-{rand.randrange(1000)}.example.com', 'address': rand.randbytes(4),
+                  'port': rand.randrange(65536)}
+        target = rand.choice([{'device': device}, {'hash': rand.randbytes(32)}, {'name': f'file-{k}.bin'}])
+        out.append({
+            'event_id': k,
+            'timestamp': 1700000000 + k,
+            'source': device,
+            'severity': rand.choice(['low', 'medium', 'high', 'critical']),
+            **({'category': 'network'} if k % 2 else {}),
+            'payload': rand.randbytes(rand.randrange(16, 64)),
+            'target': target,
+            'observations': [{'metric_name': f'm{i}', 'value': rand.random()} for i in range(rand.randrange(1, 5))],
+        })
+    return out
+
+
+def timed(func, items: list) -> float:
+    """
+    Return seconds per item of the fastest of 3 runs
+    """
+    best = float('inf')
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for x in items:
+            func(x)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(items)
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    pkg = JIDL()
+    pkg.schema_loads(SCHEMA)
+    msgs = messages(n)
+    print(f'{n:,} Event messages')
+    print(f'{"style":>8} {"compile ms":>11} {"encode us":>10} {"decode us":>10} {"bytes/msg":>10} '
+          f'{"encode msg/s":>13} {"decode msg/s":>13}')
+    size0 = None
+    for style in STYLES:
+        t0 = time.perf_counter()
+        encode, decode = pkg.instance_codec('Event', style)
+        t_compile = time.perf_counter() - t0
+        texts = [json.dumps(encode(m), separators=(',', ':')) for m in msgs]
+        assert all(decode(json.loads(s)) == m for s, m in zip(texts, msgs))
+        t_enc = timed(lambda m: json.dumps(encode(m), separators=(',', ':')), msgs)
+        t_dec = timed(lambda s: decode(json.loads(s)), texts)
+        size = sum(len(s.encode()) for s in texts) / n
+        size0 = size0 or size
+        print(f'{style:>8} {t_compile * 1e3:11.2f} {t_enc * 1e6:10.2f} {t_dec * 1e6:10.2f} {size:10.1f} '
+              f'{1 / t_enc:13,.0f} {1 / t_dec:13,.0f}  ({size / size0:.0%} of verbose size)')
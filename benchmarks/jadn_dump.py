@@ -0,0 +1,117 @@
+"""
+Benchmark serializing schemas in compact JADN format
+
+Compare the streaming writer (JADN.schema_dump / schema_dumps) with the previous implementation, which
+deep-copied the type definitions, converted options in place and formatted the copy with _pprint.
+Reports best-of-N time and peak traced memory (tracemalloc) for jadn_v2.0_schema.jadn and a generated
+schema with N types (default 100,000).
+Run from the repository root: python -m benchmarks.jadn_dump [N]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+from copy import deepcopy
+from typing import Any, Callable
+from jadn.convert import JADN
+from jadn.convert.jadn_rw import _pprint
+from jadn.definitions import CoreType, TypeOptions, Fields, FieldType, FieldOptions
+
+SCHEMA = 'jadn/data/jadn_v2.0_schema.jadn'
+RUNS = 3
+
+
+def legacy_dumps(pkg: JADN, style: dict) -> str:
+    """
+    JADN.schema_dumps before the streaming writer, for comparison
+    """
+    def dump_tagstrings(opts: dict[str, str], ct: str) -> list[str]:
+        def dictopt(v: dict[str, str]) -> str:
+            kv = v.popitem()
+            return chr(pkg.OPT_ID[kv[0]]) + kv[1]
+
+        def strs(k: str, v: Any) -> str:
+            v = '' if isinstance(v, bool) else\
+                f'0x{v.hex()}' if isinstance(v, bytes) else\
+                dictopt(v) if isinstance(v, dict) else\
+                str(v)
+            return chr(pkg.OPT_ID[k]) + str(v)
+
+        return [strs(k, v) for k, v in sorted(opts.items(), key=lambda k: pkg.OPT_ORDER[k[0]])]
+
+    schema_copy = {'meta': x} if (x := pkg.schema.get('meta')) else {}
+    schema_copy.update({'types': deepcopy(pkg.schema['types'])})
+    for td in schema_copy['types']:
+        for fd in td[Fields]:
+            if td[CoreType] == 'Enumerated':
+                fdef = [None, None, '']
+            else:
+                fd[FieldOptions] = dump_tagstrings(fd[FieldOptions], fd[FieldType])
+                fdef = [None, None, None, [], '']
+            while fd and fd[-1] == fdef[len(fd) - 1]:
+                fd.pop()
+        td[TypeOptions] = dump_tagstrings(td[TypeOptions], td[CoreType])
+        tdef = [None, None, [], '', []]
+        while td and td[-1] == tdef[len(td) - 1]:
+            td.pop()
+    return _pprint(schema_copy, strip=style.get('strip', True)) + '\n'
+
+
+def synthetic_schema(n: int) -> str:
+    types = []
+    for k in range(0, n, 4):
+        types += [
+            [f'Record-{k}', 'Record', [], f'Record {k}', [
+                [1, 'id', 'Integer', ['{0'], 'Identifier'],
+                [2, 'name', 'String', ['{1', '}64'], ''],
+                [3, 'kind', f'Kind-{k}', ['[0'], ''],
+                [4, 'items', f'Items-{k}', [], 'Item list'],
+            ]],
+            [f'Kind-{k}', 'Enumerated', [], '', [[1, 'small', ''], [2, 'large', 'Larger than small']]],
+            [f'Items-{k}', 'ArrayOf', ['*String', '{1', 'q'], ''],
+            [f'Name-{k}', 'String', ['%^[a-z]+$', '}32'], 'Lower case name'],
+        ]
+    return json.dumps({'meta': {'package': 'http://example.com/synthetic', 'roots': ['Record-0']}, 'types': types})
+
+
+def measure(dump: Callable[[], Any]) -> tuple[float, int]:
+    t = min(timed(dump) for _ in range(RUNS))
+    tracemalloc.start()
+    dump()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return t, peak
+
+
+def timed(dump: Callable[[], Any]) -> float:
+    t0 = time.perf_counter()
+    dump()
+    return time.perf_counter() - t0
+
+
+def compare(name: str, pkg: JADN) -> None:
+    style = {'strip': False}
+    assert legacy_dumps(pkg, style) == JADN(pkg).schema_dumps(style)
+
+    def write_file():
+        with open(os.devnull, 'w', encoding='utf8') as fp:
+            JADN(pkg).schema_dump(fp, style)
+
+    print(f'{name}: {len(pkg.schema["types"])} types, best of {RUNS}, peak traced memory')
+    for label, dump in (('legacy schema_dumps', lambda: legacy_dumps(pkg, style)),
+                        ('schema_dumps', lambda: JADN(pkg).schema_dumps(style)),
+                        ('schema_dump to file', write_file)):
+        t, peak = measure(dump)
+        print(f'  {label:>20}: {t * 1e3:9.1f} ms {peak / 2**20:9.1f} MB')
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    pkg = JADN()
+    with open(SCHEMA, encoding='utf8') as fp:
+        pkg.schema_load(fp)
+    compare(os.path.basename(SCHEMA), pkg)
+    pkg = JADN()
+    pkg.schema_loads(synthetic_schema(n))
+    compare('synthetic', pkg)
@@ -0,0 +1,63 @@
+"""
+Benchmark loading a large JIDL schema
+
+Generate a JIDL document of about N lines (default 50,000) with Records, Enumerateds, Choices, ArrayOfs
+and constrained primitive types, and time JIDL.schema_loads.
+Run from the repository root: python -m benchmarks.jidl_load [N]
+"""
+import sys
+import time
+from jadn.convert import JIDL
+
+RUNS = 3
+
+
+def synthetic_jidl(n_lines: int) -> str:
+    lines = [
+        '     package: "http://example.com/synthetic/v1.0"',
+        '       title: "Synthetic schema"',
+        '       roots: ["Type-0"]',
+    ]
+    k = 0
+    while len(lines) < n_lines:
+        lines += [
+            '',
+            f'Type-{k} = Record                               // Record {k}',
+            f'   1 id               Integer{{0..*}}                // Identifier',
+            f'   2 name             String{{1..64}}',
+            f'   3 email            String /email optional',
+            f'   4 status           Status-{k}',
+            f'   5 tags             Tag-{k} unique [0..*]          // Tags',
+            f'   6 next             Type-{k + 1} optional',
+            f'   7 score            Number=[0.0, 100.0]',
+            '',
+            f'Status-{k} = Enumerated',
+            '   1 active',
+            '   2 inactive                                        // Not in use',
+            '   3 retired',
+            '',
+            f'Tag-{k} = String{{pattern="^[a-z][-a-z0-9]{{0,31}}$"}}     // Tag value',
+            '',
+            f'Event-{k} = Choice',
+            f'   1 created          Type-{k}',
+            f'   2 renamed          String',
+            f'   3 deleted          Boolean',
+            '',
+            f'History-{k} = ArrayOf(Event-{k}){{1..*}}',
+        ]
+        k += 1
+    return '\n'.join(lines) + '\n'
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    doc = synthetic_jidl(n)
+    times = []
+    for _ in range(RUNS):
+        pkg = JIDL()
+        t0 = time.perf_counter()
+        pkg.schema_loads(doc)
+        times.append(time.perf_counter() - t0)
+    lines = doc.count('\n')
+    print(f'{lines} lines, {len(pkg.schema["types"])} types: best of {RUNS} {min(times):.3f} s, '
+          f'{lines / min(times):,.0f} lines/s')
@@ -0,0 +1,64 @@
+"""
+Benchmark duplicate type pruning when loading a large JSON Schema
+
+Generate a JSON Schema with N definitions (default 10,000), each an object with a nested object property
+and an array property, so the type list built by schema_loads contains many identical anonymous types.
+Compare the hashed pruning used by JSCHEMA.schema_loads with the previous pairwise list search.
+Run from the repository root: python -m benchmarks.jschema_prune [N]
+"""
+import json
+import sys
+import time
+from jadn.translate import JSCHEMA
+from jadn.translate.jschema_rw import prune_types, scandef
+
+
+def synthetic_schema(n: int) -> dict:
+    defs = {}
+    for k in range(n):
+        defs[f'Type-{k}'] = {
+            'type': 'object',
+            'description': f'Definition {k}',
+            'required': ['id'],
+            'properties': {
+                'id': {'type': 'integer', 'minimum': 0},
+                'name': {'type': 'string', 'maxLength': 64},
+                'next': {'$ref': f'#/$defs/Type-{(k + 1) % n}'},
+                'tags': {'type': 'array', 'items': {'type': 'string'}},
+                'point': {'type': 'array', 'items': {       # Same anonymous item type in every definition
+                    'type': 'object', 'properties': {'x': {'type': 'number'}, 'y': {'type': 'number'}}}},
+            }
+        }
+    return {'$id': 'https://example.com/synthetic.json', 'title': 'Synthetic', '$defs': defs}
+
+
+def prune_pairwise(types: list) -> list:
+    ntypes = []
+    for t in types:
+        if t not in ntypes:
+            ntypes.append(t)
+    return ntypes
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    jss = synthetic_schema(n)
+    doc = json.dumps(jss)
+    jssx = {v.get('$id', k): k for k, v in jss['$defs'].items()}
+    nt = []
+    for tn, tv in jss['$defs'].items():
+        scandef(tn, tv, nt, jss, jssx)
+
+    t0 = time.perf_counter()
+    hashed = prune_types(nt)
+    t1 = time.perf_counter()
+    pairwise = prune_pairwise(nt)
+    t2 = time.perf_counter()
+    assert hashed == pairwise
+    print(f'{n} definitions, {len(nt)} generated types, {len(hashed)} after pruning')
+    print(f'  hashed prune:   {(t1 - t0) * 1e3:10.1f} ms')
+    print(f'  pairwise prune: {(t2 - t1) * 1e3:10.1f} ms')
+
+    t0 = time.perf_counter()
+    JSCHEMA().schema_loads(doc)
+    print(f'  schema_loads:   {(time.perf_counter() - t0) * 1e3:10.1f} ms total')
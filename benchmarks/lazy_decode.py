@@ -0,0 +1,45 @@
+"""
+Benchmark lazy decoding: routing on two fields of large messages, eager vs. lazy instance_loads
+
+Messages are the instance_codec Event messages with 200 (or the number given as an argument) observations each.
+Eager time is instance_loads followed by instance_validate; lazy time is instance_loads(lazy=True) and reading
+the severity and source hostname, which decodes and validates only those fields.
+Run from the repository root: python -m benchmarks.lazy_decode [OBSERVATIONS]
+"""
+import json
+import sys
+from jadn.convert import JIDL
+from jadn.codec import cbor
+from benchmarks.instance_codec import SCHEMA, messages, timed
+
+
+def route(msg) -> tuple:
+    return msg['severity'], msg['source']['hostname']
+
+
+if __name__ == '__main__':
+    n_obs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pkg = JIDL()
+    config = f'        config: {{"$MaxElements": {max(n_obs, 255)}}}\n'     # Allow n_obs observations
+    pkg.schema_loads(SCHEMA.replace('\n\n', f'\n{config}\n', 1))
+    msgs = messages(200)
+    for m in msgs:
+        m['observations'] = [{'metric_name': f'm{i}', 'value': i / 7} for i in range(n_obs)]
+    print(f'{len(msgs)} Event messages with {n_obs} observations')
+    print(f'{"format":>6} {"style":>8} {"bytes/msg":>10} {"eager us":>10} {"lazy us":>10} {"speedup":>8}')
+    for data_format in ('json', 'cbor'):
+        dumps = cbor.dumps if data_format == 'cbor' else (lambda v: json.dumps(v, separators=(',', ':')))
+        for style in ('verbose', 'concise'):
+            data = [dumps(pkg.instance_encode(m, 'Event', style, data_format)) for m in msgs]
+            for d, m in zip(data, msgs):
+                assert route(pkg.instance_loads(d, 'Event', style, data_format, lazy=True)) == route(m)
+
+            def eager(d):
+                value = pkg.instance_loads(d, 'Event', style, data_format)
+                assert not pkg.instance_validate(value, 'Event')
+                return route(value)
+            t_eager = timed(eager, data)
+            t_lazy = timed(lambda d: route(pkg.instance_loads(d, 'Event', style, data_format, lazy=True)), data)
+            size = sum(len(d) for d in data) / len(data)
+            print(f'{data_format:>6} {style:>8} {size:10.0f} {t_eager * 1e6:10.1f} {t_lazy * 1e6:10.1f} '
+                  f'{t_eager / t_lazy:7.1f}x')
@@ -0,0 +1,42 @@
+"""
+Benchmark cold-start cost of the first JADNCore instance with and without the metaschema table cache
+
+Each sample runs in a fresh interpreter so class tables are never shared between samples.
+Run from the repository root: python -m benchmarks.metaschema_cache
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SAMPLES = 20
+PROBE = '''
+import time
+t0 = time.perf_counter()
+from jadn.core import JADNCore
+t1 = time.perf_counter()
+JADNCore()
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1)
+'''
+
+
+def cold_start(cache_dir: str) -> tuple[float, float]:
+    env = os.environ | {'JADN_CACHE_DIR': cache_dir}
+    out = subprocess.run([sys.executable, '-c', PROBE], env=env, capture_output=True, text=True, check=True)
+    t_import, t_init = out.stdout.split()
+    return float(t_import), float(t_init)
+
+
+def report(label: str, samples: list[tuple[float, float]]) -> None:
+    t_import = statistics.median(s[0] for s in samples) * 1e3
+    t_init = statistics.median(s[1] for s in samples) * 1e3
+    print(f'{label:>10}: import jadn.core {t_import:6.2f} ms, first JADNCore() {t_init:6.2f} ms (median)')
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        report('no cache', [cold_start('') for _ in range(SAMPLES)])
+        cold_start(tmp)     # Populate cache
+        report('cached', [cold_start(tmp) for _ in range(SAMPLES)])
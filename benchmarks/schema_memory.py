@@ -0,0 +1,71 @@
+"""
+Measure memory held by a loaded schema in list form and in the slotted form of jadn.model
+
+Generate a schema with N fields (default 100,000 and 1,000,000) in Records of 10 fields, about half
+with options, plus Enumerated and String types, and report traced memory (tracemalloc) retained by
+the type definitions after loading.
+Run from the repository root: python -m benchmarks.schema_memory [N ...]
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from jadn.convert import JADN
+from jadn.model import types_from_lists, types_to_lists
+
+
+def synthetic_schema(n_fields: int) -> str:
+    types = []
+    for k in range(n_fields // 10):
+        types += [
+            [f'Record-{k}', 'Record', [], f'Record {k}', [
+                [1, 'id', 'Integer', [], 'Identifier'],
+                [2, 'name', 'String', ['{1', '}64'], ''],
+                [3, 'kind', f'Kind-{k % 100}', ['[0'], ''],
+                [4, 'created', 'Timestamp', [], ''],
+                [5, 'modified', 'Timestamp', ['[0'], ''],
+                [6, 'owner', 'Name', [], ''],
+                [7, 'tags', 'Name', ['[0', ']-1'], 'Tags'],
+                [8, 'parent', f'Record-{max(k - 1, 0)}', ['[0'], ''],
+                [9, 'size', 'Integer', ['{0'], ''],
+                [10, 'note', 'String', ['[0'], ''],
+            ]],
+        ]
+    types += [[f'Kind-{k}', 'Enumerated', [], '', [[1, 'small', ''], [2, 'large', '']]] for k in range(100)]
+    types += [['Name', 'String', ['%^[a-z]+$', '}32'], ''], ['Timestamp', 'Integer', ['/date-time'], '']]
+    return json.dumps({'meta': {'package': 'http://example.com/synthetic'}, 'types': types})
+
+
+def measure(n_fields: int) -> None:
+    doc = synthetic_schema(n_fields)
+    gc.collect()
+    tracemalloc.start()
+    pkg = JADN()
+    pkg.schema_loads(doc)
+    types = pkg.schema['types']
+    del pkg
+    gc.collect()
+    list_mem = tracemalloc.get_traced_memory()[0]
+
+    t0 = time.perf_counter()
+    model = types_from_lists(types)
+    t_from = time.perf_counter() - t0
+    del types
+    gc.collect()
+    model_mem = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    types = types_to_lists(model)
+    t_to = time.perf_counter() - t0
+    tracemalloc.stop()
+    assert types_from_lists(types) == model
+
+    print(f'{n_fields:,} fields, {len(model):,} types:')
+    print(f'  list form:    {list_mem / 2**20:8.1f} MB')
+    print(f'  slotted form: {model_mem / 2**20:8.1f} MB ({model_mem / list_mem:.0%})')
+    print(f'  convert: from lists {t_from:.2f} s, to lists {t_to:.2f} s (traced)')
+
+
+if __name__ == '__main__':
+    for n in [int(a) for a in sys.argv[1:]] or [100000, 1000000]:
+        measure(n)
@@ -0,0 +1,58 @@
+"""
+Benchmark metaschema validation: native JADNCore.schema_validate vs. the JSON Schema in jadn/data
+
+The JSON Schema check (as in test/test_wellformed.py) validates the serialized schema with the jsonschema
+package; the native check validates the loaded schema.  Neither time includes loading.  Bundled schemas
+are validated one at a time, and generated schemas with N fields (default 100,000) serially and across a pool
+of worker processes.  jsonschema takes minutes for 1,000,000 fields.
+Run from the repository root: python -m benchmarks.schema_validate [N ...]
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+from jsonschema import Draft202012Validator
+from jadn.core import data_dir
+from jadn.convert import JADN
+from jadn.validate.metaschema import check_schema
+from benchmarks.schema_memory import synthetic_schema
+
+SCHEMA_DIR = Path('schemas/jadn')
+
+
+def timed(func: Callable, *args) -> float:
+    """
+    Return seconds per call, at least 0.2 seconds of calls
+    """
+    n, t0 = 0, time.perf_counter()
+    while (t := time.perf_counter() - t0) < 0.2 or n == 0:
+        func(*args)
+        n += 1
+    return t / n
+
+
+def compare(name: str, jadn_str: str, validator: Draft202012Validator, jobs: int = 1) -> None:
+    pkg = JADN()
+    pkg.schema_loads(jadn_str)
+    jadn_json = json.loads(jadn_str)
+    assert not list(validator.iter_errors(jadn_json))
+    t_js = timed(lambda: list(validator.iter_errors(jadn_json)))
+    t_native = timed(check_schema, pkg)
+    line = f'{name:>24}: {len(pkg.schema["types"]):7} types, jsonschema {t_js * 1e3:9.2f} ms, ' \
+           f'native {t_native * 1e3:8.2f} ms ({t_js / t_native:5.1f}x)'
+    if jobs > 1:
+        t_pool = timed(check_schema, pkg, jobs)
+        line += f', {jobs} jobs {t_pool * 1e3:8.2f} ms'
+    print(line)
+
+
+if __name__ == '__main__':
+    with open(os.path.join(data_dir(), 'jadn_v2.0_schema.json'), encoding='utf8') as fp:
+        v = Draft202012Validator(json.load(fp))
+    for path in sorted(SCHEMA_DIR.glob('*.jadn')):
+        compare(path.name, path.read_text(encoding='utf8'), v)
+    print()
+    for n in [int(a) for a in sys.argv[1:]] or [100_000]:
+        compare(f'{n:,} fields', synthetic_schema(n), v, os.cpu_count())
@@ -0,0 +1,42 @@
+"""
+Benchmark parsing JIDL type strings
+
+Render the type string of every type, and of every field with a core type, in the bundled JADN schemas,
+then time typestr2jadn over the collected strings.
+Run from the repository root: python -m benchmarks.typestr_parse
+"""
+import time
+from pathlib import Path
+from jadn.convert import JADN
+from jadn.definitions import CoreType, TypeOptions, Fields, FieldType, FieldOptions, is_builtin
+from jadn.utils import jadn2typestr, typestr2jadn
+
+SCHEMA_DIRS = ('schemas/jadn', 'jadn/data')
+DURATION = 1.0     # Seconds
+
+
+def type_strings(pkg: JADN) -> list[str]:
+    strings = []
+    for td in pkg.schema['types']:
+        strings.append(jadn2typestr(pkg, td[CoreType], td[TypeOptions]))
+        for fd in td[Fields] if td[CoreType] != 'Enumerated' else ():
+            if is_builtin(fd[FieldType]):
+                fto = {k: v for k, v in fd[FieldOptions].items() if k not in pkg.FIELD_OPTS}
+                strings.append(jadn2typestr(pkg, fd[FieldType], fto))
+    return strings
+
+
+if __name__ == '__main__':
+    pkg = JADN()
+    strings = []
+    for path in sorted(p for d in SCHEMA_DIRS for p in Path(d).glob('*.jadn')):
+        with open(path, encoding='utf8') as fp:
+            pkg.schema_load(fp)
+        strings += type_strings(pkg)
+    n, t0 = 0, time.perf_counter()
+    while (t := time.perf_counter() - t0) < DURATION:
+        for s in strings:
+            typestr2jadn(pkg, s)
+        n += len(strings)
+    print(f'{len(strings)} type strings ({len(set(strings))} distinct, mean length '
+          f'{sum(len(s) for s in strings) / len(strings):.1f}): {t / n * 1e6:.2f} us per string, {n / t:,.0f} strings/s')
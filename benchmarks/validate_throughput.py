@@ -0,0 +1,106 @@
+"""
+Benchmark compiled instance validation over the bundled schemas
+
+For each type in each schema in schemas/jadn, generate a small valid instance and time its validation.
+Types for which no valid instance can be generated (e.g., String patterns, abstract types) are skipped.
+Run from the repository root: python -m benchmarks.validate_throughput [-v]
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from jadn.convert import JADN
+from jadn.definitions import TypeName, CoreType, TypeOptions, Fields, ItemID, ItemValue, \
+    FieldID, FieldName, FieldType, FieldOptions, is_builtin
+
+SCHEMA_DIR = Path('schemas/jadn')
+DURATION = 0.05     # Seconds per type
+
+
+def sample(pkg: JADN, ctype: str, topts: dict, fields: list, depth: int = 0) -> Any:
+    """
+    Return a minimal instance of a type definition
+    """
+    def ref(ftype: str, fopts: dict) -> Any:
+        if is_builtin(ftype):
+            return sample(pkg, ftype, fopts, [], depth + 1)
+        td = tx[ftype]
+        return sample(pkg, td[CoreType], td[TypeOptions], td[Fields], depth + 1)
+
+    def field(fd: list) -> Any:
+        v = ref(fd[FieldType], fd[FieldOptions])
+        return [v] * max(fd[FieldOptions].get('minOccurs', 1), 1) if fd[FieldOptions].get('maxOccurs', 1) != 1 else v
+
+    tx = {td[TypeName]: td for td in pkg.schema['types']}
+    if depth > 20:
+        raise RecursionError
+    if 'const' in topts:
+        return topts['const']
+    lo = topts.get('minLength', 0)
+    match ctype:
+        case 'Binary':
+            return b'\x00' * max(lo, {'ipv4-addr': 4, 'ipv6-addr': 16, 'uuid': 16, 'eui': 6}.get(topts.get('format'), 0))
+        case 'Boolean':
+            return True
+        case 'Integer' | 'Number':
+            v = topts['minInclusive'] if 'minInclusive' in topts else topts['minExclusive'] + 1 \
+                if 'minExclusive' in topts else topts.get('maxInclusive', topts.get('maxExclusive', 1) - 1)
+            return v if ctype == 'Integer' else float(v)
+        case 'String':
+            return 'x' * max(lo, 1)
+        case 'Enumerated':
+            if ref_type := topts.get('enum', topts.get('pointer')):
+                return tx[ref_type][Fields][0][FieldID if topts.get('id') else FieldName]
+            return fields[0][ItemID if topts.get('id') else ItemValue]
+        case 'Choice':
+            return {fields[0][FieldName]: field(fields[0])}
+        case 'Array':
+            return [field(fd) for fd in fields]
+        case 'ArrayOf':
+            return [ref(topts['valueType'], {}) for _ in range(max(lo, 1))]
+        case 'MapOf':
+            return {ref(topts['keyType'], {}): ref(topts['valueType'], {})}
+        case 'Map' | 'Record':
+            key = FieldID if topts.get('id') else FieldName
+            return {fd[key]: field(fd) for fd in fields if fd[FieldOptions].get('minOccurs', 1) > 0}
+
+
+def bench(pkg: JADN, type_name: str, instance: Any) -> float:
+    """
+    Return seconds per validation
+    """
+    check = pkg.run_schema[type_name]
+    n, t0 = 0, time.perf_counter()
+    while (t := time.perf_counter() - t0) < DURATION:
+        for _ in range(100):
+            check(instance)
+        n += 100
+    return t / n
+
+
+if __name__ == '__main__':
+    verbose = '-v' in sys.argv
+    total_n, total_t = 0, 0.0
+    for path in sorted(SCHEMA_DIR.glob('*.jadn')):
+        pkg = JADN()
+        with open(path, encoding='utf8') as fp:
+            pkg.schema_load(fp)
+        t0 = time.perf_counter()
+        pkg.instance_validate(None, pkg.schema['types'][0][TypeName])   # Compile
+        t_compile = time.perf_counter() - t0
+        times = {}
+        for td in pkg.schema['types']:
+            try:
+                instance = sample(pkg, td[CoreType], td[TypeOptions], td[Fields])
+            except (KeyError, IndexError, RecursionError):
+                continue
+            if not pkg.instance_validate(instance, td[TypeName]):
+                times[td[TypeName]] = bench(pkg, td[TypeName], instance)
+        print(f'{path.name}: {len(pkg.run_schema)} types compiled in {t_compile * 1e3:.2f} ms, '
+              f'{len(times)} benchmarked')
+        for tn, t in times.items() if verbose else ():
+            print(f'  {tn:>24}: {t * 1e6:8.2f} us, {1 / t:12,.0f} msg/s')
+        total_n += len(times)
+        total_t += sum(times.values())
+    print(f'\nOverall: {total_n} types, mean {total_t / total_n * 1e6:.2f} us per message, '
+          f'{total_n / total_t:,.0f} messages/s')
@@ -0,0 +1,41 @@
+"""
+Benchmark loading a large XSD schema
+
+Load the schema in a fresh interpreter and report wall time and peak resident set size (RSS), with the
+RSS of an interpreter that has only imported the XSD class as a baseline.
+Run from the repository root: python -m benchmarks.xsd_load [schema.xsd]
+"""
+import subprocess
+import sys
+
+SCHEMA = 'schemas/concrete/niem-core-6.0-ps2.xsd'
+RUNS = 5
+
+CHILD = '''
+import resource, sys, time
+from jadn.translate import XSD
+pkg = XSD()
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+if sys.argv[1]:
+    with open(sys.argv[1], encoding='utf8') as fp:
+        pkg.schema_load(fp)
+print(time.perf_counter() - t0, base, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def run(path: str) -> tuple[float, int, int]:
+    out = subprocess.run([sys.executable, '-c', CHILD, path], capture_output=True, text=True, check=True).stdout
+    t, base, peak = out.split()
+    return float(t), int(base), int(peak)
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else SCHEMA
+    results = [run(path) for _ in range(RUNS)]
+    t = min(r[0] for r in results)
+    base = min(r[1] for r in results)
+    peak = min(r[2] for r in results)
+    print(f'{path}: best of {RUNS}')
+    print(f'  wall time: {t * 1e3:8.1f} ms')
+    print(f'  peak RSS:  {peak / 1024:8.1f} MB ({(peak - base) / 1024:.1f} MB over {base / 1024:.1f} MB after import)')
@@ -0,0 +1,31 @@
+"""
+Lazy loading of the schema format classes of a package (PEP 562)
+"""
+from importlib import import_module
+from typing import Callable
+
+
+def make_lazy(formats: dict[str, tuple[str, str]], namespace: dict) -> tuple[Callable, Callable, Callable]:
+    """
+    Return the format_class, __getattr__ and __dir__ functions of a package that imports format classes on first use
+
+    :param formats: {data format: (module, class)}
+    :param namespace: globals() of the package
+    """
+    def format_class(data_format: str) -> type:
+        """
+        Return the schema class for a data format, importing its module if needed
+        """
+        module, name = formats[data_format]
+        return getattr(import_module(module), name)
+
+    def __getattr__(name: str) -> type:
+        for fmt, (module, cls) in formats.items():
+            if name == cls:
+                namespace[name] = c = format_class(fmt)     # Later lookups bypass __getattr__
+                return c
+        raise AttributeError(f'module {namespace["__name__"]!r} has no attribute {name!r}')
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(namespace['__all__']))
+    return format_class, __getattr__, __dir__
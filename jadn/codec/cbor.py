@@ -0,0 +1,252 @@
+"""
+CBOR (RFC 8949) serialization of encoded instances
+
+dumps writes the values produced by instance encoders for the "cbor" data format: integers, floats, text and
+byte strings, arrays, maps, booleans and null.  Floats are written in double precision unless they are Float16
+or Float32 values, which encoders produce for Number types with format f16 or f32.  loads reads definite-length
+items of the same kinds; tags, indefinite-length items and integers outside the 64-bit range are not supported,
+and arrays and maps may be nested at most MAX_DEPTH levels deep.
+
+Byte strings are not copied more than needed: bytes-like values (bytes, bytearray, memoryview) are appended to
+the output buffer as is, and write can append to a caller's buffer that is reused across messages.  When loads
+is given a memoryview, byte strings are returned as memoryview slices of it, without copying.
+
+offsets and skip locate the items of an array or map without decoding them, for lazy decoding (see lazy.py).
+"""
+import struct
+from typing import Any
+
+
+class Float16(float):
+    """
+    Number written as an IEEE 754 half-precision float
+    """
+
+
+class Float32(float):
+    """
+    Number written as an IEEE 754 single-precision float
+    """
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serialize a value to CBOR, see write
+
+    :raise ValueError: if value contains a type that cannot be serialized
+    """
+    out = bytearray()
+    write(out, value)
+    return bytes(out)
+
+
+def loads(data: bytes | bytearray | memoryview) -> Any:
+    """
+    Deserialize one CBOR item
+
+    :param data: CBOR item; if a memoryview, byte strings in the result are memoryview slices of data
+    :raise ValueError: if data is not a single well-formed, supported CBOR item
+    """
+    if isinstance(data, memoryview) and data.format != 'B':
+        data = data.cast('B')
+    try:
+        value, pos = read(data, 0)
+    except (IndexError, struct.error):
+        raise ValueError('CBOR data is truncated') from None
+    if pos != len(data):
+        raise ValueError(f'CBOR data has {len(data) - pos} extra bytes')
+    return value
+
+
+# ========================================================
+# Support functions
+# ========================================================
+
+HEAD = (    # (limit, struct format) of the argument of an item head: 0..23 in initial byte, then 1, 2, 4, 8 bytes
+    (256, struct.Struct('>BB')),
+    (65536, struct.Struct('>BH')),
+    (2 ** 32, struct.Struct('>BI')),
+    (2 ** 64, struct.Struct('>BQ')),
+)
+FLOAT = {   # Float type: (initial byte, struct format)
+    float: (0xfb, struct.Struct('>d')),
+    Float32: (0xfa, struct.Struct('>f')),
+    Float16: (0xf9, struct.Struct('>e')),
+}
+SIMPLE = {0xf4: False, 0xf5: True, 0xf6: None, 0xf7: None}     # false, true, null, undefined
+MAX_DEPTH = 256     # Nesting limit of arrays and maps read, below the Python recursion limit
+
+
+def head(out: bytearray, major: int, n: int) -> None:
+    """
+    Append the head of a data item: major type and argument
+    """
+    if n < 24:
+        out.append(major << 5 | n)
+        return
+    for ai, (limit, fmt) in enumerate(HEAD, start=24):
+        if n < limit:
+            out += fmt.pack(major << 5 | ai, n)
+            return
+    raise ValueError(f'{n} is outside the 64-bit CBOR integer range')
+
+
+def write(out: bytearray, v: Any) -> None:
+    """
+    Append the CBOR serialization of a value to a buffer
+    """
+    t = type(v)
+    if t is str:
+        b = v.encode('utf8')
+        head(out, 3, len(b))
+        out += b
+    elif t is int:
+        if v >= 0:
+            head(out, 0, v)
+        else:
+            head(out, 1, -1 - v)
+    elif t is dict:
+        head(out, 5, len(v))
+        for k, x in v.items():
+            write(out, k)
+            write(out, x)
+    elif t is list or t is tuple:
+        head(out, 4, len(v))
+        for x in v:
+            write(out, x)
+    elif t in FLOAT:
+        ib, fmt = FLOAT[t]
+        out.append(ib)
+        try:
+            out += fmt.pack(v)
+        except (OverflowError, struct.error):
+            raise ValueError(f'{v} is outside the range of {t.__name__}') from None
+    elif v is None:
+        out.append(0xf6)
+    elif v is True or v is False:
+        out.append(0xf5 if v else 0xf4)
+    elif t is bytes or t is bytearray or t is memoryview:
+        head(out, 2, v.nbytes if t is memoryview else len(v))
+        out += v
+    else:
+        for base in (str, int, float, dict, list, bytes):     # Subclasses, e.g., jadn_types.Binary
+            if isinstance(v, base):
+                return write(out, base(v))
+        raise ValueError(f'{t.__name__} cannot be serialized to CBOR')
+
+
+def read(buf: bytes | bytearray | memoryview, pos: int, depth: int = 0) -> tuple[Any, int]:
+    """
+    Return the item at pos and the position following it; depth is the number of arrays and maps containing it
+    """
+    ib = buf[pos]
+    major, n = ib >> 5, ib & 0x1f
+    pos += 1
+    if major == 7:
+        if ib in SIMPLE:
+            return SIMPLE[ib], pos
+        for fb, fmt in FLOAT.values():
+            if ib == fb:
+                return fmt.unpack_from(buf, pos)[0], pos + fmt.size
+        raise ValueError(f'unsupported CBOR simple value 0x{ib:02x}')
+    if n >= 24:
+        if n > 27:
+            raise ValueError(f'unsupported CBOR item 0x{ib:02x}: reserved or indefinite length')
+        size = 1 << (n - 24)
+        n = int.from_bytes(buf[pos:pos + size], 'big')
+        pos += size
+        if pos > len(buf):
+            raise IndexError
+    if major == 0:
+        return n, pos
+    if major == 1:
+        return -1 - n, pos
+    if major == 2 or major == 3:
+        if pos + n > len(buf):
+            raise IndexError
+        b = buf[pos:pos + n]    # Copy of bytes or bytearray data, view of memoryview data
+        try:
+            return (b if major == 2 else str(b, 'utf8')), pos + n
+        except UnicodeDecodeError:
+            raise ValueError('CBOR text string is not valid UTF-8') from None
+    if (major == 4 or major == 5) and depth >= MAX_DEPTH:
+        raise ValueError(f'CBOR arrays and maps are nested more than {MAX_DEPTH} levels deep')
+    if major == 4:
+        items = []
+        for _ in range(n):
+            x, pos = read(buf, pos, depth + 1)
+            items.append(x)
+        return items, pos
+    if major == 5:
+        items = {}
+        for _ in range(n):
+            k, pos = read(buf, pos, depth + 1)
+            x, pos = read(buf, pos, depth + 1)
+            try:
+                items[k] = x
+            except TypeError:
+                raise ValueError(f'CBOR map key {k!r} is not hashable') from None
+        return items, pos
+    raise ValueError(f'unsupported CBOR item 0x{ib:02x}: tag')
+
+
+def argument(buf: bytes | bytearray | memoryview, pos: int) -> tuple[int, int, int]:
+    """
+    Return the major type and argument of the item head at pos, and the position following the head
+    """
+    ib = buf[pos]
+    n = ib & 0x1f
+    pos += 1
+    if n >= 24:
+        if n > 27:
+            raise ValueError(f'unsupported CBOR item 0x{ib:02x}: reserved or indefinite length')
+        size = 1 << (n - 24)
+        n = int.from_bytes(buf[pos:pos + size], 'big')
+        pos += size
+    return ib >> 5, n, pos
+
+
+def skip(buf: bytes | bytearray | memoryview, pos: int) -> int:
+    """
+    Return the position following the item at pos, without decoding it
+    """
+    todo = 1
+    while todo:
+        todo -= 1
+        major, n, pos = argument(buf, pos)
+        if major == 2 or major == 3:
+            pos += n
+        elif major == 4:
+            todo += n
+        elif major == 5:
+            todo += 2 * n
+        elif major == 6:
+            raise ValueError('unsupported CBOR item: tag')
+    if pos > len(buf):
+        raise IndexError
+    return pos
+
+
+def offsets(buf: bytes | bytearray | memoryview, pos: int) -> tuple[list[int] | dict[Any, int], int]:
+    """
+    Return the positions of the items of the array at pos, or {key: position of value} of the map at pos,
+    and the position following the array or map.  Map keys are read, values and array items are skipped.
+    """
+    major, n, pos = argument(buf, pos)
+    if major == 4:
+        items = []
+        for _ in range(n):
+            items.append(pos)
+            pos = skip(buf, pos)
+        return items, pos
+    if major == 5:
+        items = {}
+        for _ in range(n):
+            k, pos = read(buf, pos)
+            try:
+                items[k] = pos
+            except TypeError:
+                raise ValueError(f'CBOR map key {k!r} is not hashable') from None
+            pos = skip(buf, pos)
+        return items, pos
+    raise ValueError(f'CBOR major type {major} is not an array or map')
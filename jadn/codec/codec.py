@@ -0,0 +1,489 @@
+"""
+Compile a JADN schema into instance encoders and decoders for the JSON and CBOR serialization styles
+
+  verbose: Record and Map instances are objects keyed by field name, Enumerated items and Choice keys are names
+  compact: Record instances are arrays in field order, otherwise as verbose
+  concise: Record instances are arrays, Map instances are objects keyed by field id, Enumerated items and
+           Choice keys are ids
+
+Each type definition is compiled once per style into an (encode, decode) pair, with its field id and name
+tables built in advance.  Encoders convert API values (see validate/validator.py) to JSON values, e.g., Binary
+bytes to Base64url strings, and decoders convert JSON values, e.g., from json.loads, back to API values.
+A type whose JSON value is its API value in a style, e.g., a verbose Record of Strings and Numbers, is not
+converted: its values are returned as is, not copied.
+
+For the CBOR data format, encoded values are written by cbor.dumps: Binary values are byte strings, not text,
+concise Records and Maps are maps with integer keys, MapOf instances are always maps, sized Integer formats
+(i#, u#) are range checked, and Number formats f16 and f32 are written at that precision.
+
+ArrayOf values of Integer and Number types may be numeric buffers, e.g., array.array, which are encoded as lists.
+Codecs check structure, not values: decoded values can be checked with JADNCore.instance_validate.
+Omitted optional fields of compact and concise Records are null, or absent at the end of the array.
+Choice types with the "combine" option are not converted.
+"""
+from typing import Any, Callable
+from jadn.definitions import (TypeName, CoreType, TypeOptions, Fields, ItemID, ItemValue,
+                              FieldID, FieldName, FieldType, FieldOptions, is_builtin)
+from jadn.codec.cbor import Float16, Float32
+from jadn.validate.validator import (resolve_fields, bulk_type, numeric_buffer, BINARY_TEXT, FORMAT_RANGE,
+                                    SIZED_FORMAT)
+
+STYLES = ('verbose', 'compact', 'concise')
+DATA_FORMATS = ('json', 'cbor')
+FLOAT_FORMATS = {'f16': Float16, 'f32': Float32}    # Number formats written at reduced precision in CBOR
+Codec = tuple[Callable[[Any], Any], Callable[[Any], Any]]     # (encode, decode)
+
+
+def same(v: Any) -> Any:
+    return v
+
+
+SAME = (same, same)     # Codec of types that are not converted
+
+
+def compile_codec(pkg, style: str = 'verbose', data_format: str = 'json') -> dict[str, Codec]:
+    """
+    Compile all type definitions in a loaded schema
+
+    :param pkg: JADNCore instance with a loaded schema
+    :param style: serialization style: verbose, compact or concise
+    :param data_format: json or cbor
+    :return: {TypeName: (encode, decode)}
+    """
+    ctx = make_context(pkg, style, data_format)
+    ctx['cells'] = {tn: [None] for tn in ctx['tx']}
+    for tn, td in ctx['tx'].items():
+        ctx['cells'][tn][0] = compile_type(ctx, tn, td[CoreType], td[TypeOptions], resolve_fields(ctx, td))
+    return {tn: c[0] for tn, c in ctx['cells'].items()}
+
+
+# ========================================================
+# Support functions
+# ========================================================
+
+def make_context(pkg, style: str, data_format: str) -> dict:
+    """
+    Build the tables used to compile type definitions; cells of referenced types are added by the caller
+    """
+    if style not in STYLES:
+        raise ValueError(f'Unknown serialization style "{style}"')
+    if data_format not in DATA_FORMATS:
+        raise ValueError(f'Unknown data format "{data_format}"')
+    cbor = data_format == 'cbor'
+    return {
+        'tx': pkg.schema_index().types,
+        'type_opts': pkg.TYPE_OPTS,
+        'cbor': cbor,
+        'names': style != 'concise',    # Enumerated items, Choice keys and Map keys are names, not ids
+        'arrays': style == 'compact' or style == 'concise' and not cbor,    # Record instances are arrays
+        'plain': {},                    # {TypeName: bool}, see is_plain
+        'cells': {},                    # {TypeName: [codec]}
+    }
+
+
+def is_plain(ctx: dict, ctype: str, topts: dict, fields: list, seen: tuple = ()) -> bool:
+    """
+    Return True if the encoded value of a type is its API value in the compiled style
+    """
+    match ctype:
+        case 'Boolean' | 'String':
+            return True
+        case 'Integer' | 'Number':
+            return not (ctx['cbor'] and sized_format(ctype, topts))
+        case 'Binary':
+            return False
+        case 'Enumerated':
+            return ctx['names'] or 'id' in topts or 'pointer' in topts
+        case 'Choice':
+            return 'combine' in topts or ctx['names'] and 'id' not in topts and all(
+                ref_plain(ctx, fd[FieldType], fd[FieldOptions], seen) for fd in fields)
+        case 'Array':
+            return all(field_plain(ctx, fd, seen) for fd in fields)
+        case 'ArrayOf':     # Numeric buffers, e.g., array.array, are converted to lists
+            return ref_plain(ctx, topts['valueType'], {}, seen) and bulk_type(ctx, topts['valueType']) is None
+        case 'MapOf':
+            return str_keys(ctx, topts['keyType']) and ref_plain(ctx, topts['keyType'], {}, seen) and \
+                ref_plain(ctx, topts['valueType'], {}, seen)
+        case 'Map':
+            return ctx['names'] and 'id' not in topts and all(field_plain(ctx, fd, seen) for fd in fields)
+        case 'Record':
+            return not ctx['arrays'] and ctx['names'] and all(field_plain(ctx, fd, seen) for fd in fields)
+    return False
+
+
+def ref_plain(ctx: dict, ftype: str, fopts: dict, seen: tuple = ()) -> bool:
+    """
+    Return True if values of a referenced type, or of an anonymous core type with type options in fopts,
+    are not converted.  Types in a reference cycle are treated as converted.
+    """
+    if is_builtin(ftype):
+        return is_plain(ctx, ftype, {k: v for k, v in fopts.items() if k in ctx['type_opts']}, [], seen)
+    if (td := ctx['tx'].get(ftype)) is None:
+        return True         # External (namespace-qualified) reference: not converted
+    if (p := ctx['plain'].get(ftype)) is None:
+        if ftype in seen:
+            return False
+        p = ctx['plain'][ftype] = is_plain(ctx, td[CoreType], td[TypeOptions], resolve_fields(ctx, td),
+                                           seen + (ftype,))
+    return p
+
+
+def field_plain(ctx: dict, fd: list, seen: tuple = ()) -> bool:
+    fopts = fd[FieldOptions]
+    if fopts.get('tagId'):
+        return False
+    if fopts.get('link'):
+        return (key := link_key(ctx, fd)) is None or field_plain(ctx, key, seen)
+    return ref_plain(ctx, fd[FieldType], fopts, seen)
+
+
+def str_keys(ctx: dict, ktype: str) -> bool:
+    """
+    Return True if MapOf keys of a type encode as strings, so MapOf instances are JSON objects, not arrays.
+    CBOR map keys can be any type.
+    """
+    td = ctx['tx'].get(ktype, [ktype, ktype, {}])
+    return ctx['cbor'] or td[CoreType] == 'String' or td[CoreType] == 'Enumerated' and 'id' not in td[TypeOptions] and (
+            ctx['names'] or 'pointer' in td[TypeOptions])
+
+
+def sized_format(ctype: str, topts: dict) -> str:
+    """
+    Return an Integer format with a size limit (i#, u#) or a reduced-precision Number format (f16, f32), or ''
+    """
+    fmt = topts.get('format', '')
+    if ctype == 'Number':
+        return fmt if fmt in FLOAT_FORMATS else ''
+    return fmt if (m := SIZED_FORMAT.match(fmt)) and m.group(1) in 'iu' else ''
+
+
+def link_key(ctx: dict, fd: list) -> list | None:
+    """
+    Return the key field of the type referenced by a link field
+    """
+    td = ctx['tx'].get(fd[FieldType])
+    key = [f for f in resolve_fields(ctx, td) if f[FieldOptions].get('key')] if td else []
+    return key[0] if key else None
+
+
+def type_cell(ctx: dict, tname: str, ftype: str, fopts: dict) -> list | None:
+    """
+    Return [codec] for a referenced type, or for an anonymous core type with type options in fopts,
+    or None if its values are not converted
+    """
+    if ref_plain(ctx, ftype, fopts):
+        return None
+    if is_builtin(ftype):
+        topts = {k: v for k, v in fopts.items() if k in ctx['type_opts']}
+        return [compile_type(ctx, tname, ftype, topts, [])]
+    return ctx['cells'][ftype]
+
+
+def field_cell(ctx: dict, tname: str, fd: list) -> list | None:
+    """
+    Return [codec] for a field, including multiplicity and links, or None if its values are not converted
+    """
+    fopts = fd[FieldOptions]
+    if fopts.get('link'):       # Link value is the key of the referenced type
+        return field_cell(ctx, tname, key) if (key := link_key(ctx, fd)) else None
+    if (cell := type_cell(ctx, f'{tname}.{fd[FieldName]}', fd[FieldType], fopts)) is None:
+        return None
+    if fopts.get('maxOccurs', 1) != 1 or fopts.get('minOccurs', 1) > 1:
+        return [(lambda v: [cell[0][0](x) for x in v], lambda v: [cell[0][1](x) for x in v])]
+    return cell
+
+
+def tag_cells(ctx: dict, tname: str, fd: list) -> dict:
+    """
+    Return {tag value: [codec] or None} for a field whose type is selected by a tagId field
+    """
+    ref = ctx['tx'].get(fd[FieldType])
+    alts = {}
+    for af in resolve_fields(ctx, ref) if ref else []:
+        c = type_cell(ctx, f'{tname}.{fd[FieldName]}', af[FieldType], af[FieldOptions])
+        alts.update({af[FieldName]: c, af[FieldID]: c})
+    return alts
+
+
+def compile_type(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Codec:
+    """
+    Compile a type definition into an (encode, decode) pair
+    """
+    if is_plain(ctx, ctype, topts, fields, (tname,)):
+        return SAME
+    return {
+        'Binary': compile_binary,
+        'Integer': compile_number,
+        'Number': compile_number,
+        'Enumerated': compile_enumerated,
+        'Choice': compile_choice,
+        'Array': compile_array,
+        'ArrayOf': compile_arrayof,
+        'Map': compile_map,
+        'MapOf': compile_mapof,
+        'Record': compile_map,
+    }[ctype](ctx, tname, ctype, topts, fields)
+
+
+def enc(cell: list | None, x: Any) -> Any:
+    return x if cell is None or x is None else cell[0][0](x)
+
+
+def dec(cell: list | None, x: Any) -> Any:
+    return x if cell is None or x is None else cell[0][1](x)
+
+
+# ========================================================
+# Primitive types
+# ========================================================
+
+def compile_binary(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Codec:
+    """
+    Binary values are bytes-like, JSON values are text: Base64url by default, or as specified by format.
+    CBOR values are byte strings: bytes-like values are written as is, text values are converted.
+    """
+    fmt = topts.get('format', 'b64')
+    to_text, from_text = BINARY_TEXT.get(fmt, BINARY_TEXT['b64'])
+    if ctx['cbor']:
+        def encode_bytes(v: Any) -> bytes | bytearray | memoryview:
+            if isinstance(v, (bytes, bytearray, memoryview)):
+                return v
+            if not isinstance(v, str):
+                raise ValueError(f'{tname}: {type(v).__name__} is not Binary')
+            try:
+                return from_text(v)
+            except ValueError:
+                raise ValueError(f'{tname}: "{v}" is not a valid {fmt} string') from None
+
+        def decode_bytes(v: Any) -> bytes:
+            if not isinstance(v, (bytes, bytearray, memoryview)):
+                raise ValueError(f'{tname}: {type(v).__name__} is not a byte string')
+            return v
+        return encode_bytes, decode_bytes
+
+    def encode(v: Any) -> str:
+        if isinstance(v, str):      # API value may already be text
+            return v
+        if not isinstance(v, (bytes, bytearray, memoryview)):
+            raise ValueError(f'{tname}: {type(v).__name__} is not Binary')
+        return to_text(v)
+
+    def decode(v: Any) -> bytes:
+        if not isinstance(v, str):
+            raise ValueError(f'{tname}: {type(v).__name__} is not a {fmt} string')
+        try:
+            return from_text(v)
+        except ValueError:
+            raise ValueError(f'{tname}: "{v}" is not a valid {fmt} string') from None
+    return encode, decode
+
+
+def compile_number(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Codec:
+    """
+    CBOR Integer and Number values with sized formats (see sized_format)
+    """
+    fmt = sized_format(ctype, topts)
+    if ctype == 'Number':
+        return FLOAT_FORMATS[fmt], same
+    m = SIZED_FORMAT.match(fmt)
+    lo, hi = FORMAT_RANGE[m.group(1)](int(m.group(2)))
+
+    def encode(v: Any) -> Any:
+        if isinstance(v, int) and not lo <= v <= hi:
+            raise ValueError(f'{tname}: {v} is out of range for {fmt}')
+        return v
+    return encode, same
+
+
+# ========================================================
+# Union and compound types
+# ========================================================
+
+def compile_enumerated(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Codec:
+    """
+    Concise Enumerated values are item ids
+    """
+    if ref := topts.get('enum'):
+        fields = resolve_fields(ctx, ctx['tx'][ref]) if ref in ctx['tx'] else []
+        to_id = {f[FieldName]: f[FieldID] for f in fields}
+    else:
+        to_id = {f[ItemValue]: f[ItemID] for f in fields}
+    to_name = {i: n for n, i in to_id.items()}
+
+    def convert(table: dict) -> Callable[[Any], Any]:
+        def conv(v: Any) -> Any:
+            try:
+                if v is not True and v is not False:
+                    return table[v]
+            except (KeyError, TypeError):
+                pass
+            raise ValueError(f'{tname}: {v!r} is not a valid item')
+        return conv
+    return convert(to_id), convert(to_name)
+
+
+def compile_choice(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Codec:
+    """
+    Choice values are objects with one property: the name (id if "id" or concise) of the selected field
+    """
+    ids = topts.get('id', False)
+    api = FieldID if ids else FieldName
+    wire = FieldID if ids or not ctx['names'] else FieldName
+    text = not ctx['cbor']     # JSON property names are strings
+    enc_table, dec_table = {}, {}
+    for fd in fields:
+        cell = type_cell(ctx, f'{tname}.{fd[FieldName]}', fd[FieldType], fd[FieldOptions])
+        enc_table[fd[api]] = (fd[wire], cell)
+        dec_table[fd[wire]] = (fd[api], cell)
+    if ids:
+        enc_table.update({str(k): v for k, v in enc_table.items()})
+    if wire == FieldID and text:
+        dec_table.update({str(k): v for k, v in dec_table.items()})
+
+    def convert(table: dict, conv: Callable) -> Callable[[Any], dict]:
+        def choice(v: Any) -> dict:
+            if not isinstance(v, dict) or len(v) != 1:
+                raise ValueError(f'{tname}: Choice must be an object with one property')
+            k, x = next(iter(v.items()))
+            if (c := table.get(k)) is None:
+                raise ValueError(f'{tname}: "{k}" is not a valid choice')
+            return {c[0]: conv(c[1], x)}
+        return choice
+    return convert(enc_table, enc), convert(dec_table, dec)
+
+
+def compile_array(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Codec:
+    cells = [field_cell(ctx, tname, fd) for fd in fields]
+
+    def convert(conv: Callable) -> Callable[[Any], list]:
+        def array(v: Any) -> list:
+            if not isinstance(v, list):
+                raise ValueError(f'{tname}: {type(v).__name__} is not an array')
+            if len(v) > len(cells):
+                raise ValueError(f'{tname}: {len(v)} items, expected at most {len(cells)}')
+            return [conv(c, x) for c, x in zip(cells, v)]
+        return array
+    return convert(enc), convert(dec)
+
+
+def compile_arrayof(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Codec:
+    """
+    API values of Integer and Number items may be numeric buffers (see validator.numeric_buffer), encoded as lists
+    """
+    cell = type_cell(ctx, f'{tname}[]', topts['valueType'], {})
+    buffers = bulk_type(ctx, topts['valueType']) is not None
+
+    def convert(n: int) -> Callable[[Any], list]:
+        def arrayof(v: Any) -> list:
+            if not isinstance(v, list):
+                if n or not buffers or (items := numeric_buffer(v)) is None:
+                    raise ValueError(f'{tname}: {type(v).__name__} is not an array')
+                v = v.tolist() if hasattr(v, 'tolist') else items.tolist()    # NumPy arrays convert float16
+            if cell is None:
+                return v
+            conv = cell[0][n]
+            return [x if x is None else conv(x) for x in v]
+        return arrayof
+    return convert(0), convert(1)
+
+
+def compile_mapof(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Codec:
+    """
+    MapOf values are objects if keys encode as strings, otherwise arrays of alternating keys and values
+    """
+    kcell = type_cell(ctx, f'{tname}{{key}}', topts['keyType'], {})
+    vcell = type_cell(ctx, f'{tname}{{value}}', topts['valueType'], {})
+    as_object = str_keys(ctx, topts['keyType'])
+
+    def encode(v: Any) -> dict | list:
+        if not isinstance(v, dict):
+            raise ValueError(f'{tname}: {type(v).__name__} is not an object')
+        if as_object:
+            return {enc(kcell, k): enc(vcell, x) for k, x in v.items()}
+        return [y for k, x in v.items() for y in (enc(kcell, k), enc(vcell, x))]
+
+    def decode(v: Any) -> dict:
+        if as_object:
+            if not isinstance(v, dict):
+                raise ValueError(f'{tname}: {type(v).__name__} is not an object')
+            return {dec(kcell, k): dec(vcell, x) for k, x in v.items()}
+        if not isinstance(v, list) or len(v) % 2:
+            raise ValueError(f'{tname}: MapOf must be an array of keys and values')
+        return {dec(kcell, k): dec(vcell, x) for k, x in zip(v[::2], v[1::2])}
+    return encode, decode
+
+
+def compile_map(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Codec:
+    """
+    Map and Record: property names are field names, or field ids if a Map has the "id" option or is concise.
+    Compact and concise Records are arrays of field values in field order, except that concise CBOR Records
+    are maps keyed by field id.
+    """
+    enc_table, dec_table = field_tables(ctx, tname, ctype, topts, fields)
+    as_array = ctype == 'Record' and ctx['arrays']
+    tagged = any(t for k, c, t, a in enc_table.values())
+    size = len(fields)
+
+    def encode(v: Any) -> dict | list:
+        if not isinstance(v, dict):
+            raise ValueError(f'{tname}: {type(v).__name__} is not an object')
+        out = [None] * size if as_array else {}
+        for k, x in v.items():
+            if (f := enc_table.get(k)) is None:
+                raise ValueError(f'{tname}: unexpected property "{k}"')
+            key, cell, tag, alts = f
+            out[key] = enc(alts.get(v.get(tag)) if alts else cell, x)
+        if as_array:
+            while out and out[-1] is None:  # Omit trailing optional fields
+                out.pop()
+        return out
+
+    def decode(v: Any) -> dict:
+        if as_array:
+            if not isinstance(v, list):
+                raise ValueError(f'{tname}: {type(v).__name__} is not an array')
+            if len(v) > size:
+                raise ValueError(f'{tname}: {len(v)} items, expected at most {size}')
+            items = ((n, x) for n, x in enumerate(v) if x is not None)
+        elif not isinstance(v, dict):
+            raise ValueError(f'{tname}: {type(v).__name__} is not an object')
+        else:
+            items = v.items()
+        out = {}
+        for k, x in items:
+            if (f := dec_table.get(k)) is None:
+                raise ValueError(f'{tname}: unexpected property "{k}"')
+            out[f[0]] = x if f[3] else dec(f[1], x)
+        if tagged:      # Decode tagged values after their tags
+            for k, x in out.items():
+                if alts := enc_table[k][3]:
+                    out[k] = dec(alts.get(out.get(enc_table[k][2])), x)
+        return out
+    return encode, decode
+
+
+def field_tables(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> tuple[dict, dict]:
+    """
+    Return the (encode, decode) field tables of a Map or Record, also used to decode one field at a time by lazy.py.
+    API keys are field names, or field ids if a Map has the "id" option.
+    """
+    ids = ctype == 'Map' and topts.get('id', False)
+    as_array = ctype == 'Record' and ctx['arrays']
+    api = FieldID if ids else FieldName
+    wire = FieldID if ids or not ctx['names'] and (ctype == 'Map' or ctx['cbor']) else FieldName
+    api_keys = {fd[FieldID]: fd[api] for fd in fields}
+    enc_table = {}      # {API key: (JSON key or position, [codec] or None, tag key, {tag: [codec]})}
+    dec_table = {}      # {JSON key or position: (API key, ...)}
+    for n, fd in enumerate(fields):
+        if tag_id := fd[FieldOptions].get('tagId'):
+            cell, tag, alts = None, api_keys.get(int(tag_id)), tag_cells(ctx, tname, fd)
+        else:
+            cell, tag, alts = field_cell(ctx, tname, fd), None, None
+        key = n if as_array else fd[wire]
+        enc_table[fd[api]] = (key, cell, tag, alts)
+        dec_table[key] = (fd[api], cell, tag, alts)
+    if ids:
+        enc_table.update({str(k): v for k, v in enc_table.items()})
+    if wire == FieldID and not as_array and not ctx['cbor']:    # JSON property names are strings
+        dec_table.update({str(k): v for k, v in dec_table.items()})
+    return enc_table, dec_table
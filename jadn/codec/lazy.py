@@ -0,0 +1,253 @@
+"""
+Lazy decoding of serialized Record, Map and MapOf instances
+
+LazyDecoder.loads returns a read-only mapping (LazyMap) backed by a serialized instance instead of an API value.
+Each field is located, decoded and validated when it is first accessed, using the field tables of the type's
+compiled codec and validator (codec.field_tables, validator.field_checks), so reading one or two fields of a
+large instance does not pay for converting and checking the others.  Fields whose type is a Record, Map or MapOf
+are also LazyMaps.  Checks on the instance as a whole, e.g., required fields and number of properties, are run
+only when LazyMap.validate is called.
+
+CBOR data is not parsed in advance: the first access to a LazyMap reads its keys and skips its values
+(cbor.offsets) to index field positions in the buffer, and a field value is read when it is accessed.
+If the data is a memoryview, Binary values are views of it.  JSON text is parsed by json.loads, which is
+implemented in C and is faster than scanning the text in Python; fields of the parsed value are converted
+and validated when they are accessed.
+"""
+import json
+import struct
+from collections.abc import Mapping
+from typing import Any, Iterator
+from jadn.definitions import TypeName, CoreType, TypeOptions, FieldID, FieldName, FieldType, FieldOptions
+from jadn.codec import cbor, codec
+from jadn.validate import validator
+
+LAZY_TYPES = ('Record', 'Map', 'MapOf')
+
+
+class LazyDecoder:
+    """
+    Deserialize instances of a loaded schema in one serialization style and data format, decoding fields on access
+
+    Field tables of Record, Map and MapOf types are built on first use from the compiled codecs and checks.
+    """
+    def __init__(self, pkg, style: str = 'verbose', data_format: str = 'json'):
+        self.pkg = pkg
+        self.style = style
+        self.data_format = data_format
+        self.types = {}     # {TypeName: LazyType or None}
+        self.ctx = None     # codec context with cells of the compiled codecs
+        self.vctx = None    # validator context with cells of the compiled checks
+
+    def loads(self, data: str | bytes | bytearray | memoryview, type_name: str) -> Any:
+        """
+        Deserialize an instance: a LazyMap if its type is a Record, Map or MapOf, otherwise its API value
+
+        :param data: JSON text, or CBOR data for the cbor data format
+        :param type_name: name of the instance's type
+        :raise ValueError: if data is not well-formed; errors in fields are raised when they are accessed
+        """
+        decode = self.pkg.instance_codec(type_name, self.style, self.data_format)[1]
+        ltype = self.lazy_type(type_name)
+        if self.data_format == 'cbor':
+            if isinstance(data, memoryview) and data.format != 'B':
+                data = data.cast('B')
+            return decode(cbor.loads(data)) if ltype is None else LazyMap(ltype, data, 0)
+        value = json.loads(data)
+        return decode(value) if ltype is None else LazyMap(ltype, None, value)
+
+    def lazy_type(self, type_name: str) -> 'LazyType | None':
+        if type_name not in self.types:
+            td = self.pkg.schema_index().types.get(type_name)
+            self.types[type_name] = LazyType(self, td) if td and td[CoreType] in LAZY_TYPES else None
+        return self.types[type_name]
+
+    def contexts(self) -> tuple[dict, dict]:
+        if self.ctx is None:
+            pkg = self.pkg
+            pkg.compile(self.style, self.data_format)
+            self.ctx = codec.make_context(pkg, self.style, self.data_format)
+            self.ctx['cells'] = {tn: [c] for tn, c in pkg.codecs[(self.style, self.data_format)].items()}
+            self.vctx = validator.make_context(pkg)
+            self.vctx['cells'] = {tn: [c] for tn, c in pkg.run_schema.items()}
+        return self.ctx, self.vctx
+
+
+class LazyType:
+    """
+    Field tables of a Record, Map or MapOf type for decoding and checking one field at a time
+    """
+    def __init__(self, decoder: LazyDecoder, td: list):
+        ctx, vctx = decoder.contexts()
+        self.decoder = decoder
+        self.name = tname = td[TypeName]
+        self.ctype = ctype = td[CoreType]
+        self.decode = decoder.pkg.codecs[(decoder.style, decoder.data_format)][tname][1]
+        self.check = decoder.pkg.run_schema[tname]
+        topts = td[TypeOptions]
+        fields = validator.resolve_fields(ctx, td)
+        self.size = len(fields)
+        self.fields = {}    # {API key: (codec cell, check cell, nested TypeName, tag key, tag codecs, tag checks)}
+        self.keys = {}      # {JSON key or position: API key}
+        self.value = None   # MapOf: field tables entry of all values
+        if ctype == 'MapOf':
+            self.as_array = False
+            self.as_object = codec.str_keys(ctx, topts['keyType'])
+            self.key_cell = codec.type_cell(ctx, f'{tname}{{key}}', topts['keyType'], {})
+            vtype = topts['valueType']
+            self.value = (codec.type_cell(ctx, f'{tname}{{value}}', vtype, {}),
+                          validator.type_cell(vctx, f'{tname}{{value}}', vtype, {}),
+                          self.nested(vtype, {}), None, None, None)
+            return
+        self.as_array = ctype == 'Record' and ctx['arrays']
+        enc_table, dec_table = codec.field_tables(ctx, tname, ctype, topts, fields)
+        checks, _, tagged = validator.field_checks(vctx, tname, ctype, topts, fields)
+        tag_checks = {k: alts for k, t, alts in tagged}
+        api = FieldID if ctype == 'Map' and topts.get('id', False) else FieldName
+        for fd in fields:
+            k = fd[api]
+            _, cell, tag, alts = enc_table[k]
+            self.fields[k] = (cell, checks.get(k), self.nested(fd[FieldType], fd[FieldOptions]), tag, alts,
+                              tag_checks.get(k))
+        self.keys = {key: f[0] for key, f in dec_table.items()}
+
+    def nested(self, ftype: str, fopts: dict) -> str | None:
+        """
+        Return the type of a single value field that is decoded lazily, or None
+        """
+        if fopts.get('maxOccurs', 1) != 1 or fopts.get('minOccurs', 1) > 1 or fopts.get('link') or \
+                fopts.get('tagId'):
+            return None
+        td = self.decoder.pkg.schema_index().types.get(ftype)
+        return ftype if td and td[CoreType] in LAZY_TYPES else None
+
+    def scan(self, buf: Any, raw: Any) -> dict:
+        """
+        Return {API key: position in buf or parsed JSON value} of the fields present in an instance
+        """
+        if buf is None:
+            items, is_null = raw, (lambda x: x is None)
+        else:
+            items, end = locate(buf, raw)
+            if raw == 0 and end != len(buf):
+                raise ValueError(f'CBOR data has {len(buf) - end} extra bytes')
+            is_null = (lambda x: buf[x] == 0xf6)     # CBOR null
+        if self.ctype == 'MapOf':
+            if isinstance(items, dict) and self.as_object:
+                pairs = items.items()
+            elif isinstance(items, list) and not self.as_object and len(items) % 2 == 0:
+                pairs = zip((read(buf, k) for k in items[::2]), items[1::2])
+            elif self.as_object:
+                raise ValueError(f'{self.name}: {type(items).__name__} is not an object')
+            else:
+                raise ValueError(f'{self.name}: MapOf must be an array of keys and values')
+            return {codec.dec(self.key_cell, k): x for k, x in pairs}
+        if self.as_array:
+            if not isinstance(items, list):
+                raise ValueError(f'{self.name}: {type(items).__name__} is not an array')
+            if len(items) > self.size:
+                raise ValueError(f'{self.name}: {len(items)} items, expected at most {self.size}')
+            return {self.keys[n]: x for n, x in enumerate(items) if not is_null(x)}
+        if not isinstance(items, dict):
+            raise ValueError(f'{self.name}: {type(items).__name__} is not an object')
+        index = {}
+        for k, x in items.items():
+            if (key := self.keys.get(k)) is None:
+                raise ValueError(f'{self.name}: unexpected property "{k}"')
+            index[key] = x
+        return index
+
+    def field(self, lmap: 'LazyMap', key: Any, raw: Any) -> Any:
+        """
+        Decode and check the value of a field
+        """
+        cell, check, nested, tag, alts, tag_checks = self.value or self.fields[key]
+        if nested and not (raw is None if lmap.buf is None else lmap.buf[raw] == 0xf6):
+            return LazyMap(self.decoder.lazy_type(nested), lmap.buf, raw)
+        if alts:
+            t = lmap.get(tag)
+            cell, check = alts.get(t), tag_checks.get(t)
+            if check is None:
+                raise ValueError(f'{validator.pointer(key)}: {self.name}: tag "{tag}" does not select a type')
+        if check is None:   # Field id reused by an extension, as reported by the validator
+            raise ValueError(f'{validator.pointer(key)}: {self.name}: unexpected property')
+        value = codec.dec(cell, read(lmap.buf, raw))
+        if errors := check[0](value):
+            raise ValueError('; '.join(f'{ptr}: {msg}' for ptr, msg in validator.prefix(key, errors)))
+        return value
+
+
+class LazyMap(Mapping):
+    """
+    Read-only API value of a Record, Map or MapOf instance whose fields are decoded and validated on access
+
+    Accessing a field raises KeyError if it is absent and ValueError if its value is not valid.
+    """
+    __slots__ = ('ltype', 'buf', 'raw', 'index', 'values')
+
+    def __init__(self, ltype: LazyType, buf: bytes | bytearray | memoryview | None, raw: Any):
+        self.ltype = ltype
+        self.buf = buf          # CBOR data, or None for JSON
+        self.raw = raw          # position of the instance in buf, or its parsed JSON value
+        self.index = None       # {API key: position or parsed value}, built on first access
+        self.values = {}        # {API key: API value} of accessed fields
+
+    def __getitem__(self, key: Any) -> Any:
+        if key in self.values:
+            return self.values[key]
+        raw = self.fields()[key]
+        value = self.values[key] = self.ltype.field(self, key, raw)
+        return value
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.fields()
+
+    def __iter__(self) -> Iterator:
+        return iter(self.fields())
+
+    def __len__(self) -> int:
+        return len(self.fields())
+
+    def __repr__(self) -> str:
+        return f'<LazyMap {self.ltype.name}: {len(self.values)} of {len(self)} fields decoded>'
+
+    def fields(self) -> dict:
+        if self.index is None:
+            self.index = self.ltype.scan(self.buf, self.raw)
+        return self.index
+
+    def validate(self) -> list[tuple[str, str]]:
+        """
+        Decode and validate the whole instance, including fields that have not been accessed
+
+        :return: list of (JSON Pointer, message) errors, empty if the instance is valid
+        """
+        try:
+            self.fields()   # Check CBOR data for extra bytes
+            value = self.ltype.decode(read(self.buf, self.raw))
+        except ValueError as e:
+            return [('', str(e))]
+        return list(self.ltype.check(value))
+
+
+# ========================================================
+# Support functions
+# ========================================================
+
+def read(buf: bytes | bytearray | memoryview | None, raw: Any) -> Any:
+    """
+    Return the CBOR item at position raw of buf, or the parsed JSON value raw if buf is None
+    """
+    if buf is None:
+        return raw
+    try:
+        return cbor.read(buf, raw)[0]
+    except (IndexError, struct.error):
+        raise ValueError('CBOR data is truncated') from None
+
+
+def locate(buf: bytes | bytearray | memoryview, pos: int) -> tuple[list[int] | dict[Any, int], int]:
+    try:
+        return cbor.offsets(buf, pos)
+    except (IndexError, struct.error):
+        raise ValueError('CBOR data is truncated') from None
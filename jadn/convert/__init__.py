@@ -1,6 +1,19 @@
-from jadn.convert.jadn_rw import JADN
-from jadn.convert.jidl_rw import JIDL
-from jadn.convert.xasd_rw import XASD
-from jadn.convert.md_rw import MD
-from jadn.convert.atree_w import ATREE
-from jadn.convert.erd_w import ERD
+"""
+Schema format classes for equivalent (lossless) and presentation formats
+
+Classes are imported on first use (PEP 562) so that a format's dependencies, e.g., lxml for XASD
+or asciitree for ATREE, are loaded only if that format is used.
+"""
+from jadn._lazy import make_lazy
+
+FORMATS = {     # Data format: (module, class)
+    'jadn': ('jadn.convert.jadn_rw', 'JADN'),
+    'jidl': ('jadn.convert.jidl_rw', 'JIDL'),
+    'xasd': ('jadn.convert.xasd_rw', 'XASD'),
+    'md': ('jadn.convert.md_rw', 'MD'),
+    'atree': ('jadn.convert.atree_w', 'ATREE'),
+    'erd': ('jadn.convert.erd_w', 'ERD'),
+}
+__all__ = [c for m, c in FORMATS.values()]
+
+format_class, __getattr__, __dir__ = make_lazy(FORMATS, globals())
@@ -3,6 +3,7 @@ from asciitree.drawing import BoxStyle, BOX_BLANK, BOX_ASCII, BOX_LIGHT, BOX_HEA
 
 from jadn.core import JADNCore, build_deps
 from jadn.definitions import TypeName, CoreType, TypeOptions
+from jadn.graph import roots, subtree
 from jadn.utils import jadn2typestr
 
 """
@@ -37,9 +38,7 @@ class ATREE(JADNCore):
         tr = tree_style(style['draw'])
         tag_deps = build_deps(self)     # Get labeled type definitions and their dependencies
         deps = {k: [d[0] for d in v if d[1] == 'C'] for k, v in tag_deps.items()}   # Only Contained values
-        refs = {d for v in deps.values() for d in v}   # All referenced types
-        roots = set(deps) - refs        # Unreferenced types
-        tree = '\n\n'.join([tr(build_tree(deps, root)) for root in roots])
+        tree = '\n\n'.join([tr(build_tree(deps, root)) for root in roots(deps)])
         tx = {} if style['detail'] == 'conceptual' else {k[TypeName]: k for k in self.schema['types']}
         return '\n'.join([line(t, tx, style['detail']) for t in tree.split('\n')])
 
@@ -48,24 +47,7 @@ class ATREE(JADNCore):
 # ========================================================
 
 def build_tree(dependencies: dict[str, list], root: str) -> dict[str, dict]:
-    state = {}    # Node state: default: not seen, 1: processing, 2: done
-    subtree = {}
-
-    def dfs(node: str) -> dict[str, dict]:  # Depth-first search
-        state[node] = 1     # Started processing node
-        tr = {}
-        for dep in dependencies.get(node, []):
-            if (c := state.get(dep, 0)) == 1:
-                raise ValueError(f'Graph cycle detected at: {node}->{dep}')
-            if c == 0:
-                tr |= {dep: dfs(dep)}
-                subtree[dep] = tr[dep]
-            if c == 2:
-                tr |= {dep: subtree[dep]}
-        state[node] = 2  # Mark node and its subtree as processed.
-        return tr
-
-    return {f' ({root})': dfs(root)}
+    return {f' ({root})': subtree(dependencies, root)}
 
 
 def tree_style(style: str) -> LeftAligned:
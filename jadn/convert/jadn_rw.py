@@ -1,10 +1,8 @@
 import json
-from copy import deepcopy
-from jadn.definitions import TypeName, CoreType, TypeOptions, Fields, \
-    ItemID, ItemValue, FieldType, FieldOptions
-from jadn.core import JADNCore, jadn_schema_loads, dump_option_types
+from jadn.definitions import TypeName, CoreType, TypeOptions, TypeDesc, Fields, FieldOptions, FieldDesc
+from jadn.core import JADNCore, jadn_schema_loads
 from numbers import Number
-from typing import Any
+from typing import Any, Iterator
 
 
 # =========================================================
@@ -32,53 +30,80 @@ class JADN(JADNCore):
         Don't include empty metadata section
         Don't include empty trailing optional columns
         """
+        return ''.join(self.iter_dumps(style))
 
-        def dump_tagstrings(opts: dict[str, str], ct: str) -> list[str]:
-            """
-            Serialize TypeOptions and FieldOptions dict as JSON list of tag-strings
-            """
-
-            def dictopt(v: dict[str, str]) -> str:
-                kv = v.popitem()
-                return chr(self.OPT_ID[kv[0]]) + kv[1]
-
-            def strs(k: str, v: Any) -> str:    # TODO: fix boolean False encoding
-                v = '' if isinstance(v, bool) else\
-                    f'0x{v.hex()}' if isinstance(v, bytes) else\
-                    dictopt(v) if isinstance(v, dict) else\
-                    str(v)
-                return chr(self.OPT_ID[k]) + str(v)
-
-            return [strs(k, v) for k, v in sorted(opts.items(),  # Sort options to a canonical order to ease comparison
-                                                  key=lambda k: self.OPT_ORDER[k[0]])]
-
-        schema_copy = {'meta': x} if (x := self.schema.get('meta')) else {}
-        schema_copy.update({'types': deepcopy(self.schema['types'])})
-        # dump_option_types(schema_copy['types'], self.OPT_TYPE)
-
-        for td in schema_copy['types']:
-            # Clean up field defs
-            for fd in td[Fields]:       # TODO: delete default=1 minOccurs/maxOccurs (until instance validation)
-                if td[CoreType] == 'Enumerated':
-                    fdef = [None, None, '']
-                else:
-                    fd[FieldOptions] = dump_tagstrings(fd[FieldOptions], fd[FieldType])
-                    fdef = [None, None, None, [], '']
-                while fd and fd[-1] == fdef[len(fd) - 1]:
-                    fd.pop()
-            # Clean up type def
-            td[TypeOptions] = dump_tagstrings(td[TypeOptions], td[CoreType])
-            tdef = [None, None, [], '', []]
-            while td and td[-1] == tdef[len(td) - 1]:
-                td.pop()
-
-        return _pprint(schema_copy, strip=style.get('strip', True)) + '\n'
+    def iter_dumps(self, style: dict=None) -> Iterator[str]:
+        """
+        Generate JADN data in compact format: the meta section, then one chunk per type definition
+
+        Type definitions are serialized directly from the loaded schema, which is not modified.
+        """
+        strip = (style or {}).get('strip', True)
+        sep2 = ',\n' if strip else ',\n\n'     # Remove empty lines between types if strip
+        if meta := self.schema.get('meta'):
+            yield f'{{\n  "meta": {_pprint(meta, 1, strip=strip)}{sep2}  "types": '
+        else:
+            yield '{\n  "types": '
+        if not (types := self.schema['types']):
+            yield '[]\n}\n'
+            return
+
+        for n, td in enumerate(types):
+            yield (f'{sep2}    ' if n else '[\n    ') + _dumps_typedef(self, td)
+        yield '\n  ]\n}\n'
 
 
 # ========================================================
 # Support functions
 # ========================================================
 
+_dumps = json.JSONEncoder(ensure_ascii=False).encode
+TYPE_EMPTY = [None, None, [], '']           # Default values of type definition columns, omitted if trailing
+FIELD_EMPTY = [None, None, None, [], '']
+ITEM_EMPTY = [None, None, '']
+
+
+def _dumps_tagstrings(self, opts: dict[str, Any]) -> list[str]:
+    """
+    Serialize TypeOptions and FieldOptions dict as list of tag-strings, sorted to a canonical order
+    """
+    tags = []
+    for k in sorted(opts, key=self.OPT_ORDER.__getitem__):
+        v = opts[k]
+        if isinstance(v, bool):     # TODO: fix boolean False encoding
+            v = ''
+        elif isinstance(v, bytes):
+            v = f'0x{v.hex()}'
+        elif isinstance(v, dict):
+            dk, dv = next(reversed(v.items()))
+            v = chr(self.OPT_ID[dk]) + dv
+        tags.append(chr(self.OPT_ID[k]) + str(v))
+    return tags
+
+
+def _dumps_typedef(self, td: list) -> str:
+    """
+    Serialize one type definition in compact format, omitting empty trailing columns
+    """
+    tdef = [td[TypeName], td[CoreType], _dumps_tagstrings(self, td[TypeOptions]), td[TypeDesc]]
+    if not (fields := td[Fields]):
+        while tdef and tdef[-1] == TYPE_EMPTY[len(tdef) - 1]:
+            tdef.pop()
+        return _dumps(tdef)
+
+    lines = []
+    enum = td[CoreType] == 'Enumerated'
+    for fd in fields:
+        if enum:
+            fdef, empty = list(fd), ITEM_EMPTY
+        else:
+            fdef, empty = [*fd[:FieldOptions], _dumps_tagstrings(self, fd[FieldOptions]), *fd[FieldDesc:]], FIELD_EMPTY
+        while fdef and fdef[-1] == empty[len(fdef) - 1]:
+            fdef.pop()
+        lines.append(_dumps(fdef))
+    return f'{_dumps(tdef)[:-1]}, [\n      ' + ',\n      '.join(lines) + '\n    ]]'
+
+
 def _pprint(val: Any, level: int = 0, indent: int = 2, strip: bool = False) -> str:
     """
     Prettyprint a JSON-serialized JADN schema in compact format
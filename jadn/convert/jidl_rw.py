@@ -3,22 +3,24 @@ Convert JADN to/from JADN Interface Definition Language (JIDL)
 """
 import json
 import re
+from typing import Any, Callable, Iterator
 from jadn.core import JADNCore
 from jadn.definitions import TypeName, CoreType, TypeOptions, TypeDesc, Fields, ItemID, FieldID, META_ORDER
 from jadn.utils import (jadn2typestr, jadn2fieldstr, typestr2jadn, fieldstr2jadn,
                      cleanup_tagid, raise_error, id_type, etrunc)
 
 
-# JIDL -> JADN Type regexes
-p_tname = r'\s*(\S+)'                   # Type Name
-p_assign = r'\s*='                      # Type assignment operator
-p_tstr = r'\s*(.*?)\s*\{?'              # Type definition
-
-# JIDL -> JADN Field regexes
-p_id = r'\s*(\d+)'  # Field ID
-p_fname = r'\s+(\S+)' # Field Name
-p_fstr = r'\s*(.*?)'  # Field definition or Enum value
-p_range = r'\s*(?:\[([.*\w]+)\]|(optional))?'  # Multiplicity
+# JIDL line grammar:
+#   schema = {meta-line} {type-line {field-line}}
+#   meta-line = name ":" JSON-value
+#   type-line = TypeName "=" type-string ["{"] [" //" description]
+#   field-line = FieldID field-string [" //" description]
+# Blank and comment ("//") lines are ignored, a closing brace line ends the fields of a type.
+META_LINE = re.compile(r'\s*([-\w]+):\s*(.+?)\s*$')               # Name: value
+TYPE_LINE = re.compile(r'\s*(\S+)\s*=\s*(.*?)\s*\{?$')           # TypeName = type-string
+FIELD_LINE = re.compile(r'\s*(\d+)(.*)$')                          # FieldID field-string
+QUOTED = re.compile(r'"(?:[^"\\]|\\.)+"')                          # Quoted string, e.g., pattern option
+CLOSE_LINE = re.compile(r'\s*}\s*$')
 
 class JIDL(JADNCore):
     def style(self) -> dict:
@@ -36,24 +38,28 @@ class JIDL(JADNCore):
     def schema_loads(self, doc: str, source: dict=None) -> None:
         meta = {}
         types = []
-        fields = None
-        for line in doc.splitlines():
-            if line:
-                t, v = _line2jadn(self, line, types[-1] if types else None)    # Parse a JIDL line
-                if t == 'F':
-                    fields.append(v)
-                elif fields:
+        fields = None       # Fields of the current type, None if not in a type definition
+        for n, line in enumerate(doc.splitlines(), start=1):
+            try:
+                t, v = _line2jadn(self, line, types[-1] if fields is not None else None)     # Parse a JIDL line
+            except ValueError as e:
+                raise_error(f'JIDL Load - line {n}, column {getattr(e, "column", 1)}: {e}')
+            if t == 'F':
+                fields.append(v)
+            elif t:
+                if fields:
                     cleanup_tagid(fields)
-                    fields = None
+                fields = None
                 if t == 'I':
                     meta.update({v[0]: json.loads(v[1])})
                 elif t == 'T':
                     types.append(v)
                     fields = types[-1][Fields]
+        if fields:
+            cleanup_tagid(fields)
         self.schema = {'meta': meta, 'types': types} if meta else {'types': types}
         self.source = source
         self.schema_load_finish()
-        pass
 
     def schema_dumps(self, style: dict=None) -> str:
         """
@@ -64,21 +70,27 @@ class JIDL(JADNCore):
         :return: JADN-IDL text
         :rtype: str
         """
+        return ''.join(self.iter_dumps(style))
+
+    def iter_dumps(self, style: dict=None) -> Iterator[str]:
+        """
+        Generate JADN-IDL text: the meta section, then one chunk per type definition
+        """
         w = self.style()
         if style:
             w.update(style)   # Override any specified column widths
 
-        text = ''
         meta = self.schema.get('meta', {})
         mlist = [k for k in META_ORDER if k in meta]
-        for k in mlist + list(set(meta) - set(mlist)):              # Display meta elements in fixed order
-            text += f'{k:>{w["meta"]}}: {json.dumps(meta[k])}\n'    # TODO: wrap to page width, continuation-line parser
+        yield ''.join(      # Display meta elements in fixed order
+            f'{k:>{w["meta"]}}: {json.dumps(meta[k])}\n'    # TODO: wrap to page width, continuation-line parser
+            for k in mlist + [k for k in meta if k not in mlist])
 
         wt = w['desc'] if w['desc'] else w['id'] + w['name'] + w['type']
         for td in self.schema['types']:
             tdef = f'{td[TypeName]} = {jadn2typestr(self, td[CoreType], td[TypeOptions])}'
             tdesc = ' // ' + td[TypeDesc] if td[TypeDesc] else ''
-            text += f'\n{tdef:<{wt}}{tdesc}'[:w['page']].rstrip() + '\n'
+            lines = [f'\n{tdef:<{wt}}{tdesc}'[:w['page']].rstrip() + '\n']
             idt = id_type(td)
             for fd in td[Fields] if len(td) > Fields else []:       # TODO: constant-length types
                 fname, fdef, fmult, fdesc = jadn2fieldstr(self, fd, td)
@@ -95,8 +107,8 @@ class JIDL(JADNCore):
                     fs = f'{fd[FieldID]:>{w["id"]}} {fname:<{wn}} {fdef}'
                     wf = w['id'] + w['type'] if idt else wt
                 wf = w['desc'] if w['desc'] else wf
-                text += etrunc(f'{fs:{wf}}{fdesc}'.rstrip(), w['page']) + '\n'
-        return text
+                lines.append(etrunc(f'{fs:{wf}}{fdesc}'.rstrip(), w['page']) + '\n')
+            yield ''.join(lines)
 
 
 # ========================================================
@@ -104,39 +116,48 @@ class JIDL(JADNCore):
 # ========================================================
 
 # Convert JIDL to JADN
-def _line2jadn(self, line: str, tdef: list) -> tuple[str, list]:
-    if line.split('//', maxsplit=1)[0].strip():
-        p_meta = r'^\s*([-\w]+):\s*(.+?)\s*$'
-        if m := re.match(p_meta, line):
-            return 'I', [m.group(1), m.group(2)]
-
-        q = re.search(r'"(?:[^"\\]|\\.)+"', line)  # Find quoted string (String pattern option)
-        s = q.end() if q else 0
-        desc = ''
-        if d := re.search(r' //', line[s:]):
-            desc = line[s + d.end():].strip()
-            line = line[:s + d.start()].strip()
-
-        p_type = fr'^{p_tname}{p_assign}{p_tstr}$'
-        if m := re.match(p_type, line):
-            btype, topts, rest = typestr2jadn(self, m.group(2))
-            newtype = [m.group(1), btype, topts, desc, []]
-            return 'T', newtype
-
-        if tdef:  # looking for fields
-            """
-            if tdef[CoreType] == 'Enumerated':  # Parse Enumerated Item
-                pattern = fr'^{p_id}{p_fstr}$'
-                if m := re.match(pattern, line):
-                    return 'F', fielddef2jadn(self, m.group(1), m.group(2), '', desc)
-            else:  # Parse Field
-            """
-            if m := re.match(fr'^{p_id}(.*)$', line):
-                return 'F', fieldstr2jadn(self, tdef, m.group(1), m.group(2), desc)
-        else:
-            raise_error(f'JIDL Load - field with no type: {repr(line)}')
-
-    return '', []
+def _line2jadn(self, line: str, tdef: list | None) -> tuple[str, list]:
+    """
+    Classify and parse one line of a JIDL document
+
+    :param line: JIDL line
+    :param tdef: type definition whose fields are being read, None if none
+    :return: ('I', [name, value]) meta, ('T', typedef) type, ('F', fielddef) field, ('E', []) end of type
+        or ('', []) blank or comment line
+    :raises ValueError: with "column" attribute set to the position of the error in the line
+    """
+    if not (code := line.split('//', maxsplit=1)[0]) or code.isspace():
+        return '', []
+    if m := META_LINE.match(line):
+        return 'I', [m.group(1), m.group(2)]
+
+    s = q.end() if '"' in line and (q := QUOTED.search(line)) else 0     # Skip String pattern option
+    desc = ''
+    if (d := line.find(' //', s)) >= 0:
+        desc = line[d + 3:].strip()
+        line = line[:d].strip()
+
+    if m := TYPE_LINE.match(line):
+        btype, topts, rest = _parse(typestr2jadn, m.start(2), self, m.group(2))
+        return 'T', [m.group(1), btype, topts, desc, []]
+    if m := FIELD_LINE.match(line):
+        if tdef is None:
+            _parse(raise_error, m.start(1), f'field with no type: {line.strip()!r}')
+        return 'F', _parse(fieldstr2jadn, m.start(2), self, tdef, m.group(1), m.group(2), desc)
+    if CLOSE_LINE.match(line):
+        return 'E', []
+    _parse(raise_error, len(line) - len(line.lstrip()), f'expected meta, type or field definition: {line.strip()!r}')
+
+
+def _parse(parser: Callable, col: int, *args) -> Any:
+    """
+    Call parser on part of a line, recording the part's column (from 1) in any ValueError it raises
+    """
+    try:
+        return parser(*args)
+    except ValueError as e:
+        e.column = col + 1
+        raise
 
 
 # =========================================================
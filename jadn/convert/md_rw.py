@@ -1,5 +1,6 @@
 import json
 import re
+from typing import Iterator
 from jadn.core import JADNCore
 from jadn.definitions import TypeName, CoreType, TypeOptions, TypeDesc, Fields, ItemID, FieldID, META_ORDER
 from jadn.utils import jadn2typestr, typestr2jadn, jadn2fieldstr, fieldstr2jadn, cleanup_tagid, raise_error
@@ -45,19 +46,24 @@ class MD(JADNCore):
         """
         Convert JADN schema to Markdown Tables
         """
+        return ''.join(self.iter_dumps(style))
 
-        text = '```\n'
+    def iter_dumps(self, style: dict=None) -> Iterator[str]:
+        """
+        Generate Markdown text: the meta section, then one chunk per type definition
+        """
         meta = self.schema.get('meta', {})
         mlist = [k for k in META_ORDER if k in meta]
-        for k in mlist + list(set(meta) - set(mlist)):      # Display meta elements in fixed order
-            text += f'{k:>14}: {json.dumps(meta[k])}\n'     # TODO: wrap to width, continuation-line parser
-        text += '```\n'
+        yield '```\n' + ''.join(      # Display meta elements in fixed order
+            f'{k:>14}: {json.dumps(meta[k])}\n'     # TODO: wrap to width, continuation-line parser
+            for k in mlist + [k for k in meta if k not in mlist]) + '```\n'
 
         for td in self.schema['types']:
+            text = ''
             if len(td) > Fields and td[Fields]:
                 tdef = f'{td[TypeName]} ({jadn2typestr(self, td[CoreType], td[TypeOptions])})'
                 tdesc = f'\n{td[TypeDesc]}\n' if td[TypeDesc] else ''
-                text += f'{tdesc}\n**Type: ' + tdef.replace("*", r"\*") + '**\n'
+                text = f'{tdesc}\n**Type: ' + tdef.replace("*", r"\*") + '**\n'
                 idt = td[CoreType] == 'Array' or td[TypeOptions].get('id', False)
                 table_type = (0 if td[CoreType] == 'Enumerated' else 2) + (0 if idt else 1)
                 table = [
@@ -83,8 +89,7 @@ class MD(JADNCore):
             else:
                 table = [['Type Name', 'Type Definition', 'Description'],
                          [f'**{td[TypeName]}**', jadn2typestr(self, td[CoreType], td[TypeOptions]), td[TypeDesc]]]
-            text += f'\n{_format_table(table)}\n\n**********\n'
-        return text
+            yield text + f'\n{_format_table(table)}\n\n**********\n'
 
 
 # ========================================================
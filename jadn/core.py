@@ -1,8 +1,13 @@
+import marshal
 import os
 import json
+import re
+import zlib
+from jadn import __version__
+from jadn.index import SchemaIndex
 from jadn.definitions import TypeName, CoreType, TypeOptions, Fields, \
-    FieldID, FieldName, FieldType, FieldOptions, has_fields, is_builtin
-from typing import TextIO, BinaryIO, Any
+    FieldID, FieldName, FieldType, FieldOptions, DEFAULT_CONFIG, has_fields
+from typing import TextIO, BinaryIO, Any, Callable, Iterator
 
 
 def data_dir() -> str:
@@ -54,7 +59,12 @@ class JADNCore:
     def __init__(self, pkg: 'JADNCore'=None) -> None:
         self.schema = None          # original schema
         self.source = None          # source of original schema
-        self.run_schema = None      # schema with shortcuts expanded for data validation
+        self.run_schema = None      # schema compiled for data validation: {TypeName: check}, see instance_validate
+        self.str_cache = {}         # type and field strings rendered from schema content, see utils.jadn2typestr
+        self.index = None           # lookup tables for schema types, see schema_index
+        self.config = None          # schema config with compiled name patterns, see SchemaConfig
+        self.codecs = {}            # instance codecs: {(style, data format): {TypeName: codec}}, see instance_codec
+        self.lazy_decoders = {}     # {(style, data format): codec.lazy.LazyDecoder}, see instance_loads
         if pkg is not None:
             assert pkg.__class__.__bases__ == self.__class__.__bases__      # pkg must be a subclass of JADNCore
             self.__dict__.update(pkg.__dict__)      # Copy all instance variables from pkg (shallow)
@@ -62,36 +72,40 @@ class JADNCore:
         # If this is the first instance, pre-compute class variables from metaschema definitions
         if JADNCore.METASCHEMA is None:
             meta_file = os.path.join(data_dir(), 'jadn_v2.0_schema.jadn')
-            with open(meta_file, encoding='utf8') as fp:
-                jadn_str = fp.read()
-            schema = json.loads(jadn_str)
-
-            # Generate tag-string serialization tables
-            # Get option definitions from Metaschema reserved type "JADNOpts"
-            tx = {td[TypeName]: td for td in schema['types']}
-            opts = tx['JADNOpts'][Fields]
-            JADNCore.OPT_NAME = {i[FieldID]: i[FieldName] for i in opts}    # ID to Name lookup
-            JADNCore.OPT_ID = {i[FieldName]: i[FieldID] for i in opts}      # Name to ID lookup
-            JADNCore.OPT_TYPE = {i[FieldName]: i[FieldType] for i in opts}  # Name to value type lookup
-            assert len(self.OPT_NAME) == len(self.OPT_ID), f'{meta_file}: Bad JADNOpts (duplicate id or name)'
-
-            # Generate separate type and field option lists
-            JADNCore.OPT_ORDER = {i[FieldName]: n for n, i in enumerate(opts, start=1)}     # Canonical position
-            to = self.OPT_ORDER['typeOpts']     # Sentinel value separating type options from field options
-            JADNCore.TYPE_OPTS = {k for k, v in self.OPT_ORDER.items() if v < to}
-            JADNCore.FIELD_OPTS = {k for k, v in self.OPT_ORDER.items() if v > to}
-
-            # Package configuration variables and types
-            JADNCore.META_TYPE = {i[FieldName]: i[FieldType] for i in tx['Config'][Fields]}
-
-            # With option tables in place, load metaschema as normal JADN schema
-            JADNCore.METASCHEMA = jadn_schema_loads(jadn_str, self.OPT_NAME)
-            JADNCore.TYPE_X = {td[TypeName]: td for td in self.METASCHEMA['types']}
-            load_option_types(self.METASCHEMA['types'], self.OPT_TYPE)
-
-            JADNCore.REF_OPTS = {fd[FieldName]  # Options that refer to other types
-                for td in self.METASCHEMA['types'] if 'tagString' in td[TypeOptions]
-                    for fd in td[Fields] if fd[FieldType] == 'TypeRef'}
+            with open(meta_file, 'rb') as fp:
+                meta_bytes = fp.read()
+            cache_file = meta_cache_file(meta_bytes)
+            if not load_meta_cache(cache_file):     # Rebuild tables if no valid snapshot exists
+                jadn_str = meta_bytes.decode('utf8')
+                schema = json.loads(jadn_str)
+
+                # Generate tag-string serialization tables
+                # Get option definitions from Metaschema reserved type "JADNOpts"
+                tx = {td[TypeName]: td for td in schema['types']}
+                opts = tx['JADNOpts'][Fields]
+                JADNCore.OPT_NAME = {i[FieldID]: i[FieldName] for i in opts}    # ID to Name lookup
+                JADNCore.OPT_ID = {i[FieldName]: i[FieldID] for i in opts}      # Name to ID lookup
+                JADNCore.OPT_TYPE = {i[FieldName]: i[FieldType] for i in opts}  # Name to value type lookup
+                assert len(self.OPT_NAME) == len(self.OPT_ID), f'{meta_file}: Bad JADNOpts (duplicate id or name)'
+
+                # Generate separate type and field option lists
+                JADNCore.OPT_ORDER = {i[FieldName]: n for n, i in enumerate(opts, start=1)}     # Canonical position
+                to = self.OPT_ORDER['typeOpts']     # Sentinel value separating type options from field options
+                JADNCore.TYPE_OPTS = {k for k, v in self.OPT_ORDER.items() if v < to}
+                JADNCore.FIELD_OPTS = {k for k, v in self.OPT_ORDER.items() if v > to}
+
+                # Package configuration variables and types
+                JADNCore.META_TYPE = {i[FieldName]: i[FieldType] for i in tx['Config'][Fields]}
+
+                # With option tables in place, load metaschema as normal JADN schema
+                JADNCore.METASCHEMA = jadn_schema_loads(jadn_str, self.OPT_NAME)
+                JADNCore.TYPE_X = {td[TypeName]: td for td in self.METASCHEMA['types']}
+                load_option_types(self.METASCHEMA['types'], self.OPT_TYPE)
+
+                JADNCore.REF_OPTS = {fd[FieldName]  # Options that refer to other types
+                    for td in self.METASCHEMA['types'] if 'tagString' in td[TypeOptions]
+                        for fd in td[Fields] if fd[FieldType] == 'TypeRef'}
+                save_meta_cache(cache_file)
 
     def style(self) -> dict:
         """
@@ -133,19 +147,23 @@ class JADNCore:
         """
         raise NotImplementedError(f'{self.__class__.__name__} schema dump not implemented')
 
-    def schema_dump(self, fp: TextIO | BinaryIO, style: dict=None) -> str | bytes:
+    def iter_dumps(self, style: dict=None) -> Iterator[str | bytes]:
         """
+        Generate the serialized schema in chunks that concatenate to schema_dumps(style)
 
-        :param fp:
-        :type fp:
-        :param style:
-        :type style:
-        :return:
-        :rtype:
+        Formats that can write large schemas incrementally override this and define schema_dumps as a join.
         """
-        message = self.schema_dumps(style)
-        fp.write(message)
-        return message
+        yield self.schema_dumps(style)
+
+    def schema_dump(self, fp: TextIO | BinaryIO, style: dict=None) -> None:
+        """
+        Write the serialized schema to a file as each chunk is generated
+
+        :param fp: file open for writing
+        :param style: serialization style options
+        """
+        for chunk in self.iter_dumps(style):
+            fp.write(chunk)
 
     def schema_load_finish(self) -> None:
         """
@@ -156,12 +174,215 @@ class JADNCore:
         """
         load_meta_types(self)
         load_option_types(self.schema['types'], self.OPT_TYPE)  # Convert option strings to typed values
+        self.config = SchemaConfig(get_config(self.schema))
+        self.run_schema = None      # Compile on first use of the loaded schema
+        self.codecs = {}
+        self.lazy_decoders = {}
+        self.str_cache = {}
+        self.index = None           # Index on first use
+
+    def schema_index(self) -> SchemaIndex:
+        """
+        Return lookup tables for the loaded schema's types
 
-    def schema_validate(self) -> None:
+        The index is built on first use after schema_load_finish, and rebuilt if schema['types'] has been replaced
+        or types have been added to or removed from it.  Edit types through the index (set_type, del_type,
+        update_type) to keep it consistent; as with run_schema, call schema_load_finish after changing type
+        definitions in place.  Output that must reflect the schema as it is now uses build_deps, which does not
+        use this index.
+        """
+        types = self.schema['types']
+        if self.index is None or self.index.type_list is not types or self.index.size != len(types):
+            self.index = SchemaIndex(types, self.REF_OPTS)
+        return self.index
+
+    def schema_validate(self, jobs: int = 1) -> None:
         """
         Validate a logical schema instance against JADN metaschema
+
+        :param jobs: number of worker processes used to check type definitions of large schemas
+        :raise ValueError: listing each error as "JSON Pointer: message"
+        """
+        from jadn.validate.metaschema import check_schema   # Import validator only when needed
+        if errors := check_schema(self, jobs):
+            raise ValueError(f'{self.source or "Schema"}: {len(errors)} metaschema errors\n' +
+                             '\n'.join(f'  {ptr}: {msg}' for ptr, msg in errors))
+
+    def compile(self, style: str | None = None, data_format: str = 'json') -> None:
         """
-        pass
+        Compile the loaded schema's type definitions if not already compiled
+
+        Checks (run_schema) are always compiled; codecs are compiled if a serialization style is given.
+
+        :param style: serialization style of the codecs: verbose, compact or concise, or None
+        :param data_format: json or cbor
+        """
+        if self.run_schema is None:
+            from jadn.validate.validator import compile_schema   # Import validator only when needed
+            self.run_schema = compile_schema(self)
+        if style is not None and (style, data_format) not in self.codecs:
+            from jadn.codec.codec import compile_codec     # Import codec only when needed
+            self.codecs[(style, data_format)] = compile_codec(self, style, data_format)
+
+    def instance_validate(self, instance: Any, type_name: str) -> list[tuple[str, str]]:
+        """
+        Validate an instance against a type defined in the loaded schema
+
+        Type definitions are compiled on first use; call schema_load_finish or set run_schema to None
+        to recompile after changing the schema.
+
+        :param instance: API value, e.g., from json.loads
+        :param type_name: name of the instance's type
+        :return: list of (JSON Pointer, message) errors, empty if instance is valid
+        """
+        if self.run_schema is None:
+            self.compile()
+        if (check := self.run_schema.get(type_name)) is None:
+            raise ValueError(f'{type_name} is not defined in schema')
+        return list(check(instance))
+
+    def instance_codec(self, type_name: str, style: str = 'verbose', data_format: str = 'json'
+                       ) -> tuple[Callable, Callable]:
+        """
+        Return the (encode, decode) functions of a type defined in the loaded schema
+
+        Type definitions are compiled for each serialization style and data format on first use, see codec/codec.py.
+        Encoded CBOR values are serialized with codec.cbor.dumps and loads.
+
+        :param type_name: name of the instance's type
+        :param style: serialization style: verbose, compact or concise
+        :param data_format: json or cbor
+        :return: encode(API value) returns an encoded value, decode(encoded value) returns an API value
+        """
+        if (codecs := self.codecs.get((style, data_format))) is None:
+            from jadn.codec.codec import compile_codec     # Import codec only when needed
+            codecs = self.codecs[(style, data_format)] = compile_codec(self, style, data_format)
+        if (codec := codecs.get(type_name)) is None:
+            raise ValueError(f'{type_name} is not defined in schema')
+        return codec
+
+    def instance_encode(self, instance: Any, type_name: str, style: str = 'verbose', data_format: str = 'json'
+                        ) -> Any:
+        """
+        Convert an API value to its encoded value in a serialization style, e.g., for json.dumps
+
+        :raise ValueError: if the structure of instance does not match its type
+        """
+        return self.instance_codec(type_name, style, data_format)[0](instance)
+
+    def instance_decode(self, data: Any, type_name: str, style: str = 'verbose', data_format: str = 'json') -> Any:
+        """
+        Convert an encoded value in a serialization style, e.g., from json.loads, to an API value
+
+        :raise ValueError: if the structure of data does not match its type
+        """
+        return self.instance_codec(type_name, style, data_format)[1](data)
+
+    def instance_loads(self, data: str | bytes | bytearray | memoryview, type_name: str, style: str = 'verbose',
+                       data_format: str = 'json', lazy: bool = False) -> Any:
+        """
+        Deserialize JSON text or CBOR data and decode it to an API value
+
+        If lazy is True, Record, Map and MapOf instances are returned as read-only mappings backed by the data,
+        whose fields are decoded and validated when accessed, see codec/lazy.py.  Call their validate method to
+        validate the whole instance.
+
+        :raise ValueError: if data is not well-formed or its structure does not match its type
+        """
+        if lazy:
+            if (decoder := self.lazy_decoders.get((style, data_format))) is None:
+                from jadn.codec.lazy import LazyDecoder     # Import codec only when needed
+                decoder = self.lazy_decoders[(style, data_format)] = LazyDecoder(self, style, data_format)
+            return decoder.loads(data, type_name)
+        decode = self.instance_codec(type_name, style, data_format)[1]
+        if data_format == 'cbor':
+            from jadn.codec import cbor
+            return decode(cbor.loads(data))
+        return decode(json.loads(data))
+
+    def validate_stream(self, fp: TextIO | BinaryIO, type_name: str) -> Iterator[tuple[int, list[tuple[int, str, str]]]]:
+        """
+        Validate newline-delimited JSON (NDJSON) instances of a type, reading one record at a time
+
+        Blank lines are skipped.  A line that is not valid JSON is reported as an invalid record.
+
+        :param fp: file object open for reading text or bytes
+        :param type_name: name of the type of every record
+        :return: iterator of (line number, errors) for each record, errors are (line, JSON Pointer, message)
+        """
+        self.instance_validate(None, type_name)     # Compile schema and check type name before reading
+        check = self.run_schema[type_name]
+        for n, line in enumerate(fp, start=1):
+            if line.strip():
+                try:
+                    errors = check(json.loads(line))
+                except ValueError as e:
+                    errors = [('', f'Invalid JSON: {e}')]
+                yield n, [(n, ptr, msg) for ptr, msg in errors]
+
+
+# =========================================================
+# Metaschema table cache - skip metaschema processing in short-lived processes
+#   marshal and zlib are built in, so loading a snapshot adds no import cost of its own
+# =========================================================
+META_CACHE_VERSION = 1      # Increment when the set or layout of cached tables changes
+META_TABLES = ('OPT_NAME', 'OPT_ID', 'OPT_TYPE', 'OPT_ORDER', 'TYPE_OPTS', 'FIELD_OPTS',
+               'META_TYPE', 'TYPE_X', 'REF_OPTS', 'METASCHEMA')    # METASCHEMA last: marks tables as loaded
+
+
+def cache_dir() -> str:
+    """
+    Return directory for cached metaschema tables, or '' if caching is disabled.
+
+    Environment variable JADN_CACHE_DIR overrides the default location; setting it to '' disables the cache.
+    """
+    if (d := os.environ.get('JADN_CACHE_DIR')) is not None:
+        return d
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'jadn')
+
+
+def meta_cache_file(meta_bytes: bytes) -> str:
+    """
+    Return cache file path for a metaschema, keyed by metaschema content, package version and cache layout
+    """
+    if not (d := cache_dir()):
+        return ''
+    key = zlib.crc32(f'{META_CACHE_VERSION}:{__version__}'.encode() + meta_bytes)
+    return os.path.join(d, f'metaschema-{len(meta_bytes)}-{key:08x}.marshal')
+
+
+def load_meta_cache(cache_file: str) -> bool:
+    """
+    Load JADNCore class tables from a metaschema snapshot.  Return False if snapshot is missing or unusable.
+    """
+    try:
+        with open(cache_file, 'rb') as fp:
+            tables = marshal.loads(fp.read())   # loads() is much faster than load() on a file
+    except (OSError, EOFError, ValueError, TypeError):
+        return False
+    if not isinstance(tables, dict) or set(tables) != set(META_TABLES):
+        return False
+    for k in META_TABLES:
+        setattr(JADNCore, k, tables[k])
+    return True
+
+
+def save_meta_cache(cache_file: str) -> None:
+    """
+    Save JADNCore class tables to a metaschema snapshot.  Cache write failures are not errors.
+    """
+    if not cache_file:
+        return
+    tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(tmp_file, 'wb') as fp:
+            marshal.dump({k: getattr(JADNCore, k) for k in META_TABLES}, fp)   # TYPE_X shares METASCHEMA typedefs
+        os.replace(tmp_file, cache_file)    # Atomic: concurrent workers never see a partial snapshot
+    except (OSError, ValueError):
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
 
 
 def str_to_val(vtype: str, literal: str) -> Any:
@@ -175,10 +396,62 @@ def str_to_val(vtype: str, literal: str) -> Any:
         else vtypes[vtype](literal)
 
 
+def get_config(schema: dict) -> dict:
+    """
+    Return a schema's config values, with defaults for values not in the schema and the derived $TypeRef pattern
+
+    :param schema: loaded schema
+    :return: {config variable: value}, e.g., {'$MaxString': 255, '$TypeRef': '^...$', ...}
+    """
+    config = dict(DEFAULT_CONFIG)
+    config.update(schema.get('meta', {}).get('config', {}))
+    ns = config.get('$NSID', '').lstrip('^').rstrip('$')    # Derived $TypeRef pattern
+    tn = config.get('$TypeName', '').lstrip('^').rstrip('$')
+    config.update({'$TypeRef': fr'^({ns}(?<=.):)?{tn}$'})   # Non-empty prefix before ':'
+    return config
+
+
+class SchemaConfig:
+    """
+    Config of a loaded schema, built once by schema_load_finish for use by schema validation and instance codecs
+
+    Size limits are ints and name patterns are compiled; values holds the config as returned by get_config.
+    Values that are not valid, e.g., a pattern that does not compile, are replaced by their defaults so that
+    the schema loads; schema_validate reports them.
+    """
+    def __init__(self, config: dict) -> None:
+        self.values = config
+        self.max_binary = self.limit('$MaxBinary')          # Maximum number of octets for Binary types
+        self.max_string = self.limit('$MaxString')          # Maximum number of characters for String types
+        self.max_elements = self.limit('$MaxElements')      # Maximum number of items/properties for containers
+        self.sys = config['$Sys']
+        self.patterns = {k: self.pattern(k) for k in ('$TypeName', '$FieldName', '$NSID', '$TypeRef')}
+        self.type_name = self.patterns['$TypeName']
+        self.field_name = self.patterns['$FieldName']
+        self.nsid = self.patterns['$NSID']
+        self.type_ref = self.patterns['$TypeRef']
+
+    def limit(self, name: str) -> int:
+        try:
+            return int(self.values[name])
+        except (TypeError, ValueError):
+            return DEFAULT_CONFIG[name]
+
+    def pattern(self, name: str) -> re.Pattern:
+        try:
+            return re.compile(self.values[name])
+        except (TypeError, re.error):
+            return re.compile(get_config({})[name])
+
+
 def load_meta_types(self) -> None:
     if meta := self.schema.get('meta', {}):
         for k, v in (c := meta.get('config', {})).items():
-            c[k] = str_to_val(self.META_TYPE[k], v)
+            if k in self.META_TYPE:
+                try:
+                    c[k] = str_to_val(self.META_TYPE[k], v)
+                except (TypeError, ValueError):     # Left as is, reported by schema_validate
+                    pass
 
 
 def load_option_types(type_defs: list, type_table: dict[str, str]) -> None:
@@ -197,23 +470,26 @@ def load_option_types(type_defs: list, type_table: dict[str, str]) -> None:
                 load_otype(fd[FieldOptions], fd[FieldType], type_table)
 
 
-def dump_option_type(opts: dict, base_type: str, t_table: dict) -> None:
+def option_strs(opts: dict, base_type: str, t_table: dict) -> dict[str, str]:
     """
+    Return option values converted from typed values to strings, without modifying opts
 
-    :param opts:
-    :type opts:
-    :param base_type:
-    :type base_type:
-    :param t_table:
-    :type t_table:
-    :return:
-    :rtype:
+    :param opts: type or field options
+    :param base_type: core type, the value type of options whose type is "BType"
+    :param t_table: option value types
+    :return: options with string values
     """
     def val_to_str(vtype: str, val: Any) -> str:
         return f'0x{val.hex()}' if vtype == 'Binary' else str(val)
 
-    op = {k: val_to_str(base_type if (t := t_table[k]) == 'BType' else t, v) for k, v in opts.items()}
-    opts.update(op)
+    return {k: val_to_str(base_type if (t := t_table[k]) == 'BType' else t, v) for k, v in opts.items()}
+
+
+def dump_option_type(opts: dict, base_type: str, t_table: dict) -> None:
+    """
+    Convert option values in place from typed values to strings
+    """
+    opts.update(option_strs(opts, base_type, t_table))
 
 
 def dump_option_types(type_defs: list, type_table: dict[str, str]) ->None:
@@ -238,35 +514,11 @@ def build_deps(self) -> dict[str, list[tuple[str, str]]]:
     A single unreferenced type (root) indicates a fully-connected hierarchy;
     multiple roots indicate disconnected items or hierarchies,
     and no roots indicate a dependency cycle.
+    Each dependency is (TypeName, ref_type), see index.type_refs.
+    Dependencies are read from schema['types'], not from the cached schema index, so they include changes made
+    to type definitions in place; callers may modify the lists.
     """
-    def get_refs(tdef: list) -> list[tuple[str, str]]:  # Return all type references from a type definition
-        """
-        # Options whose value is/has a type name: strip option id
-        oids = [JADN.OPTX['keyType'], JADN.OPTX['valueType'], JADN.OPTX['extends'], JADN.OPTX['restricts']]
-        # Options that enumerate fields: keep option id
-        oids2 = [JADN.OPTX['enum'], JADN.OPTX['pointer']]
-        refs = [to[1:] for to in tdef[TypeOptions] if to[0] in oids and not is_builtin(to[1:])]
-        refs += ([to[1:] for to in tdef[TypeOptions] if to[0] in oids2])
-        """
-
-        # Type options that reference other types (e.g., value_type)
-        refs = [(v, 'C') for k, v in tdef[TypeOptions].items() if k in self.REF_OPTS and not is_builtin(v)]
-        # Fields that contain or link to other types
-        if has_fields(tdef[CoreType]):  # Ignore Enumerated
-            for f in tdef[Fields]:
-                if not is_builtin(f[FieldType]):    # Ignore core types
-                    fo = set(f[FieldOptions])
-                    ref_type = (
-                        'I' if {'extends', 'restricts'} & fo else   # Type Inheritance in schema
-                        'L' if {'link'} & fo else                   # Link (foreign key) in container instance
-                        'C')                                        # Value in container instance
-                    refs.append((f[FieldType], ref_type))
-                # Get references from TypeOptions in field using fake TypeDefinition
-                refs += get_refs(['', f[FieldType], f[FieldOptions], '', []])
-        return refs
-
-    deps = {t[TypeName]: get_refs(t) for t in self.schema['types']}
-    return deps
+    return SchemaIndex(self.schema['types'], self.REF_OPTS).refs
 
 
 # =========================================================
@@ -0,0 +1,127 @@
+"""
+Dependency graph algorithms
+
+A graph is a dependency dict {item: [dependency, ...]}, e.g., type names and the types they reference.
+Dependencies need not be keys of the dict; they are treated as items with no dependencies.
+All functions are iterative and run in time linear in the size of the graph, so depth is not limited by
+the recursion limit.
+"""
+
+
+def roots(deps: dict[str, list[str]]) -> list[str]:
+    """
+    Return items that are not a dependency of any other item, in input order
+
+    A single root indicates a fully-connected hierarchy, multiple roots indicate disconnected items or
+    hierarchies, and no roots indicate that every item is in or below a dependency cycle.
+    """
+    refs = {d for v in deps.values() for d in v}
+    return [k for k in deps if k not in refs]
+
+
+def topo_sort(deps: dict[str, list[str]], roots: list[str]) -> list[str]:
+    """
+    Topological sort with locality
+    Sorts a list of (item: (dependencies)) pairs so that 1) all dependency items are listed after the parent item,
+    and 2) dependencies are listed in the input order and as close to the parent as possible.
+    Returns the sorted list of items reachable from roots, or all items unsorted if there are no roots.
+    """
+    out = []
+    seen = set()
+    for root in roots:
+        if root in seen:
+            continue
+        seen.add(root)
+        out.append(root)
+        stack = [iter(deps.get(root, []))]
+        while stack:
+            for it in stack[-1]:
+                if it not in seen:      # Visit first unseen dependency, resume with the rest when done
+                    seen.add(it)
+                    out.append(it)
+                    stack.append(iter(deps.get(it, [])))
+                    break
+            else:
+                stack.pop()
+    return out if out else list(deps)     # if cycle detected, don't sort
+
+
+def sccs(deps: dict[str, list[str]]) -> list[list[str]]:
+    """
+    Return the strongly connected components of a graph (Tarjan's algorithm)
+
+    Components are listed with dependencies before the items that depend on them.
+    Items in a component with more than one item, or that depend on themselves, are in a dependency cycle.
+    """
+    index = {}      # Item: visit order
+    low = {}        # Item: lowest visit order reachable from item
+    on_stack = set()
+    stack = []
+    out = []
+    for start in deps:
+        if start in index:
+            continue
+        index[start] = low[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        work = [(start, iter(deps.get(start, [])))]
+        while work:
+            node, it = work[-1]
+            for dep in it:
+                if dep not in index:
+                    index[dep] = low[dep] = len(index)
+                    stack.append(dep)
+                    on_stack.add(dep)
+                    work.append((dep, iter(deps.get(dep, []))))
+                    break
+                if dep in on_stack:
+                    low[node] = min(low[node], index[dep])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:    # node is the first visited item of a component
+                    scc = []
+                    while (item := stack.pop()) != node:
+                        on_stack.discard(item)
+                        scc.append(item)
+                    on_stack.discard(node)
+                    scc.append(node)
+                    out.append(scc[::-1])
+    return out
+
+
+def cycles(deps: dict[str, list[str]]) -> list[list[str]]:
+    """
+    Return the groups of items that are in dependency cycles, see sccs
+    """
+    return [c for c in sccs(deps) if len(c) > 1 or c[0] in deps.get(c[0], [])]
+
+
+def subtree(deps: dict[str, list[str]], root: str) -> dict[str, dict]:
+    """
+    Return the dependencies of root as a nested dict {dependency: {dependency: {...}}}
+
+    A dependency reached more than once shares one subtree dict.  Raise ValueError if a cycle is reachable from root.
+    """
+    state = {root: 1}   # Node state: default: not seen, 1: processing, 2: done
+    done = {}           # Subtree of each node in state 2
+    tree = {}
+    stack = [(root, tree, iter(deps.get(root, [])))]
+    while stack:
+        node, tr, it = stack[-1]
+        for dep in it:
+            if (c := state.get(dep, 0)) == 1:
+                raise ValueError(f'Graph cycle detected at: {node}->{dep}')
+            if c == 0:
+                state[dep] = 1
+                tr[dep] = {}
+                stack.append((dep, tr[dep], iter(deps.get(dep, []))))
+                break
+            tr[dep] = done[dep]
+        else:
+            stack.pop()
+            state[node] = 2     # Mark node and its subtree as processed.
+            done[node] = tr
+    return tree
@@ -0,0 +1,119 @@
+"""
+Lookup tables for a loaded schema
+
+Writers and the validator look up type definitions by name, fields by id or name, and the types that
+refer to a type.  SchemaIndex builds these tables once per loaded schema (see JADNCore.schema_index) instead
+of each caller scanning schema['types'], and keeps them consistent when types are added, replaced or removed
+through it.
+"""
+from jadn.definitions import TypeName, CoreType, TypeOptions, Fields, FieldID, FieldName, FieldType, FieldOptions, \
+    has_fields, is_builtin
+
+
+def type_refs(tdef: list, ref_opts: set[str]) -> list[tuple[str, str]]:
+    """
+    Return all type references from a type definition, in definition order
+
+    :param tdef: type definition
+    :param ref_opts: names of options whose value is a type name
+    :return: [(TypeName, ref_type)], ref_type is 'C' (contained value), 'I' (inheritance) or 'L' (link)
+    """
+    def opt_refs(opts: dict) -> list[tuple[str, str]]:     # Type options that reference other types (e.g., valueType)
+        return [(v, 'C') for k, v in opts.items() if k in ref_opts and not is_builtin(v)] if opts else []
+
+    refs = opt_refs(tdef[TypeOptions])
+    # Fields that contain or link to other types
+    if has_fields(tdef[CoreType]):  # Ignore Enumerated
+        for f in tdef[Fields]:
+            fo = f[FieldOptions]
+            if not is_builtin(f[FieldType]):    # Ignore core types
+                ref_type = (
+                    'I' if 'extends' in fo or 'restricts' in fo else    # Type Inheritance in schema
+                    'L' if 'link' in fo else                            # Link (foreign key) in container instance
+                    'C')                                                # Value in container instance
+                refs.append((f[FieldType], ref_type))
+            refs += opt_refs(fo)    # Type options in field
+    return refs
+
+
+class SchemaIndex:
+    """
+    Type, field and reference tables for a list of type definitions
+
+    Tables refer to the type definitions in the list, not copies.  Use set_type and del_type to edit the list,
+    or call update_type after changing a type definition in place; other changes require a new index.
+    If a type name is defined more than once the last definition is indexed, as in a dict built from the list.
+    """
+    def __init__(self, types: list[list], ref_opts: set[str]) -> None:
+        self.type_list = types      # Indexed type definitions, e.g., schema['types']
+        self.size = len(types)      # Length of type_list when indexed, to detect types added or removed directly
+        self.ref_opts = ref_opts
+        self.types = {}             # {TypeName: type definition}
+        self.position = {}          # {TypeName: position in type_list}
+        self.field_ids = {}         # {TypeName: {FieldID: field}}, ItemID for Enumerated
+        self.field_names = {}       # {TypeName: {FieldName: field}}, ItemValue for Enumerated
+        self.refs = {}              # {TypeName: [(referenced TypeName, ref_type)]}, see type_refs
+        self.referrers = {}         # {TypeName: {referring TypeName: None}}: reverse of refs, ordered set
+        for n, td in enumerate(types):
+            self._add(n, td)
+
+    def used_by(self, type_name: str) -> list[str]:
+        """
+        Return the names of types that refer to a type, in the order they were indexed
+        """
+        return list(self.referrers.get(type_name, {}))
+
+    def set_type(self, tdef: list) -> None:
+        """
+        Replace the type definition with the same name, or append it if the name is not defined
+        """
+        if (n := self.position.get(tdef[TypeName])) is None:
+            n = len(self.type_list)
+            self.type_list.append(tdef)
+            self.size += 1
+        else:
+            self.type_list[n] = tdef
+        self._add(n, tdef)
+
+    def del_type(self, type_name: str) -> None:
+        """
+        Remove a type definition.  Types that refer to it are not changed.
+        """
+        n = self.position[type_name]
+        del self.type_list[n]
+        self.size -= 1
+        self._remove(type_name)
+        for tn, p in self.position.items():
+            if p > n:
+                self.position[tn] = p - 1
+
+    def update_type(self, type_name: str) -> None:
+        """
+        Re-index a type definition after changing its options or fields in place
+        """
+        self._add(self.position[type_name], self.types[type_name])
+
+    def _add(self, n: int, tdef: list) -> None:
+        tn = tdef[TypeName]
+        self._unlink(tn)
+        self.types[tn] = tdef       # Replaced types keep their place in table order
+        self.position[tn] = n
+        fids, fnames = {}, {}
+        for f in tdef[Fields] if len(tdef) > Fields else []:
+            fids.setdefault(f[FieldID], f)      # First of duplicates, as found by a scan
+            fnames.setdefault(f[FieldName], f)
+        self.field_ids[tn] = fids
+        self.field_names[tn] = fnames
+        self.refs[tn] = type_refs(tdef, self.ref_opts)
+        for ref, _ in self.refs[tn]:
+            self.referrers.setdefault(ref, {})[tn] = None
+
+    def _unlink(self, type_name: str) -> None:
+        for ref, _ in self.refs.get(type_name, []):
+            if (r := self.referrers.get(ref)) is not None:
+                r.pop(type_name, None)
+
+    def _remove(self, type_name: str) -> None:
+        self._unlink(type_name)
+        for table in (self.types, self.position, self.field_ids, self.field_names, self.refs):
+            del table[type_name]
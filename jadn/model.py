@@ -0,0 +1,120 @@
+"""
+Compact typed representation of JADN type definitions
+
+Loaded schemas are lists: [TypeName, CoreType, TypeOptions, TypeDesc, Fields], with a dict per option set.
+This optional representation stores each definition in a slotted object, interns type and field names so
+repeated names are stored once, shares one read-only mapping among all definitions without options,
+and stores fields in tuples. It is intended for holding very large schemas in memory; converters work
+on the list form, and definitions convert to and from it cheaply.
+
+Option dicts are shared, not copied, between the two forms.
+"""
+from sys import intern
+from types import MappingProxyType
+from typing import Iterable, Mapping
+from jadn.definitions import TypeName, CoreType, TypeOptions, TypeDesc, Fields, ItemID, ItemValue, ItemDesc, \
+    FieldID, FieldName, FieldType, FieldOptions, FieldDesc
+
+EMPTY_OPTIONS = MappingProxyType({})    # Options of all definitions that have none
+
+
+def _opts(opts: dict) -> Mapping:
+    return opts if opts else EMPTY_OPTIONS
+
+
+class ItemDef:
+    """
+    Enumerated item: [ItemID, ItemValue, ItemDesc]
+    """
+    __slots__ = ('id', 'value', 'desc')
+
+    def __init__(self, id: int, value: str, desc: str = '') -> None:
+        self.id = id
+        self.value = intern(value)
+        self.desc = desc
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ItemDef) and self.to_list() == other.to_list()
+
+    def __repr__(self) -> str:
+        return f'ItemDef({self.id!r}, {self.value!r}, {self.desc!r})'
+
+    @classmethod
+    def from_list(cls, item: list) -> 'ItemDef':
+        return cls(item[ItemID], item[ItemValue], item[ItemDesc])
+
+    def to_list(self) -> list:
+        return [self.id, self.value, self.desc]
+
+
+class FieldDef:
+    """
+    Field: [FieldID, FieldName, FieldType, FieldOptions, FieldDesc]
+    """
+    __slots__ = ('id', 'name', 'type', 'options', 'desc')
+
+    def __init__(self, id: int, name: str, type: str, options: dict = EMPTY_OPTIONS, desc: str = '') -> None:
+        self.id = id
+        self.name = intern(name)
+        self.type = intern(type)
+        self.options = _opts(options)
+        self.desc = desc
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FieldDef) and self.to_list() == other.to_list()
+
+    def __repr__(self) -> str:
+        return f'FieldDef({self.id!r}, {self.name!r}, {self.type!r}, {dict(self.options)!r}, {self.desc!r})'
+
+    @classmethod
+    def from_list(cls, field: list) -> 'FieldDef':
+        return cls(field[FieldID], field[FieldName], field[FieldType], field[FieldOptions], field[FieldDesc])
+
+    def to_list(self) -> list:
+        return [self.id, self.name, self.type, self.options if self.options else {}, self.desc]
+
+
+class TypeDef:
+    """
+    Type definition: [TypeName, CoreType, TypeOptions, TypeDesc, Fields]
+
+    fields is a tuple of ItemDef for Enumerated types, FieldDef for other types
+    """
+    __slots__ = ('name', 'core_type', 'options', 'desc', 'fields')
+
+    def __init__(self, name: str, core_type: str, options: dict = EMPTY_OPTIONS, desc: str = '',
+                 fields: Iterable[ItemDef | FieldDef] = ()) -> None:
+        self.name = intern(name)
+        self.core_type = intern(core_type)
+        self.options = _opts(options)
+        self.desc = desc
+        self.fields = tuple(fields)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, TypeDef) and self.to_list() == other.to_list()
+
+    def __repr__(self) -> str:
+        return f'TypeDef({self.name!r}, {self.core_type!r}, {dict(self.options)!r}, {self.desc!r}, {self.fields!r})'
+
+    @classmethod
+    def from_list(cls, td: list) -> 'TypeDef':
+        fdef = ItemDef if td[CoreType] == 'Enumerated' else FieldDef
+        return cls(td[TypeName], td[CoreType], td[TypeOptions], td[TypeDesc], map(fdef.from_list, td[Fields]))
+
+    def to_list(self) -> list:
+        return [self.name, self.core_type, self.options if self.options else {}, self.desc,
+                [f.to_list() for f in self.fields]]
+
+
+def types_from_lists(types: list[list]) -> list[TypeDef]:
+    """
+    Convert a schema's type definitions from list form, e.g., schema['types'] of a loaded schema
+    """
+    return [TypeDef.from_list(td) for td in types]
+
+
+def types_to_lists(types: Iterable[TypeDef]) -> list[list]:
+    """
+    Convert type definitions to list form, e.g., to assign to schema['types'] for a converter
+    """
+    return [td.to_list() for td in types]
@@ -1,5 +1,18 @@
-from jadn.translate.jschema_rw import JSCHEMA
-from jadn.translate.xsd_rw import XSD
-from jadn.translate.cddl_rw import CDDL
-from jadn.translate.proto_rw import PROTO
-from jadn.translate.xeto_rw import XETO
+"""
+Schema format classes for translation to and from other schema languages
+
+Classes are imported on first use (PEP 562) so that a format's dependencies, e.g., lxml for XSD,
+are loaded only if that format is used.
+"""
+from jadn._lazy import make_lazy
+
+FORMATS = {     # Data format: (module, class)
+    'json': ('jadn.translate.jschema_rw', 'JSCHEMA'),
+    'xsd': ('jadn.translate.xsd_rw', 'XSD'),
+    'cddl': ('jadn.translate.cddl_rw', 'CDDL'),
+    'proto': ('jadn.translate.proto_rw', 'PROTO'),
+    'xeto': ('jadn.translate.xeto_rw', 'XETO'),
+}
+__all__ = [c for m, c in FORMATS.values()]
+
+format_class, __getattr__, __dir__ = make_lazy(FORMATS, globals())
@@ -48,10 +48,7 @@ class JSCHEMA(JADNCore):
         for tn, tv in defs.items():
             scandef(tn, tv, nt, jss, jssx)
 
-        ntypes = []  # Prune identical type definitions
-        for t in nt:
-            if t not in ntypes:  # O(n^2) runtime because type definitions aren't hashable
-                ntypes.append(t)  # Convert to immutable types if it becomes an issue
+        ntypes = prune_types(nt)
 
         self.schema = {'meta': meta, 'types': ntypes}
         self.source = source
@@ -68,6 +65,21 @@ class JSCHEMA(JADNCore):
 # Support functions
 # ========================================================
 
+def prune_types(types: list) -> list:
+    """
+    Remove identical type definitions, keeping the first occurrence of each
+
+    Type definitions are lists containing dicts, so are compared by a canonical string with sorted option keys
+    """
+    seen = set()
+    ntypes = []
+    for t in types:
+        if (key := json.dumps(t, sort_keys=True)) not in seen:
+            seen.add(key)
+            ntypes.append(t)
+    return ntypes
+
+
 def scandef(tn: str, tv: dict, nt: list, jss: dict, jssx: dict):
     """
     Process anonymous type definitions, generate pathname, add to list nt
@@ -1,5 +1,6 @@
 from collections import defaultdict
 from io import BytesIO
+from typing import BinaryIO, TextIO
 from lxml import etree
 from jadn.core import JADNCore
 
@@ -15,20 +16,23 @@ class XSD(JADNCore):
         }
 
     def schema_loads(self, xml_str: str, source: dict=None) -> None:
-        tree = etree.parse(BytesIO(xml_str.encode('utf8')))
-        root = tree.getroot()
-        tag = etree.QName(root.tag).localname
-        attrs = {k: v for k, v in root.items()}
+        self.schema_load(BytesIO(xml_str.encode('utf8')), source)
+
+    def schema_load(self, fp: TextIO | BinaryIO, source: dict=None) -> None:
+        """
+        Parse XSD incrementally from a file, without building a document tree
+        """
+        ctx = make_jadn(getattr(fp, 'buffer', fp))     # Parse bytes so the XML declaration's encoding is used
+        tag, attrs, nsmap = ctx['root']
 
         meta = {}
         meta['package'] = attrs['targetNamespace']
         meta['version'] = attrs['version']
         meta['roots'] = [tag.capitalize()]
-        meta['namespaces'] = [(k, v) for k, v in root.nsmap.items()]
+        meta['namespaces'] = [(k, v) for k, v in nsmap.items()]
 
-        types = make_jadn(root)
-        self.schema = {'meta': meta, 'types': types}
-        self.source = source
+        self.schema = {'meta': meta, 'types': ctx['types']}
+        self.source = getattr(fp, 'name', None) if source is None else source
         self.schema_load_finish()
 
     def schema_dumps(self, style: dict=None) -> str:
@@ -38,33 +42,40 @@ class XSD(JADNCore):
 # Support functions
 # ========================================================
 
-def make_jadn(root: etree.Element) -> dict:
-
-    def walk(path: list, ctx: dict, n: int) -> None:
-        e = path[-1]
-        ctx['e_count']['.'.join([etree.QName(v).localname for v in path])] += 1
-        s = {
-            'tag': etree.QName(e.tag),
-            'attrs': {k: v for k, v in e.items()},
-            'val': f'{e.text.strip() if e.text else ""}',
-            'documentation': [],
-            'fields': [],
-        }
-        # print(f'{n:>{2*len(path)}} {len(e)} {s["tag"]} {s["attrs"]} {s["val"]}')
-        for n, child in enumerate(path[-1], start=1):
-            walk(path + [child], ctx, n)
-        process(ctx, s)
+def make_jadn(fp: BinaryIO) -> dict:
+    """
+    Process each element as it is parsed, keeping only the ancestors of the current element
 
+    Elements are processed in document order of their end tags (children before parents), then discarded.
+    """
     ctx = {
+        'root': None,
         'meta': {},
         'types': [],
         'e_count': defaultdict(int),
     }
-    walk([root], ctx, 1)
-    for n, (k, v) in enumerate(ctx['e_count'].items(), start=1):
-        pass
-        # print(f'{n:=4} {k} = {v}')
-    return {k: ctx[k] for k in ('meta', 'types')}
+    paths = []      # Element path of each ancestor, e.g., "schema.complexType.sequence"
+    for event, e in etree.iterparse(fp, events=('start', 'end'), remove_comments=True, remove_pis=True):
+        if event == 'start':
+            tag = etree.QName(e.tag).localname
+            paths.append(f'{paths[-1]}.{tag}' if paths else tag)
+            ctx['e_count'][paths[-1]] += 1
+            if ctx['root'] is None:
+                ctx['root'] = (tag, dict(e.items()), dict(e.nsmap))
+        else:
+            s = {
+                'tag': etree.QName(e.tag),
+                'attrs': dict(e.items()),
+                'val': f'{e.text.strip() if e.text else ""}',
+                'documentation': [],
+                'fields': [],
+            }
+            process(ctx, s)
+            paths.pop()
+            e.clear()   # Discard element and any processed siblings before it
+            while e.getprevious() is not None:
+                del e.getparent()[0]
+    return ctx
 
 
 def process(ctx, s):
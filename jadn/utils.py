@@ -3,17 +3,18 @@ Support functions for JADN codec
   Convert dict between nested and flat
   Convert typedef options between dict and strings
 """
-import copy
 import re
 
 from functools import reduce
-from typing import Any
-from jadn.core import dump_option_type
+from typing import Any, Callable
+from jadn.core import option_strs, get_config     # get_config is part of utils API
+from jadn.graph import topo_sort     # Part of utils API
+from jadn.index import type_refs
 from jadn.definitions import (
     TypeName, CoreType, TypeOptions, TypeDesc, Fields, ItemID, ItemDesc,
     FieldID, FieldName, FieldType, FieldOptions, FieldDesc,
-    DEFAULT_CONFIG, MAX_DEFAULT, MAX_UNSPECIFIED,
-    is_builtin, has_fields
+    MAX_DEFAULT, MAX_UNSPECIFIED,
+    is_builtin
 )
 
 
@@ -95,70 +96,35 @@ def build_deps(schema: dict[str, list]) -> dict[str, list[str]]:
     multiple roots indicate disconnected items or hierarchies,
     and no roots indicate a dependency cycle.
     """
-    def get_refs(tdef: list) -> list[str]:  # Return all type references from a type definition
-        """
-        # Options whose value is/has a type name: strip option id
-        oids = [JADN.OPTX['keyType'], JADN.OPTX['valueType'], JADN.OPTX['extends'], JADN.OPTX['restricts']]
-        # Options that enumerate fields: keep option id
-        oids2 = [JADN.OPTX['enum'], JADN.OPTX['pointer']]
-        refs = [to[1:] for to in tdef[TypeOptions] if to[0] in oids and not is_builtin(to[1:])]
-        refs += ([to[1:] for to in tdef[TypeOptions] if to[0] in oids2])
-        """
-
-        ropts = {'keyType', 'valueType', 'extends', 'restricts', 'enum', 'pointer'}     # reference options
-        refs = [v for k, v in tdef[TypeOptions].items() if k in ropts and not is_builtin(v)]
-        if has_fields(tdef[CoreType]):  # Ignore Enumerated
-            for f in tdef[Fields]:
-                if not is_builtin(f[FieldType]):
-                    refs.append(f[FieldType])       # Add reference to type name
-                # Get refs from type opts in field (extension)
-                refs += get_refs(['', f[FieldType], f[FieldOptions], '', []])
-        return refs
-
-    deps = {t[TypeName]: get_refs(t) for t in schema['types']}
-    return deps
-
-
-def topo_sort(deps: dict[str, list[str]], roots: list[str]) -> list[str]:
-    """
-    Topological sort with locality
-    Sorts a list of (item: (dependencies)) pairs so that 1) all dependency items are listed after the parent item,
-    and 2) dependencies are listed in the input order and as close to the parent as possible.
-    Returns the sorted list of items.
-    """
-    out: list[str] = []
+    ropts = {'keyType', 'valueType', 'extends', 'restricts', 'enum', 'pointer'}     # reference options
+    return {t[TypeName]: [ref for ref, _ in type_refs(t, ropts)] for t in schema['types']}
 
-    def walk_tree(it: str) -> None:
-        if it not in out:
-            out.append(it)
-            for i in deps.get(it, []):
-                walk_tree(i)
 
-    for item in roots:
-        walk_tree(item)
-    out = out if out else list(deps)     # if cycle detected, don't sort
-    return out
+def canonicalize(schema: dict) -> dict:
+    """
+    Return a schema without default size and multiplicity options
 
+    The original schema is not modified. Type and field definitions that have no default options are shared
+    with it rather than copied, so the returned schema should be treated as read-only.
+    """
+    defaults = {'minLength': 0, 'maxLength': MAX_DEFAULT, 'minOccurs': 1, 'maxOccurs': 1}
 
-def canonicalize(schema: dict) -> dict:
-    def can_opts(opts: dict[str, Any], coretype: str):
-    # Remove default size and multiplicity options
-        if opts.get('minLength') == 0:
-            del opts['minlength']
-        if opts.get('maxLength') == MAX_DEFAULT:
-            del opts['maxLength']
-        if opts.get('minOccurs') == 1:
-            del opts['minOccurs']
-        if opts.get('maxOccurs') == 1:
-            del opts['maxOccurs']
-
-    cschema = copy.deepcopy(schema)     # don't modify original
-    for td in cschema['types']:
-        can_opts(td[TypeOptions], td[CoreType])
+    def can_opts(opts: dict[str, Any]) -> dict[str, Any]:
+        if any(k in opts and opts[k] == v for k, v in defaults.items()):
+            return {k: v for k, v in opts.items() if k not in defaults or v != defaults[k]}
+        return opts
+
+    types = []
+    for td in schema['types']:
+        topts = can_opts(td[TypeOptions])
+        fields = td[Fields]
         if td[CoreType] != 'Enumerated':
-            for fd in td[Fields]:
-                can_opts(fd[FieldOptions], fd[FieldType])
-    return cschema
+            cfields = [fd if (fo := can_opts(fd[FieldOptions])) is fd[FieldOptions] else
+                       [*fd[:FieldOptions], fo, *fd[FieldOptions + 1:]] for fd in fields]
+            fields = fields if all(cf is fd for cf, fd in zip(cfields, fields)) else cfields
+        unchanged = topts is td[TypeOptions] and fields is td[Fields]
+        types.append(td if unchanged else [*td[:TypeOptions], topts, td[TypeDesc], fields, *td[Fields + 1:]])
+    return {**schema, 'types': types}
 
 
 def cleanup_tagid(fields: dict) -> dict:
@@ -175,25 +141,61 @@ def cleanup_tagid(fields: dict) -> dict:
     return fields
 
 
+# Typestring grammar: TypeRef [#] [(funct)] {option}
+TYPESTR_FUNC = re.compile(r'^\s*(!?[-$:\w]+)(?:\[([^]]+)])?$')     # Typeref: !foo:MyType[Ktype, Vtype]
+TYPESTR_HEAD = re.compile(r'\s*(!?[-.:\w]+)\s*(#?)\s*(?:\(([^)]+)\))?')     # TypeRef TODO: Use $TypeRef from self
+TYPESTR_OPT = re.compile(r"""\s*(?:
+    =(?P<open>[(\[])(?P<value>                      # default: =(x)  const: =[x]  range: =[x, y)
+        "(?P<s1>[^=\n]+?)"(?:,"(?P<s2>[^=\n]+)")?     # String values are quoted
+        | [^=\n]*?                                   # Other values: TYPESTR_RANGE
+    )(?P<close>[)\]])
+    | \{pattern="(?P<pattern>.*)"\}                  # pattern: {pattern="regex"}, ends at the last "}
+    | \{(?P<lo>[^{}]*?)\.\.(?P<hi>[^{}]*)\}           # size: {lo..hi}
+    | /(?P<format>\w[-\w]*)                          # format: /name
+    | (?P<flag>unique|set|unordered|ordered|attr|abstract|final)
+    | (?P<ref>restricts|extends|tagString)\((?P<refv>.+?)\)
+    | \^E(?P<scale>-?\d+)                            # fixed-point scale factor: ^E<n>
+)""", re.VERBOSE)
+TYPESTR_RANGE = re.compile(r'(.+?)(?:,(.+))?')      # Non-String value or range, quotes are kept: x  x,y
+
+
 def parseopt(optstr: str) -> tuple:
-    m1 = re.match(r'^\s*(!?[-$:\w]+)(?:\[([^]]+)])?$', optstr)   # Typeref: !foo:MyType[Ktype, Vtype]
+    m1 = TYPESTR_FUNC.match(optstr)
     if m1 is None:
         raise_error(f'TypeString2JADN: unexpected function: {optstr}')
     return m1.group(1) if m1.group(2) is None else {m1.group(1): m1.group(2)}
 
 
+def render_cached(self, render: Callable, key: tuple, *args) -> Any:
+    """
+    Return render(self, *args), computed once per key for the loaded schema
+
+    Keys contain all schema content the rendering depends on, so an edited definition gets a new key rather
+    than a stale string. The cache (self.str_cache) is shared by format instances created from the same package
+    and is cleared when a schema is loaded.
+    """
+    try:
+        return self.str_cache[key]
+    except KeyError:
+        val = self.str_cache[key] = render(self, *args)
+        return val
+    except TypeError:   # Unhashable option value
+        return render(self, *args)
+
+
 def jadn2typestr(self, tname: str, to: dict) -> str:
     """
+    Return the JIDL type string for a core type with options
 
-    :param self:
-    :type self:
-    :param tname:
-    :type tname:
-    :param to:
-    :type to:
-    :return:
-    :rtype:
+    :param self: format instance
+    :param tname: core type name
+    :param to: type options
+    :return: type string, e.g., 'String{1..*}'
     """
+    return render_cached(self, _jadn2typestr, (_jadn2typestr, tname, *to.items()), tname, to)
+
+
+def _jadn2typestr(self, tname: str, to: dict) -> str:
 
     # Handle keyType/valueType containing Enum options
     def _kvstr(optv: str) -> str:
@@ -224,8 +226,7 @@ def jadn2typestr(self, tname: str, to: dict) -> str:
         ls, hs = lo if lo else '*', hi if hi else '*'
         return f'={lc}{ls}, {hs}{hc}' if lo or hi else ''
 
-    topts = copy.copy(to)   # Don't delete caller's options
-    dump_option_type(topts, tname, self.OPT_TYPE)
+    topts = option_strs(to, tname, self.OPT_TYPE)     # New dict, caller's options are not modified
     txt = '#' if topts.pop('id', None) else ''   # Remove known options from topts as processed.
     if tname in ('ArrayOf', 'MapOf'):
         txt += f"({_kvstr(topts.pop('keyType'))}, " if tname == 'MapOf' else '('
@@ -285,19 +286,36 @@ def id_type(td: list) -> bool:    # Return True if FieldName is a label in descr
         or 'combine' in td[TypeOptions])
 
 
+def tag_field(self, tdef: list, tagid: int | str) -> list | None:
+    """
+    Return the field of a type definition whose id is tagid, or None if there is none
+
+    Uses the schema index if tdef is an indexed type definition of the loaded schema
+    """
+    if self.schema and (idx := self.schema_index()).types.get(tdef[TypeName]) is tdef:
+        return idx.field_ids[tdef[TypeName]].get(int(tagid))
+    return next((f for f in tdef[Fields] if f[FieldID] == int(tagid)), None)
+
+
 def jadn2fieldstr(self, fdef: dict, tdef: dict) -> tuple[str, str, str, str]:
     """
+    Return the JIDL strings for a field or enumerated item
 
-    :param self:
-    :type self:
-    :param fdef:
-    :type fdef:
-    :param tdef:
-    :type tdef:
-    :return:
-    :rtype:
+    :param self: format instance
+    :param fdef: field definition
+    :param tdef: type definition containing fdef
+    :return: field name, field type string, multiplicity and description
     """
+    if tdef[CoreType] == 'Enumerated':
+        return _jadn2fieldstr(self, fdef, tdef)     # Not worth caching
+    tagname = None if (tagid := fdef[FieldOptions].get('tagId')) is None else (
+        tf[FieldName] if (tf := tag_field(self, tdef, tagid)) else '')
+    fid, fname, ftype, fopts, fdesc = fdef
+    key = (_jadn2fieldstr, id_type(tdef), tagname, fid, fname, ftype, fdesc, *fopts.items())
+    return render_cached(self, _jadn2fieldstr, key, fdef, tdef)
+
 
+def _jadn2fieldstr(self, fdef: dict, tdef: dict) -> tuple[str, str, str, str]:
     idtype = id_type(tdef)
     fname = '' if idtype else fdef[FieldName]
     fdesc = f'{fdef[FieldName]}:: ' if idtype else ''
@@ -311,8 +329,8 @@ def jadn2fieldstr(self, fdef: dict, tdef: dict) -> tuple[str, str, str, str]:
         fname += '/' if 'dir' in fopts else ''
         tf = ''
         if tagid := fopts.get('tagId'):
-            tf = [f[FieldName] for f in tdef[Fields] if f[FieldID] == int(tagid)][0]
-            tf = f'(tagId[{tf if tf else tagid}])'
+            tf = tag_field(self, tdef, tagid)
+            tf = f'(tagId[{tf[FieldName] if tf and tf[FieldName] else tagid}])'
 
         fto = {k: fopts[k] for k in fopts.keys() - self.FIELD_OPTS}
         ftypestr = jadn2typestr(self, fdef[FieldType], fto)
@@ -331,20 +349,16 @@ def typestr2jadn(self, typestring: str) -> tuple[str, dict[str, str], str]:
     """
     Parse a "typestring" to JADN CoreType, TypeOptions and FieldOptions
 
-    :param self:
-    :type self:
-    :param typestring:
-    :type typestring:
-    :return:
-    :rtype:
+    Options are scanned left to right in one pass. Range, default and const options are added first,
+    then pattern and size, then the others in order of appearance.
+
+    :param self: format instance
+    :param typestring: type name followed by options, e.g., 'String{1..*} /email'
+    :return: type name, options, unparsed text (empty)
     """
 
     topts = {}
-    p_name = r'\s*(!?[-.:\w]+)'                     # 1 TypeRef TODO: Use $TypeRef from self
-    p_id = r'\s*(#?)'                                  # 2 'id'
-    p_func = r'\s*(?:\(([^)]+)\))?'                 # 3 'keyType', 'valueType', 'enum', 'pointer', 'tagId'
-    pattern = fr'^{p_name}{p_id}{p_func}(.*?)\s*$'
-    m = re.match(pattern, typestring)
+    m = TYPESTR_HEAD.match(typestring)
     if m is None:
         raise_error(f'TypeString2JADN: "{typestring}" is not "TypeRef [#] [(funct)]"')
     tname = m.group(1)
@@ -367,59 +381,58 @@ def typestr2jadn(self, typestring: str) -> tuple[str, dict[str, str], str]:
             op = [k for k in opts[0]][0]
             assert f'unexpected function options {tname} {op}'
 
-    rest = m.group(4)
-    while rest.strip():
-        # Process range and default constraints
-        if m := re.match(r'^(.*?)(?:=([\(\[])([^=\n]*)([\)\]]))(.*)$', rest):
-            #  Matches: rest = [ range ] rest   default:  = (x)   const:  = [x]  range:  = ([x,y)]
-            #   group    1     2   3   4  5
-            rest = m.group(1) + m.group(5)
-            rpat = r'^\"(.+?)\"(?:,\"(.+)\")?$' if tname == 'String' else r'^(.+?)(?:,(.+))?$'
-            if r := re.match(rpat, m.group(3)):
-                if r.group(2):
-                    lo = {'[': 'minInclusive', '(': 'minExclusive'}[m.group(2)]
-                    hi = {']': 'maxInclusive', ')': 'maxExclusive'}[m.group(4)]
-                    topts.update({lo: r.group(1)} if '*' not in r.group(1) else {})
-                    topts.update({hi: r.group(2)} if '*' not in r.group(2) else {})
-                else:
-                    op = {'[': 'const', '(': 'default'}[m.group(2)]
-                    topts.update({op: r.group(1)})
-
-        # Process pattern and size constraints
-        elif m := re.match(r'^(.*?)(\{.*\})(.*)$', rest):
-            rest = m.group(1) + m.group(3)
-            for r in re.finditer(r'^\{(.*)\}', m.group(2)):
-                opt = r.group(1)
-                if t := re.match(r'^pattern=\"(.*)\"', opt):
-                    topts.update({'pattern': t.group(1)})
-                elif len(x := opt.split('..', maxsplit=1)) == 2:
-                    a, b = x
-                    a = '*' if a != '*' and int(a) == 0 else a  # Default min size = 0
-                    topts.update({} if a == '*' else {'minLength': int(a)})
-                    topts.update({} if b == '*' else {'maxLength': int(b)})
-                else:
-                    raise_error(f'unrecognized arg "{opt}", expected pattern or range')
-
-        elif m := re.match(r'^\s*(\/\w[-\w]*)(.*)$', rest):   # format option "/foo"
-            rest = m.group(2)
-            topts.update({'format': m.group(1)[1:]})
-
-        elif m := re.match(r'^\s*(unique|set|unordered|ordered|attr|abstract|final)(.*)$', rest):
-            rest = m.group(2)
-            topts.update({m.group(1): True})    # Boolean options - True if present
-
-        elif m := re.match(r'^\s*(restricts|extends|tagString)\((.+?)\)(.*)$', rest):  # Extends/Restricts type inheritance
-            rest = m.group(3)
-            topts.update({m.group(1): m.group(2)})
-
-        elif m := re.match(r'^\s*\^E(-?\d+)(.*)$', rest):   # fixed-point scale factor: ^E<n>
-            rest = m.group(2)
-            topts.update({'scale': m.group(1)})
-
+    pos, end = m.end(), len(typestring.rstrip())
+    if pos == end:
+        return tname, topts, ''
+    values, sizes, others = {}, {}, {}
+    while pos < end:
+        if (m := TYPESTR_OPT.match(typestring, pos)) is None:
+            raise_error(f'Unprocessed type options {typestring[pos:]} in {typestring}')
+        pos = m.end()
+        if op := m.group('open'):
+            if tname == 'String':
+                lo, hi = m.group('s1', 's2')
+            else:
+                lo, hi = r.groups() if (r := TYPESTR_RANGE.fullmatch(m.group('value'))) else (None, None)
+            if lo is None:      # Unrecognized value is ignored
+                continue
+            if hi:
+                if '*' not in lo:
+                    values[{'[': 'minInclusive', '(': 'minExclusive'}[op]] = lo
+                if '*' not in hi:
+                    values[{']': 'maxInclusive', ')': 'maxExclusive'}[m.group('close')]] = hi
+            else:
+                values[{'[': 'const', '(': 'default'}[op]] = lo
+        elif (v := m.group('pattern')) is not None:
+            sizes['pattern'] = v
+        elif (b := m.group('hi')) is not None:
+            a = m.group('lo')
+            a = '*' if a != '*' and int(a) == 0 else a  # Default min size = 0
+            sizes.update({} if a == '*' else {'minLength': int(a)})
+            sizes.update({} if b == '*' else {'maxLength': int(b)})
+        elif v := m.group('format'):
+            others['format'] = v
+        elif v := m.group('flag'):
+            others[v] = True    # Boolean options - True if present
+        elif v := m.group('ref'):
+            others[v] = m.group('refv')
         else:
-            raise_error(f'Unprocessed type options {rest} in {typestring}')
+            others['scale'] = m.group('scale')
+    topts.update(values)
+    topts.update(sizes)
+    topts.update(others)
+    return tname, topts, typestring[pos:end]
+
 
-    return tname, topts, rest
+# Fieldstring grammar: [key|link](FieldType) [multiplicity] [(tagId[field])] {type option}
+FIELDSTR_LABEL = re.compile(r'^([^:]+)::\s*(.*)$')                  # FieldName:: description
+FIELDSTR_NAME = re.compile(r'^\s*(\S+)\s*(.*)$')
+FIELDSTR_KEY = re.compile(r'^\s*(key|link)\((.*)\)(.*)$')           # Key / Link field options
+FIELDSTR_TYPE = re.compile(r'^\s*([-:\w]+)(.*)$')
+FIELDSTR_MULT = re.compile(r'^\s*\[(\d+)(?:\.\.(\d+|\*|\.))?\](.*)$')    # [min..max]
+FIELDSTR_OPTIONAL = re.compile(r'^(.*)\soptional(.*)$')
+FIELDSTR_NILLABLE = re.compile(r'^(.*)\snillable(.*)$')
+FIELDSTR_TAGID = re.compile(r'^\(tagId\[(.+)\]\)(.*)$')
 
 
 def fieldstr2jadn(self, tdef: list, fid: int, fstr: str, fdesc: str) -> list:
@@ -442,11 +455,12 @@ def fieldstr2jadn(self, tdef: list, fid: int, fstr: str, fdesc: str) -> list:
     btype = tdef[CoreType]
     if id_type(tdef):
         fname = f'f{fid}'   # Generate field name if not in description
-        if m := re.match(r'^([^:]+)::\s*(.*)$', fdesc):
+        if m := FIELDSTR_LABEL.match(fdesc):
             fname = m.group(1)
             fdesc = m.group(2)
     else:
-        m = re.match(r'^\s*(\S+)\s*(.*)$', fstr.strip())
+        if (m := FIELDSTR_NAME.match(fstr.strip())) is None:
+            raise_error(f'FieldString2JADN: missing field name: "{fstr}"')
         fname = m.group(1)
         fstr = m.group(2)
 
@@ -458,15 +472,16 @@ def fieldstr2jadn(self, tdef: list, fid: int, fstr: str, fdesc: str) -> list:
         fname = fname.rstrip('/')
         fopts.update({'dir': True})
 
-    if m := re.match(r'^\s*(key|link)\((.*)\)(.*)$', fstr):    # Key / Link field options
+    if m := FIELDSTR_KEY.match(fstr):    # Key / Link field options
         fopts.update({m.group(1).lower(): True})
         ftype = m.group(2)
         fstr = ftype + m.group(3)
 
-    m = re.match(f'^\s*([-:\w]+)(.*)$', fstr)
+    if (m := FIELDSTR_TYPE.match(fstr)) is None:
+        raise_error(f'FieldString2JADN: "{fstr}" is not "FieldType [options]"')
     ftype = m.group(1)
     fstr = m.group(2)
-    if m := re.match(r'^\s*\[(\d+)(?:\.\.(\d+|\*|\.))?\](.*)$', fstr):
+    if m := FIELDSTR_MULT.match(fstr):
         if maxOccurs := m.group(2):
             minOccurs = int(m.group(1))
             maxOccurs = MAX_DEFAULT if maxOccurs == '*' else MAX_UNSPECIFIED if maxOccurs == '.' else int(maxOccurs)
@@ -475,14 +490,14 @@ def fieldstr2jadn(self, tdef: list, fid: int, fstr: str, fdesc: str) -> list:
         fopts.update({'minOccurs': minOccurs} if minOccurs != 1 else {})
         fopts.update({'maxOccurs': maxOccurs} if maxOccurs != 1 else {})
         fstr = m.group(3)
-    elif m := re.match(r'^(.*)\soptional(.*)$', fstr):
+    elif m := FIELDSTR_OPTIONAL.match(fstr):
         fopts.update({'minOccurs': 0})
         fstr = m.group(1) + m.group(2)
-    elif m := re.match(r'^(.*)\snillable(.*)$', fstr):
+    elif m := FIELDSTR_NILLABLE.match(fstr):
         fopts.update({'nillable': True})
         fstr = m.group(1) + m.group(2)
 
-    if m := re.match(r'^\(tagId\[(.+)\]\)(.*)$', fstr):
+    if m := FIELDSTR_TAGID.match(fstr):
         fopts.update({'tagId': m.group(1)})    # process tagId
         fstr = m.group(2)
 
@@ -494,23 +509,6 @@ def fieldstr2jadn(self, tdef: list, fid: int, fstr: str, fdesc: str) -> list:
     return [int(fid), fname, ftype, fopts, fdesc]
 
 
-def get_config(schema: dict) -> dict:
-    """
-
-    :param schema:
-    :type schema:
-    :return:
-    :rtype:
-    """
-
-    config = dict(DEFAULT_CONFIG)
-    config.update(schema.get('meta', {}).get('config', {}))
-    ns = config.get('$NSID', '').lstrip('^').rstrip('$')    # Derived $TypeRef pattern
-    tn = config.get('$TypeName', '').lstrip('^').rstrip('$')
-    config.update({'$TypeRef': fr'^({ns}(?<=.):)?{tn}$'})   # Non-empty prefix before ':'
-    return config
-
-
 # =========================================================
 # Diagnostics
 # =========================================================
@@ -0,0 +1,259 @@
+"""
+Check a loaded (logical) JADN schema against the JADN metaschema
+
+Checks the structure of each type definition, the option names allowed and required for its core type, option
+value types, and type and field names against the schema's config patterns.  Checks are done on the logical
+schema (options are typed dicts), so unlike the JSON Schema in data/ they do not need the schema to be serialized.
+
+Each type definition is checked independently using tables built once per schema, so the types of a large
+schema can be checked in chunks across a pool of worker processes.  Checks that span types (duplicate type
+names, roots, metadata) are done once for the whole schema.
+
+Errors are (JSON Pointer, message) with pointers into the JADN serialization of the schema, e.g., /types/3/4/1
+for the second field of the fourth type.
+"""
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from jadn.definitions import (TypeName, CoreType, TypeOptions, TypeDesc, Fields, ItemID, ItemValue, ItemDesc,
+                              FieldID, FieldName, FieldType, FieldOptions, FieldDesc,
+                              CORE_TYPES, ALLOWED_TYPE_OPTIONS, ALLOWED_TYPE_OPTIONS_ALL, REQUIRED_TYPE_OPTIONS,
+                              is_builtin, has_fields)
+
+Errors = list[tuple[str, str]]
+CHUNK = 2000        # Minimum number of types per worker task
+VALUE_TYPES = {     # Option value type: Python types of logical values
+    'Binary': (bytes,),
+    'Boolean': (bool,),
+    'Integer': (int,),
+    'Number': (int, float),
+    'String': (str,),
+    'BType': (object,),     # Value type of default, const and bounds options depends on the field's type
+}
+CONFIG_PATTERNS = ('$TypeName', '$FieldName', '$NSID')     # Config variables that are regular expressions
+
+
+def check_schema(pkg, jobs: int = 1) -> Errors:
+    """
+    Check a loaded schema against the metaschema
+
+    :param pkg: JADNCore instance with a loaded schema
+    :param jobs: number of worker processes used to check type definitions of large schemas
+    :return: list of (JSON Pointer, message) errors, empty if the schema is valid
+    """
+    schema = pkg.schema
+    if not isinstance(schema, dict) or not isinstance(types := schema.get('types'), list):
+        return [('', 'schema must be an object with a "types" list')]
+    errors = check_meta(schema.get('meta', {}), {td[TypeName] for td in types if valid_typedef(td)}, pkg.META_TYPE)
+    names = {}
+    for n, td in enumerate(types):
+        if valid_typedef(td) and (k := names.setdefault(td[TypeName], n)) != n:
+            errors.append((f'/types/{n}/{TypeName}', f'{td[TypeName]} is already defined at /types/{k}'))
+
+    ctx = make_context(pkg)
+    if jobs > 1 and len(types) >= 2 * CHUNK:
+        size = max(CHUNK, len(types) // (4 * jobs))
+        chunks = [(start, types[start:start + size]) for start in range(0, len(types), size)]
+        with ProcessPoolExecutor(jobs, initializer=init_worker, initargs=(ctx,)) as pool:
+            for errs in pool.map(check_chunk, chunks):
+                errors += errs
+    else:
+        errors += check_types(ctx, 0, types)
+    return errors
+
+
+# ========================================================
+# Support functions
+# ========================================================
+
+WORKER_CTX = {}     # Tables for check_chunk, set in each worker process
+
+
+def init_worker(ctx: dict) -> None:
+    WORKER_CTX.update(ctx)
+
+
+def check_chunk(chunk: tuple[int, list]) -> Errors:
+    return check_types(WORKER_CTX, *chunk)
+
+
+def valid_typedef(td: Any) -> bool:
+    return isinstance(td, list) and len(td) > CoreType and isinstance(td[TypeName], str)
+
+
+def make_context(pkg) -> dict:
+    """
+    Build the tables used to check type definitions: allowed options by core type, option value types,
+    and name patterns from the schema's config
+    """
+    type_opts = {}      # {CoreType: {option name: value type}}, value type of "BType" options is the core type
+    for ct in CORE_TYPES:
+        allowed = ALLOWED_TYPE_OPTIONS[ct] + ALLOWED_TYPE_OPTIONS_ALL
+        if (td := pkg.TYPE_X.get(f'{ct}Opts')) is not None:     # Options listed in metaschema
+            base = pkg.TYPE_X.get(td[TypeOptions].get('extends'), [None, None, {}, '', []])
+            allowed += [fd[FieldName] for fd in td[Fields] + base[Fields]]
+        type_opts[ct] = {k: ct if (t := pkg.OPT_TYPE[k]) == 'BType' else t for k in allowed if k in pkg.OPT_TYPE}
+    # Field options include type options of an anonymous type derived from the field type or its elements
+    field_opts = {k: pkg.OPT_TYPE[k] for k in pkg.FIELD_OPTS.union(*type_opts.values())}     # BType is any type
+    return {
+        'type_opts': type_opts,
+        'field_opts': field_opts,
+        'ref_opts': pkg.REF_OPTS,
+        'type_name': pkg.config.type_name,
+        'field_name': pkg.config.field_name,
+        'type_ref': pkg.config.type_ref,
+    }
+
+
+def check_options(ctx: dict, ptr: str, opts: Any, allowed: dict[str, str]) -> Errors:
+    """
+    Check option names and value types, and that type references are well-formed
+    """
+    if not isinstance(opts, dict):
+        return [(ptr, 'options must be a dict')]
+    errors = []
+    for k, v in opts.items():
+        if (vtype := allowed.get(k)) is None:
+            errors.append((ptr, f'option "{k}" is not allowed'))
+        elif not isinstance(v, VALUE_TYPES[vtype]) or (isinstance(v, bool) and vtype in ('Integer', 'Number')):
+            errors.append((ptr, f'option "{k}" value {v!r} is not {vtype}'))
+        elif k in ctx['ref_opts'] and not (is_builtin(v) or ctx['type_ref'].match(v)):
+            errors.append((ptr, f'option "{k}" value "{v}" is not a TypeRef'))
+        elif k in ('minLength', 'maxLength', 'minOccurs') and v < 0:
+            errors.append((ptr, f'option "{k}" value {v} is negative'))
+    return errors
+
+
+def check_types(ctx: dict, start: int, types: list) -> Errors:
+    """
+    Check type definitions
+
+    :param ctx: tables from make_context
+    :param start: position of types[0] in schema types, for error pointers
+    :param types: type definitions
+    """
+    errors = []
+    type_name = ctx['type_name'].match
+    field_name = ctx['field_name'].match
+    type_ref = ctx['type_ref'].match
+    type_opts = ctx['type_opts']
+    field_opts = ctx['field_opts']
+    good_names, good_types = set(), set()
+    for n, td in enumerate(types, start=start):
+        ptr = f'/types/{n}'
+        if not valid_typedef(td) or len(td) != 5:
+            errors.append((ptr, 'type definition must be [TypeName, CoreType, TypeOptions, TypeDesc, Fields]'))
+            continue
+        tn, ct, topts, tdesc, fields = td
+        if not type_name(tn):
+            errors.append((f'{ptr}/{TypeName}', f'type name "{tn}" does not match $TypeName'))
+        if ct not in CORE_TYPES:
+            errors.append((f'{ptr}/{CoreType}', f'"{ct}" is not a core type'))
+            continue
+        if topts or not isinstance(topts, dict):
+            errors += check_options(ctx, f'{ptr}/{TypeOptions}', topts, type_opts[ct])
+        if isinstance(topts, dict) and (missing := [k for k in REQUIRED_TYPE_OPTIONS[ct] if k not in topts]):
+            errors.append((f'{ptr}/{TypeOptions}', f'{ct} requires option {", ".join(missing)}'))
+        if not isinstance(tdesc, (str, dict)):
+            errors.append((f'{ptr}/{TypeDesc}', 'description must be a string'))
+        if not isinstance(fields, list):
+            errors.append((f'{ptr}/{Fields}', 'fields must be a list'))
+            continue
+        if fields and not (ct == 'Enumerated' or has_fields(ct)):
+            errors.append((f'{ptr}/{Fields}', f'{ct} type cannot have fields'))
+            continue
+
+        ids, names = set(), set()
+        fids = None     # All field ids, if needed to check tagId
+        for k, fd in enumerate(fields):
+            if ct == 'Enumerated':
+                if not (isinstance(fd, list) and len(fd) == 3 and isinstance(fd[ItemID], int)
+                        and isinstance(fd[ItemValue], str) and isinstance(fd[ItemDesc], (str, dict))):
+                    errors.append((f'{ptr}/{Fields}/{k}', 'item must be [ItemID, ItemValue, ItemDesc]'))
+                    continue
+                fid, fname = fd[ItemID], fd[ItemValue]
+            else:
+                if not (isinstance(fd, list) and len(fd) == 5 and isinstance(fd[FieldID], int)
+                        and isinstance(fd[FieldName], str) and isinstance(fd[FieldType], str)
+                        and isinstance(fd[FieldDesc], (str, dict))):
+                    errors.append((f'{ptr}/{Fields}/{k}',
+                                   'field must be [FieldID, FieldName, FieldType, FieldOptions, FieldDesc]'))
+                    continue
+                fid, fname, ftype, fopts = fd[FieldID], fd[FieldName], fd[FieldType], fd[FieldOptions]
+                if fid < 0 or isinstance(fid, bool):
+                    errors.append((f'{ptr}/{Fields}/{k}/{FieldID}', f'field id {fid} is negative'))
+                if fname not in good_names:     # Names and types recur, match each once
+                    if not field_name(fname):
+                        errors.append((f'{ptr}/{Fields}/{k}/{FieldName}',
+                                       f'field name "{fname}" does not match $FieldName'))
+                    else:
+                        good_names.add(fname)
+                if ftype not in good_types:
+                    if not (is_builtin(ftype) or type_ref(ftype)):
+                        errors.append((f'{ptr}/{Fields}/{k}/{FieldType}', f'field type "{ftype}" is not a TypeRef'))
+                    else:
+                        good_types.add(ftype)
+                if fopts or not isinstance(fopts, dict):
+                    errors += check_options(ctx, f'{ptr}/{Fields}/{k}/{FieldOptions}', fopts, field_opts)
+                    if isinstance(fopts, dict) and (tag := fopts.get('tagId')) is not None and tag not in (
+                            fids := fids or {f[FieldID] for f in fields if isinstance(f, list) and f}):
+                        errors.append((f'{ptr}/{Fields}/{k}/{FieldOptions}', f'tagId {tag} is not a field id'))
+            if fid in ids:
+                errors.append((f'{ptr}/{Fields}/{k}/{FieldID}', f'duplicate id {fid}'))
+            if fname in names:
+                errors.append((f'{ptr}/{Fields}/{k}/{FieldName}',
+                               f'duplicate {"value" if ct == "Enumerated" else "name"} "{fname}"'))
+            ids.add(fid)
+            names.add(fname)
+    return errors
+
+
+def check_meta(meta: Any, type_names: set[str], meta_type: dict[str, str]) -> Errors:
+    """
+    Check schema metadata: package, prefixes, roots and config have metaschema-defined types, other values are strings
+    """
+    if not isinstance(meta, dict):
+        return [('/meta', 'meta must be a dict')]
+    errors = []
+    if meta and not isinstance(meta.get('package'), str):
+        errors.append(('/meta/package', 'package is required and must be a string'))
+    for k, v in meta.items():
+        ptr = f'/meta/{k}'
+        match k:
+            case 'package':
+                pass
+            case 'prefixes' | 'namespaces':
+                if not (isinstance(v, list) and all(isinstance(p, (list, tuple)) and len(p) == 2
+                                                    and all(isinstance(s, str) for s in p) for p in v)):
+                    errors.append((ptr, f'{k} must be a list of [prefix, namespace] pairs'))
+            case 'roots':
+                if not (isinstance(v, list) and all(isinstance(r, str) for r in v)):
+                    errors.append((ptr, 'roots must be a list of type names'))
+                else:
+                    errors += [(ptr, f'root "{r}" is not defined') for r in v if r not in type_names]
+            case 'config':
+                if not isinstance(v, dict):
+                    errors.append((ptr, 'config must be a dict'))
+                    continue
+                for ck, cv in v.items():
+                    if (ct := meta_type.get(ck)) is None:
+                        errors.append((f'{ptr}/{ck}', f'"{ck}" is not a config variable'))
+                    elif not isinstance(cv, VALUE_TYPES[ct]) or isinstance(cv, bool):
+                        errors.append((f'{ptr}/{ck}', f'{ck} value {cv!r} is not {ct}'))
+                    elif ck in CONFIG_PATTERNS and (e := pattern_error(cv)):
+                        errors.append((f'{ptr}/{ck}', f'{ck} value {cv!r} is not a valid pattern: {e}'))
+            case _:
+                if not isinstance(v, str):
+                    errors.append((ptr, f'{k} must be a string'))
+    return errors
+
+
+def pattern_error(pattern: str) -> str:
+    """
+    Return the error message if a pattern does not compile, otherwise ''
+    """
+    try:
+        re.compile(pattern)
+        return ''
+    except re.error as e:
+        return str(e)
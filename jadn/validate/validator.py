@@ -0,0 +1,644 @@
+"""
+Compile a JADN schema into instance validation functions
+
+Each type definition is compiled once into a closure with its options resolved in advance: patterns are
+compiled, value bounds and size limits are baked in, and field lookup tables are built.  A compiled check
+takes an instance and returns a list of (JSON Pointer, message) errors, or an empty tuple if the instance is valid.
+
+Instances are API values: Record, Map and Choice instances are dicts, Array and ArrayOf instances are lists,
+Enumerated items are names (ids if the "id" option is set), and Binary values are bytes-like.  Lengths of
+Binary values are checked on the buffer, so bytearray and memoryview values are not copied.  As in JSON,
+Binary values may also be text strings in the representation of their format,
+e.g., hex for "x" or dotted-quad for "ipv4-addr" (see BINARY_TEXT), and Base64url by default.
+ArrayOf instances of Integer or Number values may also be one-dimensional numeric buffers, e.g., array.array or
+NumPy arrays; their items, and lists of numbers, are checked in bulk (see compile_bulk) rather than one by one.
+Formats that are not listed in FORMAT_CHECKS are accepted without semantic validation.
+"""
+import base64
+import ipaddress
+import math
+import re
+import struct
+import uuid
+from datetime import date, datetime, time
+from typing import Any, Callable
+from jadn.definitions import (TypeName, CoreType, TypeOptions, Fields, ItemID, ItemValue,
+                              FieldID, FieldName, FieldType, FieldOptions,
+                              MAX_DEFAULT, MAX_UNSPECIFIED, is_builtin, has_fields)
+
+Errors = list[tuple[str, str]] | tuple
+Check = Callable[[Any], Errors]
+VALID = ()      # Result of a successful check, shared so that valid instances allocate nothing
+
+
+def compile_schema(pkg) -> dict[str, Check]:
+    """
+    Compile all type definitions in a loaded schema
+
+    :param pkg: JADNCore instance with a loaded schema
+    :return: {TypeName: check} where check(instance) returns a list of (JSON Pointer, message) errors
+    """
+    ctx = make_context(pkg)
+    ctx['cells'] = {tn: [None] for tn in ctx['tx']}
+    for tn, td in ctx['tx'].items():
+        ctx['cells'][tn][0] = compile_type(ctx, tn, td[CoreType], td[TypeOptions], resolve_fields(ctx, td))
+    return {tn: c[0] for tn, c in ctx['cells'].items()}
+
+
+# ========================================================
+# Support functions
+# ========================================================
+
+def make_context(pkg) -> dict:
+    """
+    Build the tables used to compile type definitions; cells of referenced types are added by the caller
+    """
+    return {
+        'tx': pkg.schema_index().types,
+        'config': pkg.config,
+        'type_opts': pkg.TYPE_OPTS,
+        'cells': {},    # {TypeName: [check]}: referenced before compiled, filled in when compiled
+    }
+
+
+def pointer(key: Any) -> str:
+    """
+    Return a JSON Pointer reference token for a key or index
+    """
+    return '/' + str(key).replace('~', '~0').replace('/', '~1')
+
+
+def prefix(key: Any, errors: Errors) -> list[tuple[str, str]]:
+    p = pointer(key)
+    return [(p + ptr, msg) for ptr, msg in errors]
+
+
+def size_limit(hi: int, default: int) -> int | float:
+    """
+    Return an upper size limit, applying the package limit for MAX_DEFAULT
+    """
+    return default if hi == MAX_DEFAULT else math.inf if hi == MAX_UNSPECIFIED else hi
+
+
+def resolve_fields(ctx: dict, td: list, seen: tuple = ()) -> list:
+    """
+    Return the fields of a type definition, including fields from "extends" and "restricts" base types
+    """
+    fields = td[Fields] if len(td) > Fields else []
+    topts = td[TypeOptions]
+    base = topts.get('extends', topts.get('restricts'))
+    if not base or base in seen or base not in ctx['tx']:
+        return fields
+    base_fields = resolve_fields(ctx, ctx['tx'][base], seen + (td[TypeName],))
+    if 'extends' in topts:
+        return base_fields + fields
+    rx = {fd[FieldID]: fd for fd in fields}    # Restriction: replace or delete (maxOccurs = 0) base fields
+    return [f for fd in base_fields if (f := rx.get(fd[FieldID], fd)) is fd
+            or len(f) <= FieldOptions or f[FieldOptions].get('maxOccurs', 1) != 0]
+
+
+def type_cell(ctx: dict, tname: str, ftype: str, fopts: dict) -> list:
+    """
+    Return [check] for a referenced type, or for an anonymous core type with type options in fopts
+    """
+    if is_builtin(ftype):
+        topts = {k: v for k, v in fopts.items() if k in ctx['type_opts']}
+        return [compile_type(ctx, tname, ftype, topts, [])]
+    if ftype in ctx['cells']:
+        return ctx['cells'][ftype]
+    return [lambda v: VALID]    # External (namespace-qualified) reference: not validated
+
+
+def field_cell(ctx: dict, tname: str, fd: list, optional_nil: bool = True) -> tuple[list, int]:
+    """
+    Return ([check], minOccurs) for a field, including multiplicity and nillable options
+    """
+    fopts = fd[FieldOptions]
+    name = f'{tname}.{fd[FieldName]}'
+    lo = fopts.get('minOccurs', 1)
+    hi = fopts.get('maxOccurs', 1)
+    if fopts.get('link'):       # Link value is the key of the referenced type
+        td = ctx['tx'].get(fd[FieldType], [])
+        key = [f for f in resolve_fields(ctx, td) if f[FieldOptions].get('key')] if td else []
+        cell = field_cell(ctx, name, key[0], False)[0] if key else [lambda v: VALID]
+    else:
+        cell = type_cell(ctx, name, fd[FieldType], fopts)
+    if hi != 1 or lo > 1:
+        cell = [compile_list(name, cell, max(lo, 1), size_limit(hi, ctx['config'].max_elements))]
+    if fopts.get('nillable') or (optional_nil and lo == 0):
+        inner = cell
+        cell = [lambda v: VALID if v is None else inner[0](v)]
+    return cell, lo
+
+
+def compile_list(tname: str, cell: list, lo: int, hi: int | float) -> Check:
+    def check(v: Any) -> Errors:
+        if not isinstance(v, list):
+            return [('', f'{tname}: {type(v).__name__} is not an array')]
+        if not lo <= len(v) <= hi:
+            return [('', f'{tname}: {len(v)} items, expected {lo}..{hi}')]
+        c = cell[0]
+        errs = []
+        for n, x in enumerate(v):
+            if e := c(x):
+                errs += prefix(n, e)
+        return errs
+    return check
+
+
+def compile_type(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Check:
+    """
+    Compile a type definition into a check function
+    """
+    check = {
+        'Binary': compile_binary,
+        'Boolean': compile_boolean,
+        'Integer': compile_number,
+        'Number': compile_number,
+        'String': compile_string,
+        'Enumerated': compile_enumerated,
+        'Choice': compile_choice,
+        'Array': compile_array,
+        'ArrayOf': compile_arrayof,
+        'Map': compile_map,
+        'MapOf': compile_mapof,
+        'Record': compile_map,
+    }[ctype](ctx, tname, ctype, topts, fields)
+    if topts.get('abstract'):
+        return lambda v: [('', f'{tname}: abstract type cannot have instances')]
+    if topts.get('nillable'):
+        inner = check
+        check = lambda v: VALID if v is None else inner(v)
+    return check
+
+
+# ========================================================
+# Primitive types
+# ========================================================
+
+def compile_boolean(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Check:
+    const = topts.get('const')
+
+    def check(v: Any) -> Errors:
+        if v is not True and v is not False:
+            return [('', f'{tname}: {type(v).__name__} is not Boolean')]
+        if const is not None and v != const:
+            return [('', f'{tname}: {v} is not const value {const}')]
+        return VALID
+    return check
+
+
+def compile_number(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Check:
+    """
+    Integer and Number: bounds are combined into one inclusive range plus exclusive end points
+    """
+    lo, hi, xlo, xhi = number_range(ctype, topts)
+    const = topts.get('const')
+    types = int if ctype == 'Integer' else (int, float)
+    rng = f'{"(" if xlo == xlo else "["}{lo}, {hi}{")" if xhi == xhi else "]"}'
+
+    def check(v: Any) -> Errors:
+        if not isinstance(v, types) or v is True or v is False:
+            return [('', f'{tname}: {type(v).__name__} is not {ctype}')]
+        if not lo <= v <= hi or v == xlo or v == xhi:
+            return [('', f'{tname}: {v} is not in range {rng}')]
+        if const is not None and v != const:
+            return [('', f'{tname}: {v} is not const value {const}')]
+        return VALID
+    return check
+
+
+def number_range(ctype: str, topts: dict) -> tuple[Any, Any, Any, Any]:
+    """
+    Return (lo, hi, xlo, xhi): inclusive range from bounds and sized format, and exclusive bounds or NaN
+    """
+    lo, hi = -math.inf, math.inf
+    if (m := SIZED_FORMAT.match(topts.get('format', ''))) and FORMAT_RANGE_TYPE[m.group(1)] == ctype:
+        lo, hi = FORMAT_RANGE[m.group(1)](int(m.group(2)))
+    lo = max(lo, topts.get('minInclusive', lo), topts.get('minExclusive', lo))
+    hi = min(hi, topts.get('maxInclusive', hi), topts.get('maxExclusive', hi))
+    xlo = topts.get('minExclusive', math.nan)   # NaN never compares equal: no exclusive bound
+    xhi = topts.get('maxExclusive', math.nan)
+    return lo, hi, xlo, xhi
+
+
+def compile_string(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Check:
+    lo = topts.get('minLength', 0)
+    hi = size_limit(topts.get('maxLength', MAX_DEFAULT), ctx['config'].max_string)
+    pattern = topts.get('pattern')
+    compiled = ctx['config'].patterns.get(pattern)      # Pattern may name a config variable, e.g., $TypeName
+    pattern = ctx['config'].values.get(pattern, pattern)
+    match = (compiled or re.compile(pattern)).search if pattern else None
+    const = topts.get('const')
+    fmt = FORMAT_CHECKS.get(topts.get('format'))
+    bounds = [b for b in (
+        ('minInclusive', lambda v, b: v >= b), ('maxInclusive', lambda v, b: v <= b),
+        ('minExclusive', lambda v, b: v > b), ('maxExclusive', lambda v, b: v < b)) if b[0] in topts]
+    bounds = [(k, f, topts[k]) for k, f in bounds]
+
+    def check(v: Any) -> Errors:
+        if not isinstance(v, str):
+            return [('', f'{tname}: {type(v).__name__} is not String')]
+        if not lo <= len(v) <= hi:
+            return [('', f'{tname}: length {len(v)} is not in range {lo}..{hi}')]
+        if match and not match(v):
+            return [('', f'{tname}: "{v}" does not match pattern {pattern}')]
+        if const is not None and v != const:
+            return [('', f'{tname}: "{v}" is not const value "{const}"')]
+        if fmt and not fmt(v):
+            return [('', f'{tname}: "{v}" is not a valid {topts["format"]}')]
+        for k, f, b in bounds:
+            if not f(v, b):
+                return [('', f'{tname}: "{v}" violates {k} "{b}"')]
+        return VALID
+    return check
+
+
+def compile_binary(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Check:
+    lo = topts.get('minLength', 0)
+    hi = size_limit(topts.get('maxLength', MAX_DEFAULT), ctx['config'].max_binary)
+    fmt = topts.get('format', 'b64')
+    sizes = BINARY_SIZES.get(fmt)
+    const = topts.get('const')
+    text = fmt if fmt in BINARY_TEXT else 'b64'
+    decode = BINARY_TEXT[text][1]
+    text_size = TEXT_SIZE.get(text)
+
+    def check(v: Any) -> Errors:
+        if isinstance(v, str):
+            if text_size and (n := text_size(v)) > hi:     # Reject oversized text without decoding it
+                return [('', f'{tname}: length {n} is not in range {lo}..{hi}')]
+            try:
+                v = decode(v)
+            except ValueError:
+                return [('', f'{tname}: "{v}" is not a valid {fmt} string')]
+        elif not isinstance(v, (bytes, bytearray, memoryview)):
+            return [('', f'{tname}: {type(v).__name__} is not Binary')]
+        n = v.nbytes if isinstance(v, memoryview) else len(v)
+        if not lo <= n <= hi:
+            return [('', f'{tname}: length {n} is not in range {lo}..{hi}')]
+        if sizes and n not in sizes:
+            return [('', f'{tname}: length {n} is not a valid {fmt}')]
+        if const is not None and v != const:
+            return [('', f'{tname}: value is not const value 0x{const.hex()}')]
+        return VALID
+    return check
+
+
+# ========================================================
+# Union and compound types
+# ========================================================
+
+def compile_enumerated(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Check:
+    ids = topts.get('id', False)
+    if ref := topts.get('enum'):
+        fields = resolve_fields(ctx, ctx['tx'][ref]) if ref in ctx['tx'] else []
+        items = {f[FieldID] if ids else f[FieldName] for f in fields}
+    elif ref := topts.get('pointer'):
+        items = set(pointer_paths(ctx, ref))
+    else:
+        items = {f[ItemID] if ids else f[ItemValue] for f in fields}
+
+    def check(v: Any) -> Errors:
+        try:
+            if v in items and v is not True and v is not False:
+                return VALID
+        except TypeError:
+            pass
+        return [('', f'{tname}: {v!r} is not a valid item')]
+    return check
+
+
+def pointer_paths(ctx: dict, tname: str, seen: tuple = ()) -> list[str]:
+    """
+    Return JSON Pointers to the fields of a type, descending into fields with the "dir" option
+    """
+    paths = []
+    if (td := ctx['tx'].get(tname)) and has_fields(td[CoreType]) and tname not in seen:
+        for fd in resolve_fields(ctx, td):
+            if fd[FieldOptions].get('dir'):
+                paths += [f'{fd[FieldName]}/{p}' for p in pointer_paths(ctx, fd[FieldType], seen + (tname,))]
+            else:
+                paths.append(fd[FieldName])
+    return paths
+
+
+def compile_choice(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Check:
+    ids = topts.get('id', False)
+    table = {}
+    for fd in fields:
+        cell = type_cell(ctx, f'{tname}.{fd[FieldName]}', fd[FieldType], fd[FieldOptions])
+        table[fd[FieldName]] = (fd[FieldName], cell)
+        table.update({fd[FieldID]: (fd[FieldID], cell), str(fd[FieldID]): (fd[FieldID], cell)} if ids else {})
+
+    if combine := topts.get('combine'):
+        combine = COMBINE.get(combine, combine)
+        cells = [c for n, c in table.values() if isinstance(n, str)]
+
+        def check_combine(v: Any) -> Errors:
+            ok = [not c[0](v) for c in cells]
+            if (combine == 'anyOf' and any(ok)) or (combine == 'allOf' and all(ok)) or \
+                    (combine == 'oneOf' and sum(ok) == 1) or (combine == 'diff' and ok[0] and not any(ok[1:])):
+                return VALID
+            return [('', f'{tname}: value does not match {combine} of {len(cells)} types')]
+        return check_combine
+
+    def check(v: Any) -> Errors:
+        if not isinstance(v, dict) or len(v) != 1:
+            return [('', f'{tname}: Choice must be an object with one property')]
+        k, x = next(iter(v.items()))
+        if (c := table.get(k)) is None:
+            return [(pointer(k), f'{tname}: "{k}" is not a valid choice')]
+        return prefix(k, e) if (e := c[1][0](x)) else VALID
+    return check
+
+
+def compile_array(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Check:
+    cells = [field_cell(ctx, tname, fd) for fd in fields]
+    checks = [c for c, lo in cells]
+    nreq = max([n for n, (c, lo) in enumerate(cells, start=1) if lo > 0], default=0)  # Trailing fields optional
+    nmax = len(cells)
+
+    def check(v: Any) -> Errors:
+        if not isinstance(v, list):
+            return [('', f'{tname}: {type(v).__name__} is not an array')]
+        if not nreq <= len(v) <= nmax:
+            return [('', f'{tname}: {len(v)} items, expected {nreq}..{nmax}')]
+        errs = []
+        for n, (c, x) in enumerate(zip(checks, v)):
+            if e := c[0](x):
+                errs += prefix(n, e)
+        return errs
+    return check
+
+
+def compile_arrayof(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Check:
+    lo = topts.get('minLength', 0)
+    hi = size_limit(topts.get('maxLength', MAX_DEFAULT), ctx['config'].max_elements)
+    cell = type_cell(ctx, f'{tname}[]', topts['valueType'], {})
+    unique = topts.get('unique', False) or topts.get('set', False)
+    bulk = compile_bulk(ctx, topts['valueType'])
+
+    def check(v: Any) -> Errors:
+        items = v
+        if not isinstance(v, list) and (bulk is None or (items := numeric_buffer(v)) is None):
+            return [('', f'{tname}: {type(v).__name__} is not an array')]
+        if not lo <= len(items) <= hi:
+            return [('', f'{tname}: {len(items)} items, expected {lo}..{hi}')]
+        if bulk is None or not bulk(v, items):     # Check items one by one to report errors
+            c = cell[0]
+            errs = []
+            for n, x in enumerate(items):
+                if e := c(x):
+                    errs += prefix(n, e)
+            if errs:
+                return errs
+        if unique and not is_unique(items):
+            return [('', f'{tname}: items are not unique')]
+        return VALID
+    return check
+
+
+BULK_OPTIONS = {'minInclusive', 'maxInclusive', 'minExclusive', 'maxExclusive', 'format'}
+BUFFER_INTEGERS = {     # Integer buffer item formats (array typecodes): (lo, hi)
+    f: (-2 ** (8 * n - 1), 2 ** (8 * n - 1) - 1) if f.islower() else (0, 2 ** (8 * n) - 1)
+    for f in 'bBhHiIlLqQ' for n in (struct.calcsize(f),)}
+BUFFER_FLOATS = {'e', 'f', 'd'}
+
+
+def numeric_buffer(v: Any) -> memoryview | None:
+    """
+    Return a one-dimensional numeric buffer, e.g., array.array or NumPy array, as a memoryview, or None
+    """
+    if isinstance(v, (bytes, bytearray)):  # Binary values, not arrays
+        return None
+    try:
+        m = memoryview(v)
+    except TypeError:
+        return None
+    return m if m.ndim == 1 and (m.format in BUFFER_INTEGERS or m.format in BUFFER_FLOATS) else None
+
+
+def bulk_type(ctx: dict, vtype: str) -> list | None:
+    """
+    Return the definition of an Integer or Number item type with only bounds and format options, whose ArrayOf
+    instances may be numeric buffers, or None
+    """
+    td = [vtype, vtype, {}] if is_builtin(vtype) else ctx['tx'].get(vtype)
+    if not td or td[CoreType] not in ('Integer', 'Number') or not set(td[TypeOptions]) <= BULK_OPTIONS:
+        return None
+    return td
+
+
+def compile_bulk(ctx: dict, vtype: str) -> Callable[[Any, list | memoryview], bool] | None:
+    """
+    Return a function that checks all ArrayOf items of an Integer or Number type at once, or None if the item
+    type has options other than bounds and format.  The function returns True if all items are valid,
+    False if items must be checked one by one to find errors.
+
+    Item types are checked with one pass over a list, or from the item format of a buffer.  Bounds are checked
+    from the minimum and maximum items, by NumPy if the instance is a NumPy array, and are skipped if every
+    value of a buffer's integer item format is in range, e.g., an array of "b" items for format i8.
+    """
+    if (td := bulk_type(ctx, vtype)) is None:
+        return None
+    ctype = td[CoreType]
+    lo, hi, xlo, xhi = number_range(ctype, td[TypeOptions])
+    types = {int} if ctype == 'Integer' else {int, float}
+
+    def bulk(v: Any, items: list | memoryview) -> bool:
+        if not items:
+            return True
+        floats = True
+        if isinstance(items, list):
+            if not (item_types := set(map(type, items))) <= types:     # Excludes bool and subclasses
+                return False
+            floats = float in item_types
+        elif items.format in BUFFER_INTEGERS:
+            ilo, ihi = BUFFER_INTEGERS[items.format]
+            if lo <= ilo and ihi <= hi and xlo != xlo and xhi != xhi:
+                return True
+            floats = False
+        elif ctype == 'Integer':
+            return False
+        if hasattr(v, 'dtype') and hasattr(v, 'min'):   # NumPy array, not imported here
+            mn, mx = v.min(), v.max()
+        else:
+            try:
+                if floats and (s := sum(items)) != s:   # NaN item, or infinities of both signs
+                    return False
+            except OverflowError:       # Integer too large for a float: check items one by one
+                return False
+            mn, mx = min(items), max(items)
+        return lo <= mn and mx <= hi and mn != xlo and mx != xhi
+    return bulk
+
+
+def is_unique(items: list) -> bool:
+    try:
+        return len(set(items)) == len(items)
+    except TypeError:       # Unhashable items: compare by value
+        seen = []
+        for x in items:
+            if x in seen:
+                return False
+            seen.append(x)
+        return True
+
+
+def compile_map(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Check:
+    """
+    Map and Record: property names are field names, or field ids if a Map has the "id" option
+    """
+    lo = topts.get('minLength', 0)
+    hi = size_limit(topts.get('maxLength', MAX_UNSPECIFIED), ctx['config'].max_elements)
+    table, required, tagged = field_checks(ctx, tname, ctype, topts, fields)
+
+    def check(v: Any) -> Errors:
+        if not isinstance(v, dict):
+            return [('', f'{tname}: {type(v).__name__} is not an object')]
+        if not lo <= len(v) <= hi:
+            return [('', f'{tname}: {len(v)} properties, expected {lo}..{hi}')]
+        errs = []
+        for k, x in v.items():
+            if (c := table.get(k)) is None:
+                errs.append((pointer(k), f'{tname}: unexpected property'))
+            elif e := c[0](x):
+                errs += prefix(k, e)
+        for k, k2 in required:
+            if k not in v and k2 not in v:
+                errs.append(('', f'{tname}: missing required property "{k}"'))
+        for k, t, alts in tagged:
+            if k in v:
+                if (c := alts.get(v.get(t))) is None:
+                    errs.append((pointer(k), f'{tname}: tag "{t}" does not select a type'))
+                elif e := c[0](v[k]):
+                    errs += prefix(k, e)
+        return errs
+    return check
+
+
+def field_checks(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> tuple[dict, list, list]:
+    """
+    Return the field tables of a Map or Record, also used to check fields one at a time (see codec/lazy.py):
+    ({key: [check]}, [(key, alternate key)] of required fields, [(key, tag key, {tag: [check]})] of tagged fields).
+    Keys are field names, or field ids if a Map has the "id" option.
+    """
+    ids = ctype == 'Map' and topts.get('id', False)
+    table = {}          # {key: [check]}
+    required = []       # [(key, alternate key)]
+    tagged = []         # [(key, tag key, {tag: [check]})]
+    keys = {fd[FieldID]: fd[FieldID] if ids else fd[FieldName] for fd in fields}
+    for fd in fields:
+        key = keys[fd[FieldID]]
+        if tag_id := fd[FieldOptions].get('tagId'):
+            ref = ctx['tx'].get(fd[FieldType])
+            alts = {}
+            for af in resolve_fields(ctx, ref) if ref else []:
+                c = type_cell(ctx, f'{tname}.{fd[FieldName]}', af[FieldType], af[FieldOptions])
+                alts.update({af[FieldName]: c, af[FieldID]: c})
+            tagged.append((key, keys.get(int(tag_id)), alts))
+            cell, fmin = [lambda v: VALID], fd[FieldOptions].get('minOccurs', 1)
+        else:
+            cell, fmin = field_cell(ctx, tname, fd)
+        table[key] = cell
+        table.update({str(key): cell} if ids else {})
+        required += [(key, str(key))] if fmin > 0 else []
+    return table, required, tagged
+
+
+def compile_mapof(ctx: dict, tname: str, ctype: str, topts: dict, fields: list) -> Check:
+    lo = topts.get('minLength', 0)
+    hi = size_limit(topts.get('maxLength', MAX_DEFAULT), ctx['config'].max_elements)
+    kcell = type_cell(ctx, f'{tname}{{key}}', topts['keyType'], {})
+    vcell = type_cell(ctx, f'{tname}{{value}}', topts['valueType'], {})
+
+    def check(v: Any) -> Errors:
+        if not isinstance(v, dict):
+            return [('', f'{tname}: {type(v).__name__} is not an object')]
+        if not lo <= len(v) <= hi:
+            return [('', f'{tname}: {len(v)} properties, expected {lo}..{hi}')]
+        kc, vc = kcell[0], vcell[0]
+        errs = []
+        for k, x in v.items():
+            if e := kc(k):
+                errs += prefix(k, [(p, f'key: {m}') for p, m in e])
+            if e := vc(x):
+                errs += prefix(k, e)
+        return errs
+    return check
+
+
+# ========================================================
+# Format and option tables
+# ========================================================
+
+COMBINE = {'1': 'allOf', '2': 'anyOf', '3': 'oneOf', '4': 'diff'}   # Combine option ids
+
+FORMAT_RANGE = {    # Sized numeric formats: n bits -> (lo, hi)
+    'i': lambda n: (-2 ** (n - 1), 2 ** (n - 1) - 1),
+    'u': lambda n: (0, 2 ** n - 1),
+    'f': lambda n: {16: (-65504.0, 65504.0), 32: (-3.4028234663852886e38, 3.4028234663852886e38)}.get(
+        n, (-math.inf, math.inf)),
+}
+FORMAT_RANGE_TYPE = {'i': 'Integer', 'u': 'Integer', 'f': 'Number'}
+SIZED_FORMAT = re.compile(r'^([iuf])(\d+)$')
+
+BINARY_SIZES = {    # Binary formats with fixed sizes in octets
+    'eui': {6, 8},
+    'uuid': {16},
+    'ipv4-addr': {4},
+    'ipv6-addr': {16},
+}
+
+def b64_encode(v: bytes | bytearray | memoryview) -> str:
+    return base64.urlsafe_b64encode(v).rstrip(b'=').decode('ascii')
+
+
+def b64_decode(s: str) -> bytes:
+    return base64.b64decode(s + '=' * (-len(s) % 4), altchars=b'-_', validate=True)
+
+
+BINARY_TEXT = {     # Binary format: (encode, decode) text representation, see definitions.FORMAT_SERIALIZE
+    'b64': (b64_encode, b64_decode),
+    'x': (lambda v: v.hex(), bytes.fromhex),
+    'X': (lambda v: v.hex().upper(), bytes.fromhex),
+    'eui': (lambda v: v.hex(':'), lambda s: bytes.fromhex(s.replace(':', '').replace('-', ''))),
+    'uuid': (lambda v: str(uuid.UUID(bytes=bytes(v))), lambda s: uuid.UUID(s).bytes),
+    'ipv4-addr': (lambda v: str(ipaddress.IPv4Address(bytes(v))), lambda s: ipaddress.IPv4Address(s).packed),
+    'ipv6-addr': (lambda v: str(ipaddress.IPv6Address(bytes(v))), lambda s: ipaddress.IPv6Address(s).packed),
+}
+TEXT_SIZE = {       # Binary format: upper bound of the decoded size of text; other formats have fixed sizes
+    'b64': lambda s: len(s.rstrip('=')) * 3 // 4,
+    'x': lambda s: len(s) // 2,
+    'X': lambda s: len(s) // 2,
+}
+
+
+def _valid(parse: Callable[[str], Any]) -> Callable[[str], bool]:
+    def check(v: str) -> bool:
+        try:
+            parse(v)
+            return True
+        except ValueError:
+            return False
+    return check
+
+
+def _regex(v: str) -> bool:
+    try:
+        re.compile(v)
+        return True
+    except re.error:
+        return False
+
+
+FORMAT_CHECKS = {   # String formats with semantic validation
+    'date-time': _valid(datetime.fromisoformat),
+    'date': _valid(date.fromisoformat),
+    'time': _valid(time.fromisoformat),
+    'ipv4': _valid(ipaddress.IPv4Address),
+    'ipv6': _valid(ipaddress.IPv6Address),
+    'regex': _regex,
+    'json-pointer': re.compile(r'^(/([^~/]|~[01])*)*$').match,
+}
@@ -0,0 +1,258 @@
+import json
+import pytest
+from array import array
+from pathlib import Path
+from jadn.codec import cbor
+from jadn.codec.lazy import LazyMap
+from jadn.convert import JADN, JIDL
+from test_convert_rt import abs_dir, JADN_SCHEMA_DIR
+
+SCHEMA = '''
+       package: "http://example.com/codec"
+
+Message = Record
+   1 id               Integer
+   2 name             String optional
+   3 color            Color
+   4 data             Binary optional
+   5 tags             String [0..*]
+   6 target           Target optional
+
+Color = Enumerated
+   1 red
+   2 green
+
+Target = Choice
+   1 file             File
+   2 hash             Binary /x
+
+File = Map
+   1 path             String
+   2 size             Integer optional
+
+Counts = MapOf(Color, Integer){1..*}
+
+Octets = ArrayOf(Octet)
+
+Octet = Integer /u8
+
+Reading = Record
+   1 level            Integer /u8
+   2 value            Number /f16
+
+Envelope = Record
+   1 message          Message
+   2 counts           Counts optional
+'''
+
+MESSAGE = {'id': 7, 'color': 'green', 'data': b'\x01\x02', 'tags': ['a', 'b'], 'target': {'file': {'path': '/x'}}}
+
+
+@pytest.fixture(scope='module')
+def pkg() -> JIDL:
+    pkg = JIDL()
+    pkg.schema_loads(SCHEMA)
+    return pkg
+
+
+@pytest.mark.parametrize('style, data', [
+    ('verbose', {'id': 7, 'color': 'green', 'data': 'AQI', 'tags': ['a', 'b'], 'target': {'file': {'path': '/x'}}}),
+    ('compact', [7, None, 'green', 'AQI', ['a', 'b'], {'file': {'path': '/x'}}]),
+    ('concise', [7, None, 2, 'AQI', ['a', 'b'], {'1': {'1': '/x'}}]),
+])
+def test_styles(pkg: JIDL, style: str, data):
+    assert json.loads(json.dumps(pkg.instance_encode(MESSAGE, 'Message', style))) == data
+    assert pkg.instance_decode(data, 'Message', style) == MESSAGE
+
+
+def test_plain_types(pkg: JIDL):
+    """
+    Values of types whose JSON value is the API value are returned as is
+    """
+    value = {'path': '/x', 'size': 3}
+    assert pkg.instance_encode(value, 'File', 'compact') is value
+    assert pkg.instance_decode(value, 'File', 'verbose') is value
+    assert pkg.instance_encode(value, 'File', 'concise') == {1: '/x', 2: 3}
+
+
+def test_formats(pkg: JIDL):
+    """
+    Binary format selects the text representation, MapOf with non-string keys is an array
+    """
+    assert pkg.instance_encode({'hash': b'\xab\xcd'}, 'Target') == {'hash': 'abcd'}
+    assert pkg.instance_decode({'2': 'ABCD'}, 'Target', 'concise') == {'hash': b'\xab\xcd'}
+    assert pkg.instance_encode({'red': 1, 'green': 2}, 'Counts', 'verbose') == {'red': 1, 'green': 2}
+    assert pkg.instance_encode({'red': 1, 'green': 2}, 'Counts', 'concise') == [1, 1, 2, 2]
+    assert pkg.instance_decode([1, 1, 2, 2], 'Counts', 'concise') == {'red': 1, 'green': 2}
+
+
+@pytest.mark.parametrize('type_name, data, style', [
+    ('Message', {'id': 1, 'colour': 'red'}, 'verbose'),
+    ('Message', [1, None, 'red', None, None, None, 3], 'compact'),
+    ('Color', 3, 'concise'),
+    ('Target', {'file': {}, 'hash': ''}, 'verbose'),
+    ('Target', {'hash': 'xyz'}, 'verbose'),
+    ('Counts', [1, 1, 2], 'concise'),
+])
+def test_decode_errors(pkg: JIDL, type_name: str, data, style: str):
+    with pytest.raises(ValueError, match=type_name):
+        pkg.instance_decode(data, type_name, style)
+
+
+def test_unknown_style(pkg: JIDL):
+    with pytest.raises(ValueError, match='style'):
+        pkg.instance_codec('Message', 'terse')
+
+
+@pytest.mark.parametrize('in_path', Path(abs_dir(JADN_SCHEMA_DIR)).glob('*'), ids=lambda p: p.name)
+def test_compile_codec(in_path: Path):
+    """
+    Every type definition in the bundled schemas compiles to a codec in every style
+    """
+    pkg = JADN()
+    with open(in_path, encoding='utf8') as fp:
+        pkg.schema_load(fp)
+    for style in ('verbose', 'compact', 'concise'):
+        pkg.instance_codec(pkg.schema['types'][0][0], style)
+        assert set(pkg.codecs[(style, 'json')]) == {td[0] for td in pkg.schema['types']}
+
+
+def test_tagged_field():
+    """
+    Type of field "fields" is selected by the value of tagId field "enum"
+    """
+    pkg = JADN()
+    with open(abs_dir('schemas/jadn/jadn-types.jadn'), encoding='utf8') as fp:
+        pkg.schema_load(fp)
+    value = {'vtype': [], 'ktype': {}, 'enum': 'def', 'id': 8, 'pointers': 'abc', 'length': 'abcd',
+             'list': ['x'], 'regex': '/abc', 'fields': 15.0}
+    for style in ('verbose', 'compact', 'concise'):
+        data = json.loads(json.dumps(pkg.instance_encode(value, 'Options', style)))
+        assert pkg.instance_decode(data, 'Options', style) == value
+
+
+@pytest.mark.parametrize('value, data', [
+    (0, '00'), (23, '17'), (24, '1818'), (1000, '1903e8'), (1000000, '1a000f4240'),
+    (1000000000000, '1b000000e8d4a51000'), (-1, '20'), (-1000, '3903e7'), (1.1, 'fb3ff199999999999a'),
+    (cbor.Float16(1.5), 'f93e00'), (cbor.Float32(100000.0), 'fa47c35000'), (True, 'f5'), (None, 'f6'),
+    (b'\x01\x02\x03\x04', '4401020304'), ('IETF', '6449455446'), ([1, [2, 3]], '8201820203'), ({'a': 1}, 'a1616101'),
+])
+def test_cbor_items(value, data: str):
+    """
+    Examples from RFC 8949 Appendix A
+    """
+    assert cbor.dumps(value).hex() == data
+    assert cbor.loads(bytes.fromhex(data)) == value
+
+
+@pytest.mark.parametrize('data', ['', '19', '6449', '0000', 'c074', '9f01ff'])
+def test_cbor_errors(data: str):
+    with pytest.raises(ValueError, match='CBOR'):
+        cbor.loads(bytes.fromhex(data))
+
+
+def test_cbor_depth(pkg: JIDL):
+    deep = b'\x81' * 100000 + b'\x00'
+    assert cbor.loads(b'\x81' * cbor.MAX_DEPTH + b'\x00') is not None
+    with pytest.raises(ValueError, match='nested'):
+        cbor.loads(deep)
+    reading = pkg.instance_loads(b'\xa2\x65level\x01\x65value' + deep, 'Reading', data_format='cbor', lazy=True)
+    assert reading['level'] == 1
+    with pytest.raises(ValueError, match='nested'):
+        reading['value']
+
+
+def test_cbor_styles(pkg: JIDL):
+    """
+    Concise CBOR Records and Maps have integer keys and Binary values are byte strings
+    """
+    data = {1: 7, 3: 2, 4: b'\x01\x02', 5: ['a', 'b'], 6: {1: {1: '/x'}}}
+    assert pkg.instance_encode(MESSAGE, 'Message', 'concise', 'cbor') == data
+    for style in ('verbose', 'compact', 'concise'):
+        encode, decode = pkg.instance_codec('Message', style, 'cbor')
+        value = cbor.dumps(encode(MESSAGE))
+        assert decode(cbor.loads(value)) == MESSAGE
+        assert len(value) < len(json.dumps(pkg.instance_encode(MESSAGE, 'Message', style), separators=(',', ':')))
+    assert pkg.instance_encode({'red': 1}, 'Counts', 'concise', 'cbor') == {1: 1}
+
+
+def test_cbor_formats(pkg: JIDL):
+    """
+    Sized Integer formats are range checked and f16 Numbers are written at half precision
+    """
+    value = cbor.dumps(pkg.instance_encode({'level': 255, 'value': 1.5}, 'Reading', 'verbose', 'cbor'))
+    assert value.hex() == 'a2656c6576656c18ff6576616c7565f93e00'
+    assert pkg.instance_decode(cbor.loads(value), 'Reading', 'verbose', 'cbor') == {'level': 255, 'value': 1.5}
+    with pytest.raises(ValueError, match='u8'):
+        pkg.instance_encode({'level': 256, 'value': 1.5}, 'Reading', 'verbose', 'cbor')
+    with pytest.raises(ValueError, match='Float16'):
+        cbor.dumps(pkg.instance_encode({'level': 1, 'value': 1e6}, 'Reading', 'verbose', 'cbor'))
+
+
+def test_binary_buffers(pkg: JIDL):
+    """
+    Binary values may be any bytes-like buffer and are not copied by CBOR codecs
+    """
+    encode, decode = pkg.instance_codec('Message', 'concise', 'cbor')
+    for data in (bytearray(b'\x01\x02'), memoryview(b'\x00\x01\x02')[1:]):
+        assert pkg.instance_encode(MESSAGE | {'data': data}, 'Message', 'compact')[3] == 'AQI'
+        assert encode(MESSAGE | {'data': data})[4] is data
+        assert cbor.dumps(encode(MESSAGE | {'data': data})) == cbor.dumps(encode(MESSAGE))
+    buf = cbor.dumps(encode(MESSAGE))
+    value = decode(cbor.loads(memoryview(buf)))
+    assert isinstance(value['data'], memoryview) and value['data'].obj is buf
+    assert value == MESSAGE and pkg.instance_validate(value, 'Message') == []
+    assert pkg.instance_validate(MESSAGE | {'data': memoryview(bytes(256))}, 'Message')[0][0] == '/data'
+    errors = pkg.instance_validate(MESSAGE | {'data': '!' * 400}, 'Message')    # Too long, checked before decoding
+    assert errors == [('/data', 'Message.data: length 300 is not in range 0..255')]
+
+
+@pytest.mark.parametrize('data_format', ['json', 'cbor'])
+@pytest.mark.parametrize('style', ['verbose', 'compact', 'concise'])
+def test_lazy_decode(pkg: JIDL, style: str, data_format: str):
+    """
+    Fields are decoded when accessed, and fields of Record, Map and MapOf types are also lazy
+    """
+    value = {'message': MESSAGE, 'counts': {'red': 1}}
+    data = pkg.instance_encode(value, 'Envelope', style, data_format)
+    data = memoryview(cbor.dumps(data)) if data_format == 'cbor' else json.dumps(data)
+    envelope = pkg.instance_loads(data, 'Envelope', style, data_format, lazy=True)
+    message = envelope['message']
+    assert isinstance(message, LazyMap) and message['color'] == 'green' and list(message.values) == ['color']
+    assert 'name' not in message and envelope['counts']['red'] == 1
+    assert message == MESSAGE and envelope.validate() == []
+    assert pkg.instance_loads(data, 'Envelope', style, data_format) == value
+    if data_format == 'cbor':
+        assert message['data'].obj is data.obj
+
+
+def test_lazy_errors(pkg: JIDL):
+    """
+    Invalid fields raise when accessed, constraints on the whole instance are checked by validate
+    """
+    reading = pkg.instance_loads('{"level": 300, "value": 1.5}', 'Reading', lazy=True)
+    assert reading['value'] == 1.5
+    with pytest.raises(ValueError, match='/level: Reading.level: 300'):
+        reading['level']
+    assert reading.validate()[0][0] == '/level'
+    reading = pkg.instance_loads(cbor.dumps({'value': 1.5}), 'Reading', data_format='cbor', lazy=True)
+    assert reading['value'] == 1.5 and reading.get('level') is None
+    assert reading.validate() == [('', 'Reading: missing required property "level"')]
+    data = cbor.dumps({'level': 1, 'value': 1.5})[:-1]
+    with pytest.raises(ValueError, match='truncated'):
+        pkg.instance_loads(data, 'Reading', data_format='cbor', lazy=True)['level']
+    assert pkg.instance_loads('"red"', 'Color', lazy=True) == 'red'     # Other types are decoded when loaded
+
+
+@pytest.mark.parametrize('data_format', ['json', 'cbor'])
+def test_numeric_buffers(pkg: JIDL, data_format: str):
+    """
+    ArrayOf Integer values may be numeric buffers, which are encoded as lists
+    """
+    value = array('B', [1, 2, 255])
+    assert pkg.instance_validate(value, 'Octets') == []
+    data = pkg.instance_encode(value, 'Octets', 'verbose', data_format)
+    data = cbor.loads(cbor.dumps(data)) if data_format == 'cbor' else json.loads(json.dumps(data))
+    assert pkg.instance_decode(data, 'Octets', 'verbose', data_format) == [1, 2, 255]
+    with pytest.raises(ValueError, match='Octets: bytes is not an array'):
+        pkg.instance_encode(b'ab', 'Octets', 'verbose', data_format)
@@ -1,6 +1,7 @@
 import os
 import pytest
 from pathlib import Path
+from jadn.convert import JIDL
 from test_convert_rt import abs_dir, schema_convert, JADN_SCHEMA_CLASS
 
 ABSTRACT_SCHEMA_DIR = 'schemas/abstract'
@@ -15,3 +16,36 @@ def test_abstract_schema_convert(session_data, in_path, out_format):
     # Ignore files in display formats
     if os.path.splitext(os.path.split(in_path)[1])[1].lstrip('.') not in {'ert', 'atree'}:
         schema_convert(JADN_SCHEMA_CLASS, in_path, out_format)
+
+
+JIDL_DOC = '''
+     package: "http://example.com/test"
+
+Person = Record                  // A person
+   // Identity fields
+   1 name         String{1..*}
+   2 tag          Tag optional
+
+Tag = String{pattern="^[a-z]+$"} // lower case
+'''
+
+
+def test_jidl_load():
+    pkg = JIDL()
+    pkg.schema_loads(JIDL_DOC)
+    assert pkg.schema['meta'] == {'package': 'http://example.com/test'}
+    assert [td[0] for td in pkg.schema['types']] == ['Person', 'Tag']
+    assert [fd[1] for fd in pkg.schema['types'][0][4]] == ['name', 'tag']
+    assert pkg.schema['types'][1][2] == {'pattern': '^[a-z]+$'}
+
+
+@pytest.mark.parametrize('doc, position', [
+    ('   1 name String\n', 'line 1, column 4'),                                   # Field before any type
+    ('Person = Record\n   1 name String{1..x}\n', 'line 2, column 5'),           # Bad field option
+    ('Person = Record\n\nName = String bogus\n', 'line 3, column 8'),             # Bad type option
+    ('Person = Record\n   1 name String\n  ??\n', 'line 3, column 3'),           # Not a JIDL line
+    ('Person = Record\n   1 a  (\n', 'line 2, column 5'),                         # Missing field type
+])
+def test_jidl_load_error(doc, position):
+    with pytest.raises(ValueError, match=position):
+        JIDL().schema_loads(doc)
@@ -1,3 +1,4 @@
+import io
 import os
 import pytest
 from jadn.core import JADNCore
@@ -49,7 +50,9 @@ def schema_convert(schema_classes: dict, in_path: Path, out_format: str) -> ((st
     out_pkg = sclasses[out_format](in_pkg)
     style = style_args(out_pkg,'', str(abs_dir(CONFIG_FILE)))
     with open(out_path, 'w', encoding='utf8') as fp:
-        schema_msg = out_pkg.schema_dump(fp, style)
+        out_pkg.schema_dump(fp, style)
+    with open(out_path, 'r', encoding='utf8') as fp:
+        schema_msg = fp.read()
     return schema_msg, in_pkg
 
 
@@ -71,3 +74,20 @@ def test_jadn_schema_convert(session_data: dict, in_path: str, out_format: str,
         else:
             check_pkg.schema_loads(schema_msg)  # Verify lossless conversion to and from test format
             assert check_pkg.schema == in_pkg.schema
+
+
+@pytest.mark.parametrize('out_format', ['jadn', 'jidl', 'md'])
+@pytest.mark.parametrize('in_path', Path(abs_dir(JADN_SCHEMA_DIR)).glob('*.jadn'), ids=lambda p: p.name)
+def test_iter_dumps(in_path: Path, out_format: str):
+    """
+    Streamed output is the same as the serialized string
+    """
+    in_pkg = JADN()
+    with open(in_path, 'r', encoding='utf8') as fp:
+        in_pkg.schema_load(fp)
+    out_pkg = JADN_SCHEMA_CLASS[out_format](in_pkg)
+    chunks = list(out_pkg.iter_dumps({}))
+    assert len(chunks) > len(in_pkg.schema['types'])
+    fp = io.StringIO()
+    out_pkg.schema_dump(fp, {})
+    assert ''.join(chunks) == fp.getvalue() == out_pkg.schema_dumps({})
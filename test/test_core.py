@@ -0,0 +1,108 @@
+import pytest
+from jadn.core import JADNCore, META_TABLES, meta_cache_file, load_meta_cache, save_meta_cache
+
+
+@pytest.fixture
+def meta_tables():
+    JADNCore()
+    tables = {k: getattr(JADNCore, k) for k in META_TABLES}
+    yield tables
+    for k, v in tables.items():     # Restore tables built from metaschema
+        setattr(JADNCore, k, v)
+
+
+def test_meta_cache_roundtrip(tmp_path, monkeypatch, meta_tables):
+    """
+    Class tables loaded from a metaschema snapshot are identical to tables built from the metaschema
+    """
+    monkeypatch.setenv('JADN_CACHE_DIR', str(tmp_path))
+    cache_file = meta_cache_file(b'metaschema')
+    assert not load_meta_cache(cache_file)
+    save_meta_cache(cache_file)
+    for k in META_TABLES:
+        setattr(JADNCore, k, None)
+    assert load_meta_cache(cache_file)
+    assert {k: getattr(JADNCore, k) for k in META_TABLES} == meta_tables
+    assert meta_cache_file(b'metaschema') != meta_cache_file(b'changed metaschema')
+
+
+def test_meta_cache_disabled(monkeypatch):
+    monkeypatch.setenv('JADN_CACHE_DIR', '')
+    assert meta_cache_file(b'metaschema') == ''
+    assert not load_meta_cache('')
+
+
+def test_schema_config():
+    """
+    Config is built once when a schema is loaded and used by schema and instance validation
+    """
+    from jadn.convert import JIDL
+    pkg = JIDL()
+    pkg.schema_loads('       package: "http://example.com/config"\n'
+                     '        config: {"$MaxString": 8, "$FieldName": "^[a-z]+$"}\n\n'
+                     'Name = String\n'
+                     'Person = Record\n'
+                     '   1 name         Name\n')
+    config = pkg.config
+    assert config.max_string == 8 and isinstance(config.max_string, int)
+    assert config.max_binary == 255
+    assert config.field_name.match('name') and not config.field_name.match('first_name')
+    assert config.type_ref.match('ns:Name') and not config.type_ref.match(':Name')
+    assert config.patterns['$TypeName'] is config.type_name
+    assert pkg.instance_validate({'name': 'x' * 9}, 'Person')
+    pkg.schema_validate()
+    pkg.schema['types'][1][4][0][1] = 'first_name'
+    with pytest.raises(ValueError, match='does not match \\$FieldName'):
+        pkg.schema_validate()
+
+
+def test_build_deps_copy():
+    """
+    Dependency lists returned by build_deps are copies, not the schema index's lists, and reflect schema edits
+    """
+    from jadn.convert import JIDL
+    from jadn.core import build_deps
+    pkg = JIDL()
+    pkg.schema_loads('       package: "http://example.com/deps"\n\n'
+                     'Person = Record\n'
+                     '   1 name         Name\n'
+                     'Name = String\n')
+    deps = build_deps(pkg)
+    deps['Person'].clear()
+    assert build_deps(pkg)['Person'] and pkg.schema_index().refs['Person']
+    pkg.schema['types'].append(['Label', 'String', {}, '', []])
+    assert 'Label' in build_deps(pkg) and 'Label' in pkg.schema_index().types
+    pkg.schema['types'][0][4][0][2] = 'Label'      # Field type changed in place
+    assert build_deps(pkg)['Person'] == [('Label', 'C')]
+
+
+def test_schema_config_invalid():
+    """
+    Config values that are not valid are replaced by defaults when loading and reported by schema_validate
+    """
+    from jadn.convert import JIDL
+    pkg = JIDL()
+    pkg.schema_loads('       package: "http://example.com/config"\n'
+                     '        config: {"$MaxString": "abc", "$FieldName": "^[a-z"}\n\n'
+                     'Name = String\n')
+    assert pkg.config.max_string == 255 and pkg.config.field_name.match('name')
+    assert pkg.instance_validate('x', 'Name') == []
+    with pytest.raises(ValueError) as e:
+        pkg.schema_validate()
+    assert '$FieldName value \'^[a-z\' is not a valid pattern' in str(e.value)
+    assert '$MaxString value \'abc\' is not Integer' in str(e.value)
+
+
+def test_compile():
+    """
+    compile builds checks, and codecs of a serialization style, including for a schema with no types
+    """
+    from jadn.codec.lazy import LazyDecoder
+    from jadn.convert import JIDL
+    pkg = JIDL()
+    pkg.schema_loads('       package: "http://example.com/empty"\n')
+    pkg.compile('concise', 'cbor')
+    assert pkg.run_schema == {} and pkg.codecs == {('concise', 'cbor'): {}}
+    assert LazyDecoder(pkg).contexts()[1]['cells'] == {}
+    with pytest.raises(ValueError, match='not defined'):
+        pkg.instance_validate(None, 'Name')
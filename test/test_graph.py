@@ -0,0 +1,49 @@
+import pytest
+from jadn.graph import roots, topo_sort, sccs, cycles, subtree
+
+DEPS = {
+    'asciitree': ['sometimes', 'just', 'trees', 'in'],
+    'sometimes': ['you'],
+    'just': ['want'],
+    'want': ['to', 'draw'],
+    'in': ['your'],
+    'your': ['terminal'],
+}
+
+
+def test_topo_sort():
+    assert roots(DEPS) == ['asciitree']
+    assert topo_sort(DEPS, ['asciitree']) == [
+        'asciitree', 'sometimes', 'you', 'just', 'want', 'to', 'draw', 'trees', 'in', 'your', 'terminal']
+    assert topo_sort({'a': ['b'], 'b': ['a']}, []) == ['a', 'b']     # No roots: unsorted
+
+
+def test_subtree():
+    deps = DEPS | {'just': ['sometimes', 'want']}
+    tree = subtree(deps, 'asciitree')
+    assert tree['just'] == {'sometimes': {'you': {}}, 'want': {'to': {}, 'draw': {}}}
+    assert tree['just']['sometimes'] is tree['sometimes']   # Shared subtree
+    with pytest.raises(ValueError, match='draw->just'):
+        subtree(deps | {'draw': ['just']}, 'asciitree')
+
+
+def test_cycles():
+    deps = {'a': ['b'], 'b': ['c', 'd'], 'c': ['a'], 'd': ['d', 'e'], 'e': []}
+    assert sccs(deps) == [['e'], ['d'], ['a', 'b', 'c']]
+    assert cycles(deps) == [['d'], ['a', 'b', 'c']]
+    assert cycles(DEPS) == []
+
+
+def test_deep_graph():
+    """
+    Depth is not limited by the recursion limit
+    """
+    n = 100000
+    deps = {f'T{k}': [f'T{k + 1}'] for k in range(n)}
+    assert roots(deps) == ['T0']
+    assert topo_sort(deps, ['T0']) == [f'T{k}' for k in range(n + 1)]
+    assert len(sccs(deps)) == n + 1
+    tree = subtree(deps, 'T0')
+    for k in range(1, n + 1):
+        tree = tree[f'T{k}']
+    assert tree == {}
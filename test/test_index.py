@@ -0,0 +1,65 @@
+import json
+from jadn.convert import JADN
+from jadn.index import SchemaIndex
+
+SCHEMA = {
+    'types': [
+        ['Person', 'Record', [], '', [
+            [1, 'name', 'String', [], ''],
+            [2, 'pets', 'Pet', ['[0', ']-1'], ''],
+            [3, 'home', 'Place', ['L'], '']]],
+        ['Pet', 'Choice', [], '', [[1, 'dog', 'Dog', [], ''], [2, 'cat', 'String', [], '']]],
+        ['Dog', 'Enumerated', [], '', [[1, 'collie', ''], [2, 'poodle', '']]],
+        ['Place', 'ArrayOf', ['*Person'], '', []],
+    ]
+}
+
+
+def load() -> JADN:
+    pkg = JADN()
+    pkg.schema_loads(json.dumps(SCHEMA))
+    return pkg
+
+
+def tables(idx: SchemaIndex) -> tuple:
+    return idx.types, idx.position, idx.field_ids, idx.field_names, idx.refs, \
+        {k: list(v) for k, v in idx.referrers.items() if v}
+
+
+def test_index_lookup():
+    pkg = load()
+    idx = pkg.schema_index()
+    assert idx is pkg.index
+    assert idx.types['Pet'] is pkg.schema['types'][1]
+    assert idx.position['Place'] == 3
+    assert idx.field_ids['Person'][2][1] == 'pets'
+    assert idx.field_names['Dog']['poodle'][0] == 2
+    assert idx.refs['Person'] == [('Pet', 'C'), ('Place', 'L')]
+    assert idx.used_by('Person') == ['Place']
+    assert idx.used_by('Dog') == ['Pet']
+    assert idx.used_by('Unknown') == []
+
+
+def test_index_edits():
+    """
+    Tables after edits are the same as tables built from the edited schema
+    """
+    pkg = load()
+    idx = pkg.schema_index()
+    idx.set_type(['Cat', 'Record', {}, '', [[1, 'owner', 'Person', {}, '']]])
+    idx.set_type(['Pet', 'Choice', {}, '', [[1, 'dog', 'Dog', {}, ''], [2, 'cat', 'Cat', {}, '']]])
+    idx.del_type('Dog')
+    idx.types['Place'][2]['valueType'] = 'Pet'
+    idx.update_type('Place')
+    assert [td[0] for td in pkg.schema['types']] == ['Person', 'Pet', 'Place', 'Cat']
+    assert idx.used_by('Person') == ['Cat']
+    assert idx.used_by('Pet') == ['Person', 'Place']
+    assert tables(idx) == tables(SchemaIndex(pkg.schema['types'], pkg.REF_OPTS))
+
+
+def test_index_rebuild():
+    pkg = load()
+    idx = pkg.schema_index()
+    pkg.schema = {'types': pkg.schema['types'][1:]}
+    assert pkg.schema_index() is not idx
+    assert 'Person' not in pkg.schema_index().types
@@ -0,0 +1,39 @@
+import pytest
+from pathlib import Path
+from jadn.convert import JADN
+from jadn.model import TypeDef, FieldDef, EMPTY_OPTIONS, types_from_lists, types_to_lists
+from test_convert_rt import abs_dir, JADN_SCHEMA_DIR
+
+
+@pytest.mark.parametrize('in_path', Path(abs_dir(JADN_SCHEMA_DIR)).glob('*.jadn'), ids=lambda p: p.name)
+def test_model_roundtrip(in_path: Path):
+    pkg = JADN()
+    with open(in_path, 'r', encoding='utf8') as fp:
+        pkg.schema_load(fp)
+    types = types_from_lists(pkg.schema['types'])
+    assert types_to_lists(types) == pkg.schema['types']
+
+
+def test_model_sharing():
+    """
+    Names are interned and definitions without options share one read-only mapping
+    """
+    types = types_from_lists([
+        ['Person', 'Record', {}, '', [
+            [1, ''.join(['na', 'me']), 'String', {}, ''],
+            [2, 'age', 'Integer', {'minOccurs': 0}, '']]],
+        ['Pet', 'Record', {}, '', [[1, ''.join(['na', 'me']), 'String', {}, '']]],
+    ])
+    person, pet = types
+    assert isinstance(person.fields[0], FieldDef)
+    assert person.fields[0].name is pet.fields[0].name
+    assert person.options is pet.fields[0].options is EMPTY_OPTIONS
+    assert person.fields[1].options == {'minOccurs': 0}
+    with pytest.raises(TypeError):
+        person.options['abstract'] = True
+    with pytest.raises(AttributeError):
+        person.extra = 1
+    lists = types_to_lists(types)
+    lists[0][2]['abstract'] = True     # List form has mutable options
+    assert person.options is EMPTY_OPTIONS and not EMPTY_OPTIONS
+    assert TypeDef.from_list(lists[1]) == pet
@@ -1,6 +1,9 @@
+import json
 import pytest
 from pathlib import Path
+from jadn.definitions import TypeName
 from jadn.translate import JSCHEMA, PROTO, XSD
+from jadn.translate.jschema_rw import prune_types
 from test_convert_rt import abs_dir, schema_convert
 
 CONCRETE_SCHEMA_DIR = 'schemas/concrete'
@@ -20,3 +23,23 @@ def test_jadn_schema_translate_in(session_data: dict, in_path: Path, out_format:
     Convert native JADN schema to equivalent alternate JADN format
     """
     schema_convert(CONCRETE_SCHEMA_CLASS, in_path, out_format)
+
+
+def test_jschema_prune_duplicate_types():
+    """
+    Anonymous types generated identically from several definitions are defined once, in first-seen order
+    """
+    item = {'type': 'object', 'properties': {'x': {'type': 'string'}}}
+    jss = {'$defs': {f'T{n}': {'type': 'object', 'properties': {'a': {'type': 'array', 'items': item}}}
+                     for n in range(3)}}
+    pkg = JSCHEMA()
+    pkg.schema_loads(json.dumps(jss))
+    assert [td[TypeName] for td in pkg.schema['types']] == ['T0', 'A', 'A-item', 'T1', 'T2']
+
+
+def test_prune_types():
+    t1 = ['A', 'Record', {'minv': 1, 'maxv': 2}, '', [[1, 'x', 'String', {'minOccurs': 0}, '']]]
+    t2 = ['A', 'Record', {'maxv': 2, 'minv': 1}, '', [[1, 'x', 'String', {'minOccurs': 0}, '']]]  # Same options
+    t3 = ['A', 'Record', {'maxv': 2, 'minv': 1}, '', [[1, 'x', 'String', {}, '']]]
+    t4 = ['A', 'Array', {}, '', [[1, 'x', 'String', {}, '']]]
+    assert prune_types([t1, t2, t3, t1, t4, t3]) == [t1, t3, t4]
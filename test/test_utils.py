@@ -0,0 +1,73 @@
+import pytest
+from jadn.convert import JADN, JIDL, MD
+from jadn.utils import canonicalize, jadn2typestr, jadn2fieldstr, typestr2jadn
+
+SCHEMA = '''{"meta": {"package": "http://example.com/test"}, "types": [
+  ["Person", "Record", [], "", [
+    [1, "name", "String", ["{1"], ""],
+    [2, "age", "Integer", ["[0"], ""]
+  ]]
+]}'''
+
+
+def test_str_cache():
+    """
+    Strings rendered for one format are reused by other formats, and edits to the schema are not masked
+    """
+    pkg = JADN()
+    pkg.schema_loads(SCHEMA)
+    jidl = JIDL(pkg).schema_dumps({})
+    assert pkg.str_cache
+    n = len(pkg.str_cache)
+    MD(pkg).schema_dumps({})
+    assert len(pkg.str_cache) == n
+
+    td = pkg.schema['types'][0]
+    assert jadn2fieldstr(pkg, td[4][0], td)[1] == 'String{1..*}'
+    td[4][0][3]['minLength'] = 2
+    assert jadn2fieldstr(pkg, td[4][0], td)[1] == 'String{2..*}'
+    assert jadn2typestr(pkg, 'String', {'maxLength': 5}) == 'String{0..5}'
+    assert JIDL(pkg).schema_dumps({}) != jidl
+
+    pkg.schema_loads(SCHEMA)
+    assert not pkg.str_cache
+
+
+@pytest.mark.parametrize('typestr, tname, topts', [
+    ('String', 'String', {}),
+    ('Integer{0..*}', 'Integer', {}),
+    ('String{pattern="^[a-z]{1,3}$"}{2..*}', 'String', {'pattern': '^[a-z]{1,3}$', 'minLength': 2}),
+    ('Integer=[0, 10) /i8 unique', 'Integer', {'minInclusive': '0', 'maxExclusive': ' 10', 'format': 'i8', 'unique': True}),
+    ('String=("abc")', 'String', {'default': 'abc'}),
+    ('Binary=("0x0102")', 'Binary', {'default': '"0x0102"'}),
+    ('Binary=["abc"]', 'Binary', {'const': '"abc"'}),
+    ('String{pattern="a\\"}b"}', 'String', {'pattern': 'a\\"}b'}),
+    ('ArrayOf(Item){1..*} unique', 'ArrayOf', {'valueType': 'Item', 'minLength': 1, 'unique': True}),
+    ('Record extends(Base) abstract', 'Record', {'extends': 'Base', 'abstract': True}),
+    ('Number ^E-2', 'Number', {'scale': '-2'}),
+])
+def test_typestr2jadn(typestr: str, tname: str, topts: dict):
+    assert typestr2jadn(JADN(), typestr) == (tname, topts, '')
+
+
+def test_typestr2jadn_error():
+    with pytest.raises(ValueError):
+        typestr2jadn(JADN(), 'String{1..*} bogus')
+
+
+def test_canonicalize():
+    """
+    Default options are removed without modifying the original, definitions without defaults are shared
+    """
+    pkg = JADN()
+    pkg.schema_loads(SCHEMA)
+    pkg.schema['types'] += [['Name', 'String', {'minLength': 0, 'maxLength': 32}, '', []]]
+    pkg.schema['types'][0][4][1][3].update({'maxOccurs': 1})
+    schema = canonicalize(pkg.schema)
+    assert schema['types'][1] == ['Name', 'String', {'maxLength': 32}, '', []]
+    assert pkg.schema['types'][1][2] == {'minLength': 0, 'maxLength': 32}
+    person, cperson = pkg.schema['types'][0], schema['types'][0]
+    assert cperson[4][1] == [2, 'age', 'Integer', {'minOccurs': 0}, '']
+    assert person[4][1][3] == {'minOccurs': 0, 'maxOccurs': 1}
+    assert cperson[4][0] is person[4][0]
+    assert canonicalize(schema)['types'][0] is cperson
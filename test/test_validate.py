@@ -0,0 +1,158 @@
+import io
+import json
+import math
+import pytest
+from array import array
+from pathlib import Path
+from jadn.convert import JADN
+from test_convert_rt import abs_dir, JADN_SCHEMA_DIR
+
+TYPES_SCHEMA = 'schemas/jadn/jadn-types.jadn'
+
+
+@pytest.fixture(scope='module')
+def types_pkg() -> JADN:
+    pkg = JADN()
+    with open(abs_dir(TYPES_SCHEMA), encoding='utf8') as fp:
+        pkg.schema_load(fp)
+    return pkg
+
+
+@pytest.mark.parametrize('in_path', Path(abs_dir(JADN_SCHEMA_DIR)).glob('*'), ids=lambda p: p.name)
+def test_compile_schema(in_path: Path):
+    """
+    Every type definition in the bundled schemas compiles to a validator
+    """
+    pkg = JADN()
+    with open(in_path, encoding='utf8') as fp:
+        pkg.schema_load(fp)
+    for td in pkg.schema['types']:
+        pkg.instance_validate(None, td[0])
+    assert set(pkg.run_schema) == {td[0] for td in pkg.schema['types']}
+
+
+@pytest.mark.parametrize('type_name, instance', [
+    ('Lstr', 'abcd'),
+    ('Longitude', 180.0),
+    ('Colors', 'red'),
+    ('Acoll', ['a', 'b', 3]),
+    ('McollId', {'5': 'x', '2': 'y', 4: 1}),
+    ('C1', 5),
+    ('C4', 'abc'),
+    ('Sizes', {'s1': 'abc', 's2': 'ab', 's3': 'abc', 's4': 'ab', 's5': ['a', 'b'], 's6': ['abcd', 'abcde']}),
+    ('PixelX', {'red': 'a', 'green': 'b', 'blue': 'c', 'yellow': 'd'}),
+    ('NilOpts', {'bool': None, 'num': 5.0, 'str': 'x', 'octets': None, 'array': None, 'map': {
+        'name': 'a', 'rank': 'b', 'serialNumber': 1}}),
+    ('Defaults', {'bin1': 'AAECAw', 'bin2': b'\xc0\xa8\x00\x01', 'bool1': True, 'bool2': False,
+                  'int1': 3, 'int2': -498}),
+])
+def test_valid_instance(types_pkg: JADN, type_name: str, instance):
+    assert types_pkg.instance_validate(instance, type_name) == []
+
+
+@pytest.mark.parametrize('type_name, instance, pointer', [
+    ('Lstr', 'abc', ''),
+    ('Longitude', -180, ''),
+    ('Colors', 'pink', ''),
+    ('Colors', True, ''),
+    ('Acoll', ['a', 3], ''),
+    ('C1', 'red', ''),                  # oneOf: matches both Colors and String
+    ('C4', 'foo', ''),                  # diff: excluded by Blacklist
+    ('Sizes', {'s1': 'abcd', 's2': 'ab', 's3': 'abc', 's4': 'ab', 's5': ['a', 'b'], 's6': ['abcd', 'abcde']}, '/s1'),
+    ('Collections', {'b': ['x', 'x']}, '/b'),
+    ('Pixel', {'red': 'a', 'green': 'b', 'blue': 'c'}, ''),     # abstract
+    ('Defaults', {'bin1': '!', 'bin2': b'', 'bool1': True, 'bool2': False, 'int1': 3, 'int2': -498}, '/bin1'),
+])
+def test_invalid_instance(types_pkg: JADN, type_name: str, instance, pointer: str):
+    errors = types_pkg.instance_validate(instance, type_name)
+    assert errors and pointer in {e[0] for e in errors}
+
+
+def test_tagged_field(types_pkg: JADN):
+    """
+    Type of field "fields" is selected by the value of tagId field "enum"
+    """
+    value = {'vtype': [], 'ktype': {}, 'enum': 'def', 'id': 8, 'pointers': 'abc', 'length': 'abcd',
+             'list': ['x'], 'regex': '/abc', 'fields': 15.0}
+    assert types_pkg.instance_validate(value, 'Options') == []
+    assert types_pkg.instance_validate(value | {'fields': 25.0}, 'Options')[0][0] == '/fields'
+    assert types_pkg.instance_validate(value | {'enum': 'fgh'}, 'Options')[0][0] == '/fields'
+
+
+def test_validate_stream(types_pkg: JADN):
+    ndjson = io.BytesIO(b'"abcd"\n\n"abc"\nnot json\n"abcde"\n')
+    results = list(types_pkg.validate_stream(ndjson, 'Lstr'))
+    assert [line for line, errors in results] == [1, 3, 4, 5]
+    assert [line for line, errors in results if errors] == [3, 4]
+    assert results[1][1][0][:2] == (3, '')
+
+
+ARRAYS_SCHEMA = {'meta': {'package': 'http://example.com/arrays'}, 'types': [
+    ['Levels', 'ArrayOf', ['*Level', '}1000']],
+    ['Level', 'Integer', ['y0', 'x100']],
+    ['Samples', 'ArrayOf', ['*Sample', 'q']],
+    ['Sample', 'Number', ['w0', '/f32']],
+    ['Octets', 'ArrayOf', ['*Octet']],
+    ['Octet', 'Integer', ['/u8']],
+    ['Numbers', 'ArrayOf', ['*Number']],
+]}
+
+
+@pytest.mark.parametrize('type_name, instance, errors', [
+    ('Levels', [0, 99], []),
+    ('Levels', [0, 100, 5], [('/1', 'Level: 100 is not in range [0, 100)')]),
+    ('Levels', [1, True], [('/1', 'Level: bool is not Integer')]),
+    ('Levels', array('b', [0, 99]), []),
+    ('Levels', array('q', [-1, 2]), [('/0', 'Level: -1 is not in range [0, 100)')]),
+    ('Levels', array('d', [1.0]), [('/0', 'Level: float is not Integer')]),
+    ('Samples', [0.5, 1, 1e30], []),
+    ('Samples', [0.5, 0.0], [('/1', 'Sample: 0.0 is not in range (0.0, 3.4028234663852886e+38]')]),
+    ('Samples', [0.5, math.nan], [('/1', 'Sample: nan is not in range (0.0, 3.4028234663852886e+38]')]),
+    ('Numbers', [1.5, 10 ** 400], []),
+    ('Samples', [1.5, 10 ** 400], [('/1', f'Sample: {10 ** 400} is not in range (0.0, 3.4028234663852886e+38]')]),
+    ('Samples', array('f', [1, 2]), []),
+    ('Samples', array('f', [1, 1]), [('', 'Samples: items are not unique')]),
+    ('Octets', array('B', range(255)), []),
+    ('Octets', array('h', [255, 256]), [('/1', 'Octet: 256 is not in range [0, 255]')]),
+    ('Octets', b'ab', [('', 'Octets: bytes is not an array')]),
+])
+def test_numeric_arrayof(type_name: str, instance, errors: list):
+    """
+    ArrayOf Integer and Number items in lists and numeric buffers are checked in bulk, with the same errors
+    """
+    pkg = JADN()
+    pkg.schema_loads(json.dumps(ARRAYS_SCHEMA))
+    assert pkg.instance_validate(instance, type_name) == errors
+
+
+BINARY_SCHEMA = {'meta': {'package': 'http://example.com/binary'}, 'types': [
+    ['B64', 'Binary', []],
+    ['Hex', 'Binary', ['/x']],
+    ['HexUpper', 'Binary', ['/X']],
+    ['Eui', 'Binary', ['/eui']],
+    ['Uuid', 'Binary', ['/uuid']],
+    ['IPv4', 'Binary', ['/ipv4-addr']],
+    ['IPv6', 'Binary', ['/ipv6-addr']],
+]}
+
+
+@pytest.mark.parametrize('type_name, text, value', [
+    ('B64', 'AQID', b'\x01\x02\x03'),
+    ('Hex', '0aff', b'\x0a\xff'),
+    ('HexUpper', '0AFF', b'\x0a\xff'),
+    ('Eui', '00:1b:44:11:3a:b7', bytes.fromhex('001b44113ab7')),
+    ('Uuid', 'e81415a7-4c8d-45cd-a658-6b51b7a8f45d', bytes.fromhex('e81415a74c8d45cda6586b51b7a8f45d')),
+    ('IPv4', '192.168.0.1', b'\xc0\xa8\x00\x01'),
+    ('IPv6', '2001:db8::1', bytes.fromhex('20010db8000000000000000000000001')),
+])
+def test_binary_formats(type_name: str, text: str, value: bytes):
+    """
+    Binary text values are decoded in the representation of their format, as written by the codec
+    """
+    pkg = JADN()
+    pkg.schema_loads(json.dumps(BINARY_SCHEMA))
+    assert pkg.instance_encode(value, type_name) == text
+    assert pkg.instance_validate(text, type_name) == []
+    assert pkg.instance_validate(value, type_name) == []
+    assert 'is not a valid' in pkg.instance_validate('!' + text, type_name)[0][1]
+    assert pkg.instance_validate(text * 200, type_name)     # Too long, or not valid text
@@ -1,7 +1,10 @@
 import json
 import os
 import pytest
+from jadn.convert import JADN
 from jadn.core import data_dir
+from jadn.validate import metaschema
+from jadn.validate.metaschema import check_schema
 from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 from pathlib import Path
@@ -37,4 +40,51 @@ def test_jadn_wellformed_errs(in_path: str, json_schema) -> None:
     with open(os.path.join(JADN_BAD_SCHEMA_DIR, in_path)) as f:
         jadn_schema = json.load(f)
     with pytest.raises(ValidationError):
-        validate(instance=jadn_schema, schema=json_schema)
\ No newline at end of file
+        validate(instance=jadn_schema, schema=json_schema)
+
+@pytest.mark.parametrize('in_path', Path(abs_dir(JADN_BAD_SCHEMA_DIR)).glob('*'), ids=lambda p: p.name)
+def test_jadn_native_wellformed_errs(in_path: str) -> None:
+    """
+    Not-wellformed schemas that can be loaded are rejected by the native metaschema check
+    """
+    pkg = JADN()
+    with open(os.path.join(JADN_BAD_SCHEMA_DIR, in_path)) as f:
+        try:
+            pkg.schema_load(f)
+        except (KeyError, ValueError):
+            return
+    with pytest.raises(ValueError):
+        pkg.schema_validate()
+
+
+@pytest.mark.parametrize('name', ['jadn_v2.0_schema.jadn', 'jadn-metadata.jadn', 'npi.jadn', 'track.jadn'])
+def test_jadn_native_wellformed(name: str) -> None:
+    pkg = JADN()
+    with open(os.path.join(JADN_SCHEMA_DIR, name)) as f:
+        pkg.schema_load(f)
+    pkg.schema_validate()
+
+
+def test_jadn_native_errors(monkeypatch) -> None:
+    """
+    Errors are reported with JSON Pointers, and checking types in chunks across worker processes finds the same errors
+    """
+    types = [[f'T{k}', 'Record', [], '', [[1, 'a', 'String', [], ''], [2, 'b', f'T{k + 1}', ['[0'], '']]]
+             for k in range(200)]
+    types[7][4][1][1] = 'Bad-name'
+    types[150][2] = ['*String']
+    types[151][4].append([1, 'c', 'Integer', [], ''])
+    types += [['T200', 'ArrayOf', [], '', []], ['T0', 'String', [], '', []]]
+    pkg = JADN()
+    pkg.schema_loads(json.dumps({'meta': {'package': 'http://example.com/t', 'roots': ['T0', 'Tx']}, 'types': types}))
+    errors = check_schema(pkg)
+    assert errors == [
+        ('/meta/roots', 'root "Tx" is not defined'),
+        ('/types/201/0', 'T0 is already defined at /types/0'),
+        ('/types/7/4/1/1', 'field name "Bad-name" does not match $FieldName'),
+        ('/types/150/2', 'option "valueType" is not allowed'),
+        ('/types/151/4/2/0', 'duplicate id 1'),
+        ('/types/200/2', 'ArrayOf requires option valueType'),
+    ]
+    monkeypatch.setattr(metaschema, 'CHUNK', 16)
+    assert check_schema(pkg, jobs=2) == errors